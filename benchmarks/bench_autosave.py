@@ -0,0 +1,63 @@
+"""
+File: bench_autosave.py
+Author: Willow Jordan
+Purpose: Measure how long the UI thread spends saving the game at every turn change: writing the save itself
+(to a temporary file renamed over the save, as Autosaver does) against handing a snapshot to Autosaver's writer thread.
+Also reports the writer thread's write latency and how many snapshots it coalesced, on the real disk and on a disk made
+slower than a turn, on games played by GreedyBot as fast as they can be.
+Run from the repository root with: python -m benchmarks.bench_autosave
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from game_objects.autosave import Autosaver
+from game_objects.bots import GreedyBot, playTurn
+from game_objects.game_state import GameState
+from game_objects.savefile import serializeGame
+
+GAMES = 5
+MAX_TURNS = 200
+SLOW_WRITE = 0.02 # seconds added to every write of the slow disk
+
+class SlowAutosaver(Autosaver):
+    def write(self, data:bytes):
+        time.sleep(SLOW_WRITE)
+        super().write(data)
+
+def playGames(num_players:int, save):
+    """Play GAMES games, calling save(game) after every turn. Return the seconds each call took."""
+    rng = random.Random(0)
+    times = []
+    for i in range(0, GAMES):
+        game = GameState(num_players, seed=rng.getrandbits(64))
+        bots = [GreedyBot(random.Random(rng.random())) for seat in range(0, num_players)]
+        for turn in range(0, MAX_TURNS):
+            if game.isOver(): break
+            playTurn(game, bots[game.curr_player.id])
+            start = time.perf_counter()
+            save(game)
+            times.append(time.perf_counter() - start)
+    return times
+
+if __name__ == "__main__":
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "autosave.rummy")
+    print(f"A save after every turn of {GAMES} games per line; times in ms")
+    print(f"{'players':>8}{'disk':>6}{'saver':>12}{'UI mean':>9}{'UI max':>8}{'write mean':>12}{'write max':>11}{'writes':>8}{'coalesced':>11}")
+    for num_players in (2, 6):
+        for disk, saver_class in (("real", Autosaver), ("slow", SlowAutosaver)):
+            # writing on the UI thread, the way GameScreen.saveGame used to
+            writer = saver_class(path)
+            times = playGames(num_players, lambda game: writer.write(serializeGame(game)))
+            print(f"{num_players:>8}{disk:>6}{'UI thread':>12}{sum(times) / len(times) * 1000:>9.2f}{max(times) * 1000:>8.2f}")
+            autosaver = saver_class(path)
+            times = playGames(num_players, autosaver.save)
+            autosaver.wait()
+            stats = autosaver.stats()
+            print(f"{num_players:>8}{disk:>6}{'background':>12}{sum(times) / len(times) * 1000:>9.2f}{max(times) * 1000:>8.2f}"
+                  f"{stats['mean_write'] * 1000:>12.2f}{stats['max_write'] * 1000:>11.2f}{stats['writes']:>8}{stats['coalesced']:>11}")
+    os.remove(path)
+    os.rmdir(directory)
@@ -0,0 +1,64 @@
+"""
+File: bench_batch.py
+Author: Willow Jordan
+Purpose: Compare the throughput of batch (NumPy) meld validation with CardGroup and melds.py
+(tests/test_melds.py checks that they agree).
+Run from the repository root with: python -m benchmarks.bench_batch
+"""
+
+import random
+import time
+
+from game_objects.batch import batchValidate, encodeBatch
+from game_objects.board import CardGroup
+from game_objects.encoding import decode
+from game_objects.melds import MeldType, meldTypeOfCodes
+
+NUM_GROUPS = 100000
+WIDTH = 8
+
+def randomGroups(rng:random.Random, count:int):
+    """Return a mix of runs, sets and random groups of 1-WIDTH codes."""
+    groups = []
+    for i in range(0, count):
+        kind = rng.randint(0, 2)
+        if kind == 0: # run (sometimes wrapping King to Ace), in sequence order
+            suit = rng.randint(0, 3)
+            start = rng.randint(0, 12)
+            groups.append([suit * 13 + (start + j) % 13 for j in range(0, rng.randint(1, WIDTH))])
+        elif kind == 1: # set, in any order
+            value = rng.randint(0, 12)
+            suits = rng.sample(range(0, 4), rng.randint(1, 4))
+            groups.append([suit * 13 + value for suit in suits])
+        else: # anything
+            groups.append(rng.sample(range(0, 52), rng.randint(1, WIDTH)))
+    return groups
+
+def cardGroupType(group:CardGroup):
+    """Classify a group the way the CardGroup methods do (they assume sequence order)."""
+    if group.isValidRun(): return MeldType.RUN.value
+    if group.isValidSet(): return MeldType.SET.value
+    return MeldType.INVALID.value
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    groups = randomGroups(rng, NUM_GROUPS)
+    card_groups = [CardGroup([decode(code) for code in group]) for group in groups]
+    codes, lengths = encodeBatch(groups, WIDTH)
+
+    start = time.perf_counter()
+    valid, types = batchValidate(codes, lengths)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop_types = [meldTypeOfCodes(group).value for group in groups]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    object_types = [cardGroupType(group) for group in card_groups]
+    object_time = time.perf_counter() - start
+
+    print(f"{NUM_GROUPS} groups ({int(valid.sum())} valid melds)")
+    print(f"CardGroup.isValidRun/isValidSet loop: {NUM_GROUPS / object_time:12.0f} groups/s")
+    print(f"melds.meldTypeOfCodes loop:           {NUM_GROUPS / loop_time:12.0f} groups/s")
+    print(f"batch.batchValidate (NumPy):          {NUM_GROUPS / batch_time:12.0f} groups/s ({object_time / batch_time:.0f}x CardGroup)")
@@ -0,0 +1,61 @@
+"""
+File: bench_board.py
+Author: Willow Jordan
+Purpose: Time group ID allocation and click lookups on boards with up to a thousand groups,
+against the old linear scan for the lowest free group ID.
+Run from the repository root with: python -m benchmarks.bench_board
+"""
+
+import random
+import time
+
+from game_objects.board import Board, BoardState
+from game_objects.card import Card, Suit
+
+OPERATIONS = 20000
+
+def linearNextGID(board:BoardState):
+    """The old getNextGID: scan for the first gap in the IDs."""
+    for i in range(0, len(board.card_groups)):
+        if i not in board.card_groups:
+            return i
+    return len(board.card_groups)
+
+def churn(num_groups:int, next_gid):
+    """Fill a board with num_groups groups, then remove a random group and make a new one OPERATIONS times.
+    Return seconds per operation spent finding the new group's ID."""
+    rng = random.Random(0)
+    board = BoardState()
+    cards = [Card(Suit.HEARTS, 1) for i in range(0, num_groups)]
+    for card in cards:
+        board.makeGroup([card], next_gid(board))
+    spent = 0.0
+    for i in range(0, OPERATIONS):
+        group_id = rng.choice(list(board.card_groups.keys())) if i % 64 == 0 else rng.randrange(0, board.getGIDRange())
+        if group_id not in board.card_groups: continue
+        card = board.card_groups[group_id][0]
+        board.removeFromGroup(group_id, 0)
+        start = time.perf_counter()
+        new_id = next_gid(board)
+        spent += time.perf_counter() - start
+        board.makeGroup([card], new_id)
+    return spent / OPERATIONS
+
+def lookups(num_groups:int):
+    """Return seconds per getClosestCardGroups call on a board scrolled to the middle of num_groups groups."""
+    board = Board(None) # nothing is drawn
+    board.first_row = (num_groups // Board.NUM_COLS) // 2
+    rng = random.Random(0)
+    clicks = [(rng.uniform(0, 800), rng.uniform(100, 450)) for i in range(0, OPERATIONS)]
+    start = time.perf_counter()
+    for x, y in clicks:
+        board.getClosestCardGroups(x, y)
+    return (time.perf_counter() - start) / OPERATIONS
+
+if __name__ == "__main__":
+    print(f"{OPERATIONS} operations per line")
+    print(f"{'groups':>7}{'linear scan (us)':>18}{'heap (us)':>11}{'click lookup (us)':>19}")
+    for num_groups in (24, 100, 300, 1000):
+        linear = churn(num_groups, linearNextGID)
+        heap = churn(num_groups, BoardState.getNextGID)
+        print(f"{num_groups:>7}{linear * 1e6:>18.2f}{heap * 1e6:>11.2f}{lookups(num_groups) * 1e6:>19.2f}")
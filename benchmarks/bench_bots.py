@@ -0,0 +1,44 @@
+"""
+File: bench_bots.py
+Author: Willow Jordan
+Purpose: Time whole bot turns (draw, play and discard) on the headless engine, and compare bots head to head.
+Run from the repository root with: python -m benchmarks.bench_bots
+"""
+
+import random
+import time
+
+from game_objects.game_state import GameState
+from game_objects.bots import BOTS, makeBot, playTurn
+
+GAMES = 300
+MAX_TURNS = 1000
+
+def timeTurns(bot_names:list[str], num_players:int, seed:int):
+    """Play GAMES games and return (sorted list of seconds per turn, number of wins per seat)."""
+    rng = random.Random(seed)
+    turn_times = []
+    wins = [0] * num_players
+    for i in range(0, GAMES):
+        game = GameState(num_players, rng=random.Random(rng.random()))
+        bots = [makeBot(bot_names[seat % len(bot_names)], random.Random(rng.random())) for seat in range(0, num_players)]
+        for turn in range(0, MAX_TURNS):
+            start = time.perf_counter()
+            playTurn(game, bots[game.curr_player.id])
+            turn_times.append(time.perf_counter() - start)
+            if game.isOver():
+                wins[game.curr_player.id] += 1
+                break
+    turn_times.sort()
+    return turn_times, wins
+
+if __name__ == "__main__":
+    print(f"{GAMES} games per line, times per whole turn")
+    print(f"{'bots':<24}{'players':>8}{'turns':>9}{'mean (ms)':>11}{'p99 (ms)':>10}{'max (ms)':>10}  wins per seat")
+    lineups = [[name] for name in BOTS] + [["greedy", "random"]]
+    for bot_names in lineups:
+        for num_players in (2, 4, 6):
+            times, wins = timeTurns(bot_names, num_players, 0)
+            mean = sum(times) / len(times)
+            p99 = times[int(len(times) * 0.99)]
+            print(f"{','.join(bot_names):<24}{num_players:>8}{len(times):>9}{mean * 1000:>11.3f}{p99 * 1000:>10.3f}{times[-1] * 1000:>10.3f}  {wins}")
@@ -0,0 +1,56 @@
+"""
+File: bench_decks.py
+Author: Willow Jordan
+Purpose: Measure what extra decks and players cost: peak memory per game and time spent validating the board, over whole greedy bot games.
+Run from the repository root with: python -m benchmarks.bench_decks
+"""
+
+import random
+import time
+import tracemalloc
+
+from game_objects.game_state import GameState
+from game_objects.board import BoardState
+from game_objects.bots import GreedyBot, playTurn
+
+GAMES = 20
+MAX_TURNS = 1000
+
+def playGames(num_players:int, decks:int, seed:int):
+    """Play GAMES greedy bot games and return (mean peak bytes, mean validation seconds, mean turns) per game."""
+    rng = random.Random(seed)
+    validate = BoardState.validateGroups
+    spent = [0.0]
+    def timedValidate(board):
+        start = time.perf_counter()
+        result = validate(board)
+        spent[0] += time.perf_counter() - start
+        return result
+    BoardState.validateGroups = timedValidate
+    peak = 0
+    turns = 0
+    try:
+        for i in range(0, GAMES):
+            tracemalloc.start()
+            game = GameState(num_players, rng=random.Random(rng.random()), decks=decks)
+            bots = [GreedyBot(random.Random(rng.random())) for seat in range(0, num_players)]
+            for turn in range(0, MAX_TURNS):
+                playTurn(game, bots[game.curr_player.id])
+                turns += 1
+                if game.isOver(): break
+            peak += tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        BoardState.validateGroups = validate
+    return peak / GAMES, spent[0] / GAMES, turns / GAMES
+
+if __name__ == "__main__":
+    print(f"{GAMES} greedy games per line")
+    print(f"{'decks':>6}{'players':>8}{'turns':>8}{'peak (KiB)':>12}{'validation (ms)':>17}{'per turn (us)':>15}")
+    for decks in (1, 2, 3, 4):
+        for num_players in (2, 4, 6, 8, 12, 16):
+            try:
+                peak, validation, turns = playGames(num_players, decks, 0)
+            except ValueError:
+                continue # not enough cards to deal everyone a hand
+            print(f"{decks:>6}{num_players:>8}{turns:>8.0f}{peak / 1024:>12.1f}{validation * 1000:>17.2f}{validation / turns * 1e6:>15.1f}")
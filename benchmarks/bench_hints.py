@@ -0,0 +1,80 @@
+"""
+File: bench_hints.py
+Author: Willow Jordan
+Purpose: Time MeldFinder on large hands against a busy board, on the hands with the most melds, and finding sets in hands
+holding every copy of a value from several decks.
+Run from the repository root with: python -m benchmarks.bench_hints
+"""
+
+import gc
+import random
+import time
+
+from game_objects.board import BoardState
+from game_objects.card import Card
+from game_objects.encoding import SUITS, decode
+from game_objects.hints import MeldFinder
+
+HAND_SIZE = 24
+TRIALS = 2000
+
+def randomPosition(rng:random.Random):
+    """Return (hand, board) with HAND_SIZE random cards in hand and runs of 3 made from the rest on the board."""
+    codes = list(range(0, 52))
+    rng.shuffle(codes)
+    hand = [decode(code) for code in codes[:HAND_SIZE]]
+    rest = set(codes[HAND_SIZE:])
+    board = BoardState()
+    for code in sorted(rest):
+        run = [code, code + 1, code + 2]
+        if (code % 13 <= 10) and all(other in rest for other in run):
+            board.makeGroup([decode(other) for other in run])
+            rest.difference_update(run)
+    return hand, board
+
+def timeHints(hand:list[Card], board:BoardState, repeats:int = 3):
+    """Return (best seconds of repeats, hints found). The best run leaves out pauses that aren't the search's (other processes, the GC)."""
+    best = None
+    for repeat in range(0, repeats):
+        start = time.perf_counter()
+        finder = MeldFinder(hand)
+        found = len(finder.findMelds()) + len(finder.findExtensions(board.card_groups))
+        elapsed = time.perf_counter() - start
+        if (best is None) or (elapsed < best): best = elapsed
+    return best, found
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    positions = [randomPosition(rng) for i in range(0, TRIALS)]
+    worst = 0
+    total = 0
+    found = 0
+    gc.disable()
+    for hand, board in positions:
+        elapsed, hints = timeHints(hand, board)
+        found += hints
+        total += elapsed
+        worst = max(worst, elapsed)
+    print(f"{TRIALS} hands of {HAND_SIZE} cards, {found / TRIALS:.1f} hints each")
+    print(f"mean {total / TRIALS * 1000:.3f} ms, worst {worst * 1000:.3f} ms (best of 3 per hand)")
+    # the hands with the most hints: runs are bounded per suit (at most 13 starts of up to 11 lengths) and sets per value,
+    # so whole suits, or every suit of a few values, next to a board of runs in every suit (7-9 and 10-Q, which 6s, 9s and Kings extend)
+    board = BoardState()
+    for suit in range(0, 4):
+        for start in (7, 10):
+            board.makeGroup([decode(suit * 13 + value - 1) for value in range(start, start + 3)])
+    for name, codes in (("two whole suits", range(0, HAND_SIZE)), ("every suit of six values", [code for code in range(0, 52) if code % 13 < 6])):
+        elapsed, hints = timeHints([decode(code) for code in codes], board)
+        print(f"{name}: {hints} hints, {elapsed * 1000:.3f} ms")
+    gc.enable()
+    # every copy of one value: the sets are counts per suit, so this grows with (decks + 1)^4 rather than 2^(4 * decks)
+    print(f"{'decks':>6}{'cards':>7}{'sets':>8}{'ms':>9}")
+    for decks in (1, 2, 4, 8):
+        hand = [Card(suit, 7, deck=deck) for deck in range(0, decks) for suit in SUITS]
+        best = None
+        for repeat in range(0, 3): # the first search also works out the sets for this many copies, which are cached
+            start = time.perf_counter()
+            sets = MeldFinder(hand).findSets()
+            elapsed = time.perf_counter() - start
+            if (best is None) or (elapsed < best): best = elapsed
+        print(f"{decks:>6}{len(hand):>7}{len(sets):>8}{best * 1000:>9.2f}")
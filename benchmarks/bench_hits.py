@@ -0,0 +1,87 @@
+"""
+File: bench_hits.py
+Author: Willow Jordan
+Purpose: Time finding the card under the mouse with HitGrid against walking the cards' click regions,
+with a full board of stacked groups and a large hand on screen.
+A small canvas and sprite cache stand in for tkinter, so this runs without a display.
+Run from the repository root with: python -m benchmarks.bench_hits
+"""
+
+import itertools
+import random
+import time
+
+from game_objects.board import Board
+from game_objects.card import Card, Suit, Parent
+from game_objects.hitgrid import HitGrid
+
+CLICKS = 50000
+HAND_Y = 450 # same as GameScreen's HAND_MENU_Y
+
+class Canvas():
+    """Hands out item IDs in order, like a tk canvas."""
+    def __init__(self):
+        self.ids = itertools.count(1)
+    def create_image(self, *args, **kwargs): return next(self.ids)
+    def create_rectangle(self, *args, **kwargs): return next(self.ids)
+    def create_text(self, *args, **kwargs): return next(self.ids)
+    def delete(self, item_id): pass
+
+class Sprites():
+    def get(self, suit, value): return None
+    def zoomed(self, image, zoom_factor): return None
+
+def inBounds(bounds, x, y):
+    return (bounds[0] <= x <= bounds[2]) and (bounds[1] <= y <= bounds[3])
+
+def walkRegions(board:Board, hand:list[Card], x, y):
+    """The old hit test: walk the nearest groups' cards, or the hand, from the top down."""
+    if y < HAND_Y:
+        for group_id in sorted(board.getClosestCardGroups(x, y)):
+            group = board.card_groups.get(group_id, ())
+            for i in range(len(group)-1, -1, -1):
+                if inBounds(group[i].click_region, x, y): return group[i]
+        return None
+    for i in range(len(hand)-1, -1, -1):
+        if inBounds(hand[i].click_region, x, y): return hand[i]
+    return None
+
+def layout(stack_size:int, hand_size:int):
+    """Draw a full board of stacks and a hand, the way GameScreen does. Return (canvas, board, hand)."""
+    canvas = Canvas()
+    board = Board(canvas)
+    sprites = Sprites()
+    deck = itertools.cycle([(suit, value) for suit in list(Suit)[1:] for value in range(1, 14)])
+    for group_id in range(0, Board.NUM_ROWS * Board.NUM_COLS):
+        board.makeGroup([Card(*next(deck), sprites=sprites) for i in range(0, stack_size)], group_id)
+    hand = []
+    x, y = 8, HAND_Y
+    for i in range(0, hand_size):
+        card = Card(*next(deck), Parent.HAND, 0, i, sprites=sprites)
+        if x >= 800:
+            x -= 800
+            y += 120
+        card.draw(canvas, x, y, 2)
+        hand.append(card)
+        x += 100 if hand_size <= 16 else 800 * 2 // hand_size # squeeze big hands onto two rows
+    return canvas, board, hand
+
+def timeClicks(test):
+    rng = random.Random(0)
+    clicks = [(rng.uniform(0, 800), rng.uniform(Board.START_Y, 700)) for i in range(0, CLICKS)]
+    start = time.perf_counter()
+    results = [test(x, y) for x, y in clicks]
+    return (time.perf_counter() - start) / CLICKS, results
+
+if __name__ == "__main__":
+    print(f"{CLICKS} clicks per line, over the board and the hand")
+    print(f"{'cards':>6}{'stack':>7}{'hand':>6}{'walk (us)':>11}{'HitGrid (us)':>14}")
+    for stack_size, hand_size in ((3, 10), (8, 20), (8, 60), (13, 120)):
+        canvas, board, hand = layout(stack_size, hand_size)
+        grid = HitGrid.forCanvas(canvas)
+        walk, expected = timeClicks(lambda x, y: walkRegions(board, hand, x, y))
+        indexed, found = timeClicks(grid.hit)
+        # tall stacks overlap the groups below them, where the old walk found the lower group's card rather than the one on top
+        for card, old in zip(found, expected):
+            if card is not old: assert (old is not None) and (card.image_id > old.image_id)
+        print(f"{len(grid):>6}{stack_size:>7}{hand_size:>6}{walk * 1e6:>11.2f}{indexed * 1e6:>14.2f}")
@@ -0,0 +1,47 @@
+"""
+File: bench_ismcts.py
+Author: Willow Jordan
+Purpose: Measure ISMCTS playouts per second, in one process and with root parallelization over a process pool,
+and how often the searches find a position's legal actions in their transposition tables.
+Run from the repository root with: python -m benchmarks.bench_ismcts [seconds per search]
+"""
+
+import os
+import random
+import sys
+
+from game_objects.game_state import GameState, TurnPhase
+from game_objects.bots import GreedyBot, playTurn
+from game_objects.ismcts import ISMCTSBot
+
+POSITIONS = 5 # positions searched per worker count
+
+def position(seed:int, num_players:int):
+    """Return a game a few turns in, at the start of a player's draw phase."""
+    rng = random.Random(seed)
+    game = GameState(num_players, rng=random.Random(rng.random()))
+    bots = [GreedyBot(random.Random(rng.random())) for i in range(0, num_players)]
+    for turn in range(0, 2 * num_players):
+        playTurn(game, bots[game.curr_player.id])
+        if game.isOver(): return position(seed + 1000, num_players)
+    game.startTurn()
+    return game
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    cores = os.cpu_count()
+    worker_counts = sorted(set([1, 2, cores]))
+    print(f"{budget}s per search, {POSITIONS} positions per line, {cores} core(s)")
+    print(f"{'players':>8}{'workers':>9}{'playouts':>10}{'playouts/s':>12}{'per core':>10}{'cache hits':>12}")
+    for num_players in (2, 4):
+        for workers in worker_counts:
+            bot = ISMCTSBot(random.Random(0), time_budget=budget, workers=workers)
+            for seed in range(0, POSITIONS):
+                game = position(seed, num_players)
+                assert game.turn_phase == TurnPhase.DRAW
+                bot.chooseAction(game)
+            bot.close()
+            rate = bot.iterations / bot.search_time
+            # more workers than cores share the cores, so divide by whichever is smaller
+            print(f"{num_players:>8}{workers:>9}{bot.iterations:>10}{rate:>12.0f}{rate / min(workers, cores):>10.0f}"
+                  f"{bot.cache_hits / max(1, bot.cache_lookups):>12.1%}")
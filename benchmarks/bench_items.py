@@ -0,0 +1,50 @@
+"""
+File: bench_items.py
+Author: Willow Jordan
+Purpose: Check that long games don't leak canvas items. Plays games through GameScreen (see bench_render.py) and prints
+how many items each owner has on the canvas as the game goes on, how many items are on the canvas without the scene knowing about them,
+and how many items the canvas finds by an owner's tag that the scene doesn't count for that owner, or the other way around.
+The numbers should go up and down with the board and hands, not keep growing.
+Run from the repository root with: python -m benchmarks.bench_items
+"""
+
+import random
+
+from benchmarks.bench_render import HeadlessScreen, Root, Sprites, idle, playTurn
+from game_objects.bots import GreedyBot
+from game_objects.sprites import SpriteCache
+
+DECKS = 4 # more cards, so games last long enough to show a trend
+TURNS = 400
+REPORT_EVERY = 5
+
+def play(num_players:int, seed:int):
+    """Play a game of up to TURNS turns, printing item counts as it goes."""
+    rng = random.Random(seed)
+    root = Root()
+    SpriteCache._caches[root] = Sprites()
+    random.seed(rng.random())
+    screen = HeadlessScreen(root, num_players, decks=DECKS)
+    idle(screen)
+    bots = [GreedyBot(random.Random(rng.random())) for seat in range(0, num_players)]
+    owners = None
+    for turn in range(1, TURNS + 1):
+        playTurn(screen, bots[screen.game.curr_player.id])
+        if (turn % REPORT_EVERY == 0) or root.over:
+            counts = screen.scene.liveCounts()
+            if owners is None:
+                owners = sorted(counts)
+                print(f"{'turn':>6}" + "".join(f"{owner:>11}" for owner in owners) + f"{'untracked':>11}{'mistagged':>11}")
+            untracked = len(screen.alive) - len(screen.scene)
+            mistagged = sum(abs(len(screen.find_withtag(owner)) - count) for owner, (count, peak) in counts.items())
+            print(f"{turn:>6}" + "".join(f"{counts.get(owner, (0, 0))[0]:>11}" for owner in owners) + f"{untracked:>11}{mistagged:>11}")
+        if root.over: break
+    counts = screen.scene.liveCounts()
+    print("most at once: " + ", ".join(f"{owner} {counts[owner][1]}" for owner in owners))
+    screen.tasks.shutdown()
+
+if __name__ == "__main__":
+    for num_players in (2, 6):
+        print(f"{num_players} players, {DECKS} decks, live canvas items by owner")
+        play(num_players, 0)
+        print()
@@ -0,0 +1,48 @@
+"""
+File: bench_melds.py
+Author: Willow Jordan
+Purpose: Compare the speed of the bitmask meld validator with CardGroup.isValidRun/isValidSet on runs, sets and groups that are neither
+(tests/test_melds.py checks that they agree).
+Run from the repository root with: python -m benchmarks.bench_melds
+"""
+
+import random
+import time
+
+from game_objects.board import CardGroup
+from game_objects.card import Card
+from game_objects.encoding import SUITS
+from game_objects.melds import MeldType, meldType
+
+def oldMeldType(group:CardGroup):
+    if group.isValidRun(): return MeldType.RUN
+    if group.isValidSet(): return MeldType.SET
+    return MeldType.INVALID
+
+def timeIt(function, groups, repeats = 5):
+    best = None
+    for i in range(0, repeats):
+        start = time.perf_counter()
+        for group in groups:
+            function(group)
+        elapsed = time.perf_counter() - start
+        if (best is None) or (elapsed < best): best = elapsed
+    return best
+
+if __name__ == "__main__":
+    rng = random.Random(1)
+    groups = []
+    for i in range(0, 20000):
+        suit = rng.choice(SUITS)
+        start = rng.randint(1, 13)
+        length = rng.randint(3, 8)
+        groups.append(CardGroup([Card(suit, (start - 1 + j) % 13 + 1) for j in range(0, length)]))
+    # sets, and groups that are neither
+    for i in range(0, 10000):
+        value = rng.randint(1, 13)
+        groups.append(CardGroup([Card(suit, value) for suit in rng.sample(SUITS, rng.randint(3, 4))]))
+        groups.append(CardGroup([Card(rng.choice(SUITS), rng.randint(1, 13)) for j in range(0, rng.randint(3, 6))]))
+    old = timeIt(oldMeldType, groups)
+    new = timeIt(meldType, groups)
+    print(f"CardGroup methods: {len(groups) / old:12.0f} groups/s")
+    print(f"Bitmask validator: {len(groups) / new:12.0f} groups/s ({old / new:.2f}x)")
@@ -0,0 +1,88 @@
+"""
+File: bench_memory.py
+Author: Willow Jordan
+Purpose: Compare the memory used by a full deck dealt into hands and groups with Card/CardGroup objects against the compact encoding.
+Run from the repository root with: python -m benchmarks.bench_memory
+"""
+
+import random
+import tracemalloc
+from array import array
+
+from game_objects.card import Card, Parent
+from game_objects.board import CardGroup
+from game_objects.encoding import SUITS, CompactCard, encode, encodeCards, encodeGroup, toMask
+
+DECKS = 100 # measure this many full decks so per-object overhead dominates
+
+def measure(build):
+    """Return (bytes allocated, result) for the given function."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return size, result
+
+def split(items):
+    """Split a deck into four hands of 10 and four groups of 3 (the same layout for every representation)."""
+    hands = [items[i*10:(i+1)*10] for i in range(0, 4)]
+    groups = [items[40 + i*3:40 + (i+1)*3] for i in range(0, 4)]
+    return hands, groups
+
+def buildCards(codes):
+    decks = []
+    for deck in codes:
+        cards = [Card(SUITS[code // 13], code % 13 + 1) for code in deck]
+        hands, groups = split(cards)
+        for i in range(0, len(hands)):
+            for j in range(0, len(hands[i])):
+                hands[i][j].setInternals(Parent.HAND, i, j)
+        decks.append((hands, [CardGroup(group) for group in groups]))
+    return decks
+
+def buildCompactCards(codes):
+    decks = []
+    for deck in codes:
+        hands, groups = split([CompactCard(code) for code in deck])
+        decks.append((hands, groups))
+    return decks
+
+def buildArrays(codes):
+    decks = []
+    for deck in codes:
+        hands, groups = split(deck)
+        decks.append(([array('B', hand) for hand in hands], [bytes(group) for group in groups]))
+    return decks
+
+def buildMasks(codes):
+    decks = []
+    for deck in codes:
+        hands, groups = split(deck)
+        decks.append(([toMask(hand) for hand in hands], [toMask(group) for group in groups]))
+    return decks
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    codes = []
+    for i in range(0, DECKS):
+        deck = list(range(0, 52))
+        rng.shuffle(deck)
+        codes.append(deck)
+
+    # the conversions round trip
+    cards = buildCards(codes[:1])[0]
+    assert [encode(card) for card in cards[0][0]] == list(encodeCards(cards[0][0]))
+    assert list(encodeGroup(cards[1][0])) == codes[0][40:43]
+
+    results = [
+        ("Card/CardGroup", measure(lambda: buildCards(codes))[0]),
+        ("CompactCard (__slots__)", measure(lambda: buildCompactCards(codes))[0]),
+        ("array/bytes of codes", measure(lambda: buildArrays(codes))[0]),
+        ("52-bit masks", measure(lambda: buildMasks(codes))[0]),
+    ]
+    baseline = results[0][1]
+    print(f"Memory for {DECKS} dealt decks (4 hands of 10, 4 groups of 3 each):")
+    for name, size in results:
+        print(f"  {name:<26}{size:>10} bytes  {size / (DECKS * 52):7.1f} bytes/card  {size / baseline:6.1%} of Card")
@@ -0,0 +1,157 @@
+"""
+File: bench_render.py
+Author: Willow Jordan
+Purpose: Count the Tk calls and redraws GameScreen makes per turn: recreating every item on each redraw and drawing every change straight away
+(the old way), with the retained Scene, and with the retained Scene and the RenderScheduler coalescing changes into one frame per action.
+Every seat is played through the screen's own methods, the way clicks would, with GreedyBot choosing the moves.
+A canvas that counts calls stands in for tkinter, so this runs without a display.
+Run from the repository root with: python -m benchmarks.bench_render
+"""
+
+import itertools
+import random
+import time
+import tkinter as tk
+
+from game_objects.bots import GreedyBot, planTurn, findCard
+from game_objects.game_state import TurnPhase
+from game_objects.scene import Scene
+from game_objects.sprites import SpriteCache
+from screens.GameScreen import GameScreen
+
+GAMES = 10
+MAX_TURNS = 200
+
+class CountingCanvas(tk.Canvas):
+    """Replaces every canvas method GameScreen uses, counting the calls instead of making them."""
+    def __init__(self, master, **options):
+        self.master = master
+        self.ids = itertools.count(1)
+        self.alive = set()
+        self.tagged:dict[str, set] = {} # tag => IDs of the items with it
+        self.calls = 0
+        self.actions = 0 # events handled (see idle())
+    def create(self, tags = None):
+        self.calls += 1
+        item_id = next(self.ids)
+        self.alive.add(item_id)
+        # like Tk, a string of tags is split on whitespace, and a tuple is taken a tag per element
+        if isinstance(tags, str): tags = tags.split()
+        for tag in tags or ():
+            self.tagged.setdefault(tag, set()).add(item_id)
+        return item_id
+    def create_image(self, *args, tags = None, **options): return self.create(tags)
+    def create_rectangle(self, *args, tags = None, **options): return self.create(tags)
+    def create_text(self, *args, tags = None, **options): return self.create(tags)
+    def create_line(self, *args, tags = None, **options): return self.create(tags)
+    def find_withtag(self, tag:str): return tuple(sorted(self.tagged.get(tag, set()) & self.alive))
+    def coords(self, item_id, *args): self.calls += 1
+    def itemconfigure(self, item_id, **options): self.calls += 1
+    def tag_raise(self, item_id): self.calls += 1
+    def delete(self, item_id):
+        self.calls += 1
+        if isinstance(item_id, str): self.alive -= self.tagged.get(item_id, set()) # a tag
+        else: self.alive.discard(item_id)
+    def bind(self, *args): pass
+    def after(self, ms, callback): return None # bot turns and polling are driven by hand here
+    def after_idle(self, callback): return None # so is the render flush (see idle())
+    def after_cancel(self, job): pass
+    def destroy(self): pass # there's no Tk widget to destroy
+
+class HeadlessScreen(GameScreen, CountingCanvas):
+    def __init__(self, master, *args, **options):
+        options.setdefault("log_path", None) # don't write a move log
+        options.setdefault("autosave_path", None) # or autosave
+        super().__init__(master, *args, **options)
+
+class Root():
+    master = None # the root of its own tree (see SpriteCache.forRoot)
+    def __init__(self): self.over = False
+    def bind(self, *args): pass
+    def unbind(self, *args): pass
+    def display_victory(self, scores): self.over = True
+
+class Sprites():
+    def get(self, suit, value): return None
+    def zoomed(self, image, zoom_factor): return None
+    def getFile(self, path): return None
+
+def idle(screen:GameScreen):
+    """What tkinter does once an event has been handled."""
+    screen.actions += 1
+    screen.render.flush()
+
+def playTurn(screen:GameScreen, bot:GreedyBot):
+    """Play the current player's turn through the screen, as clicks would, letting it go idle after every action."""
+    game = screen.game
+    plan = planTurn(game.clone(), bot)
+    screen.startTurn()
+    idle(screen)
+    if plan.from_discard: game.drawFromDiscard()
+    else: game.drawFromDeck()
+    screen.render.markDirty("deck")
+    screen.render.markDirty("discard")
+    screen.moveToPlayPhase()
+    idle(screen)
+    for uid, group_id in plan.moves:
+        card = findCard(game, uid)
+        if card.image_id is not None:
+            screen.selectCard(card)
+            idle(screen)
+        else: screen.selected_card = card # scrolled out of view
+        screen.moveSelectedCard(group_id)
+        idle(screen)
+    screen.moveToDiscardPhase()
+    idle(screen)
+    assert game.turn_phase == TurnPhase.DISCARD
+    player = game.curr_player
+    card = findCard(game, plan.discard)
+    card.erase(screen)
+    game.discard(card.card_id)
+    screen.changeTurns(player)
+    idle(screen)
+
+def run(retained:bool, coalesce:bool, num_players:int, seed:int):
+    """Play GAMES games. Return (Tk calls per turn, frames drawn per action, canvas items alive at the end of each game on average, seconds per turn)."""
+    rng = random.Random(seed)
+    calls = 0
+    frames = 0
+    actions = 0
+    alive = 0
+    turns = 0
+    spent = 0.0
+    for i in range(0, GAMES):
+        root = Root()
+        SpriteCache._caches[root] = Sprites()
+        # the screen's scene has to exist before its constructor draws anything
+        screen = HeadlessScreen.__new__(HeadlessScreen)
+        Scene._scenes[screen] = Scene(screen, retained=retained)
+        random.seed(rng.random()) # the screen's game picks its seed with the global random number generator
+        screen.__init__(root, num_players)
+        screen.render.coalesce = coalesce
+        idle(screen)
+        bots = [GreedyBot(random.Random(rng.random())) for seat in range(0, num_players)]
+        start_calls = screen.calls
+        start_frames = screen.render.frames
+        start_actions = screen.actions
+        start = time.perf_counter()
+        for turn in range(0, MAX_TURNS):
+            playTurn(screen, bots[screen.game.curr_player.id])
+            turns += 1
+            if root.over: break
+        spent += time.perf_counter() - start
+        calls += screen.calls - start_calls
+        frames += screen.render.frames - start_frames
+        actions += screen.actions - start_actions
+        alive += len(screen.alive)
+        screen.tasks.shutdown()
+    return calls / turns, frames / actions, alive / GAMES, spent / turns
+
+if __name__ == "__main__":
+    print(f"{GAMES} games per line, every call to the canvas counted")
+    print(f"{'drawing':<22}{'players':>8}{'Tk calls/turn':>15}{'frames/action':>15}{'items at end':>14}{'ms/turn':>9}")
+    modes = [("recreate, immediate", False, False), ("retained, immediate", True, False), ("retained, coalesced", True, True)]
+    for num_players in (2, 4, 6):
+        for mode, retained, coalesce in modes:
+            per_turn, frames, alive, seconds = run(retained, coalesce, num_players, 0)
+            print(f"{mode:<22}{num_players:>8}{per_turn:>15.1f}{frames:>15.2f}{alive:>14.0f}{seconds * 1000:>9.3f}")
@@ -0,0 +1,66 @@
+"""
+File: bench_replay.py
+Author: Willow Jordan
+Purpose: Measure move logs (see movelog.py) on games played by GreedyBot: what logging costs while playing, bytes per action,
+how many actions per second a headless Replayer replays, and how long seeking to a random action takes with keyframes
+every 32 actions, every KEYFRAME_INTERVAL actions, and with only the one at the start of the log.
+Run from the repository root with: python -m benchmarks.bench_replay
+"""
+
+import random
+import time
+
+from game_objects.bots import GreedyBot, playTurn
+from game_objects.game_state import GameState
+from game_objects.movelog import MoveLog, Replayer, HEADER, KEYFRAME_HEADER, KEYFRAME_INTERVAL
+
+GAMES = 20
+MAX_TURNS = 1000
+SEEKS = 1000
+
+def playGames(num_players:int, decks:int, logged:bool, keyframe_interval:int = KEYFRAME_INTERVAL):
+    """Play GAMES games. Return (their logs, seconds spent playing)."""
+    rng = random.Random(0)
+    logs = []
+    spent = 0.0
+    for i in range(0, GAMES):
+        game = GameState(num_players, seed=rng.getrandbits(64), decks=decks)
+        bots = [GreedyBot(random.Random(rng.random())) for seat in range(0, num_players)]
+        start = time.perf_counter()
+        log = MoveLog(game, keyframe_interval=keyframe_interval) if logged else None
+        for turn in range(0, MAX_TURNS):
+            if game.isOver(): break
+            playTurn(game, bots[game.curr_player.id])
+        spent += time.perf_counter() - start
+        if log is not None: logs.append(log.getBytes())
+    return logs, spent
+
+def timeSeeks(logs:list):
+    """Return the average seconds to seek to a random action, in random order (so about half the seeks go back)."""
+    rng = random.Random(1)
+    replayers = [Replayer(log) for log in logs]
+    start = time.perf_counter()
+    for i in range(0, SEEKS):
+        replayer = replayers[i % len(replayers)]
+        replayer.seek(rng.randrange(0, len(replayer) + 1))
+    return (time.perf_counter() - start) / SEEKS
+
+if __name__ == "__main__":
+    print(f"{GAMES} games per line, played by GreedyBot")
+    print(f"{'players':>8}{'decks':>6}{'actions':>9}{'log us/action':>15}{'bytes/action':>14}{'KiB/log':>9}{'replay actions/s':>18}"
+          f"{'seek us, every 32':>19}{f'every {KEYFRAME_INTERVAL}':>11}{'start only':>12}")
+    for num_players, decks in ((2, 1), (4, 2), (8, 3)):
+        unlogged, plain_time = playGames(num_players, decks, False)
+        logs, logged_time = playGames(num_players, decks, True)
+        actions = 0
+        start = time.perf_counter()
+        for log in logs:
+            replayer = Replayer(log)
+            replayer.replayAll()
+            actions += len(replayer)
+        replay_time = time.perf_counter() - start
+        action_bytes = sum(len(log) - sum(KEYFRAME_HEADER.size + length for *rest, length in Replayer(log).keyframes) for log in logs)
+        seek_times = [timeSeeks(playGames(num_players, decks, True, interval)[0]) for interval in (32, KEYFRAME_INTERVAL, 1 << 30)]
+        print(f"{num_players:>8}{decks:>6}{actions:>9}{(logged_time - plain_time) / actions * 1e6:>15.1f}"
+              f"{(action_bytes - HEADER.size * len(logs)) / actions:>14.2f}{sum(len(log) for log in logs) / len(logs) / 1024:>9.1f}"
+              f"{actions / replay_time:>18.0f}{seek_times[0] * 1e6:>19.0f}{seek_times[1] * 1e6:>11.0f}{seek_times[2] * 1e6:>12.0f}")
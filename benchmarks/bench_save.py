@@ -0,0 +1,58 @@
+"""
+File: bench_save.py
+Author: Willow Jordan
+Purpose: Time saving and loading games with the binary format in savefile.py, and count bytes per saved state,
+with and without the random number generator's state, against pickling a copy of the game (see GameState.clone).
+States are taken from every turn of games played by GreedyBot.
+Run from the repository root with: python -m benchmarks.bench_save
+"""
+
+import pickle
+import random
+import time
+
+from game_objects.bots import GreedyBot, playTurn
+from game_objects.game_state import GameState
+from game_objects.savefile import serializeGame, deserializeGame
+
+GAMES = 5
+MAX_TURNS = 100
+
+def collectStates(num_players:int, decks:int, seed:int):
+    """Return a list with a copy of the game after every turn of GAMES games."""
+    rng = random.Random(seed)
+    states = []
+    for i in range(0, GAMES):
+        game = GameState(num_players, seed=rng.getrandbits(64), decks=decks)
+        bots = [GreedyBot(random.Random(rng.random())) for seat in range(0, num_players)]
+        for turn in range(0, MAX_TURNS):
+            if game.isOver(): break
+            playTurn(game, bots[game.curr_player.id])
+            states.append(game.clone(random.Random(rng.random())))
+    return states
+
+def timeFormat(states:list, save, load):
+    """Return (microseconds to save, microseconds to load, bytes) per state."""
+    start = time.perf_counter()
+    saved = [save(state) for state in states]
+    save_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for data in saved:
+        load(data)
+    load_time = time.perf_counter() - start
+    num_bytes = sum(len(data) for data in saved)
+    return save_time / len(states) * 1e6, load_time / len(states) * 1e6, num_bytes / len(states)
+
+if __name__ == "__main__":
+    formats = [
+        ("binary", lambda game: serializeGame(game), deserializeGame),
+        ("binary, no rng", lambda game: serializeGame(game, include_rng=False), deserializeGame),
+        ("pickle", lambda game: pickle.dumps(game, pickle.HIGHEST_PROTOCOL), pickle.loads),
+    ]
+    print(f"States after every turn of {GAMES} games per line")
+    print(f"{'players':>8}{'decks':>6}{'format':>16}{'save us':>9}{'load us':>9}{'bytes':>8}")
+    for num_players, decks in ((2, 1), (6, 1), (12, 4)):
+        states = collectStates(num_players, decks, 0)
+        for name, save, load in formats:
+            save_time, load_time, num_bytes = timeFormat(states, save, load)
+            print(f"{num_players:>8}{decks:>6}{name:>16}{save_time:>9.1f}{load_time:>9.1f}{num_bytes:>8.0f}")
@@ -0,0 +1,68 @@
+"""
+File: bench_solver.py
+Author: Willow Jordan
+Purpose: Run BoardSolver on a corpus of seeded positions that are hard to rearrange, and report time, nodes and cards placed.
+Run from the repository root with: python -m benchmarks.bench_solver [time budget in seconds]
+"""
+
+import random
+import sys
+
+from game_objects.board import BoardState
+from game_objects.encoding import decode
+from game_objects.melds import isValidMeld
+from game_objects.solver import BoardSolver
+
+def makePosition(seed:int, board_melds:int, hand_size:int, short_runs:bool):
+    """Return (board, hand) for a seeded position.
+    The board is built from random runs and sets. Short runs and full sets leave lots of ways to regroup the same cards,
+    which is what makes a position hard."""
+    rng = random.Random(seed)
+    used = set()
+    board = BoardState()
+    attempts = 0
+    while (len(board.card_groups) < board_melds) and (attempts < 1000):
+        attempts += 1
+        if rng.random() < 0.5:
+            suit = rng.randint(0, 3)
+            start = rng.randint(0, 12)
+            length = 3 if short_runs else rng.randint(3, 6)
+            codes = [suit * 13 + (start + i) % 13 for i in range(0, length)]
+        else:
+            value = rng.randint(0, 12)
+            codes = [suit * 13 + value for suit in rng.sample(range(0, 4), rng.randint(3, 4))]
+        if used.intersection(codes): continue
+        used.update(codes)
+        board.makeGroup([decode(code) for code in codes])
+    rest = [code for code in range(0, 52) if code not in used]
+    hand = [decode(code) for code in rng.sample(rest, min(hand_size, len(rest)))]
+    return board, hand
+
+CORPUS = [
+    # (name, seed, board melds, hand size, short runs)
+    ("small board, big hand", 2, 3, 14, False),
+    ("busy board, small hand", 3, 8, 6, True),
+    ("busy board, big hand", 4, 8, 14, True),
+    ("full board, huge hand", 6, 12, 20, True),
+    # one or two hand cards can't be placed, so the search has to prove no arrangement does better
+    ("near miss A", 10, 9, 14, True),
+    ("near miss B", 12, 9, 14, True),
+    ("near miss C", 17, 9, 14, True),
+    ("near miss D", 18, 9, 14, True),
+]
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    print(f"Time budget: {budget}s per position")
+    print(f"{'position':<26}{'board':>6}{'hand':>6}{'placed':>8}{'nodes':>10}{'time (s)':>10}{'memo hits':>11}  status")
+    for name, seed, board_melds, hand_size, short_runs in CORPUS:
+        board, hand = makePosition(seed, board_melds, hand_size, short_runs)
+        solver = BoardSolver(board.card_groups, hand, budget)
+        result = solver.solve()
+        # the result must be a valid board holding every card that was on it
+        board_cards = set(id(card) for group in board.card_groups.values() for card in group)
+        result_cards = [id(card) for group in result.groups for card in group]
+        assert all(isValidMeld(group) for group in result.groups)
+        assert board_cards.issubset(result_cards) and (len(result_cards) == len(set(result_cards)))
+        status = "optimal" if result.complete else "best so far"
+        print(f"{name:<26}{len(board_cards):>6}{len(hand):>6}{len(result.placed):>8}{result.nodes:>10}{result.elapsed:>10.3f}{solver.memo.hitRate():>11.1%}  {status}")
@@ -0,0 +1,77 @@
+"""
+File: bench_tasks.py
+Author: Willow Jordan
+Purpose: Show how long the UI thread stalls while search bots take their turns, with the turn computed on the UI thread and with TaskRunner.
+A small event loop with after()/after_cancel() stands in for tkinter, so this runs without a display.
+Run from the repository root with: python -m benchmarks.bench_tasks [seconds per search]
+"""
+
+import heapq
+import itertools
+import random
+import sys
+import time
+
+from game_objects.game_state import GameState
+from game_objects.bots import playTurn, planTurn, applyPlan
+from game_objects.ismcts import ISMCTSBot
+from game_objects.tasks import TaskRunner
+
+TURNS = 6
+
+class EventLoop():
+    """Runs after() callbacks in order on the calling thread, like tkinter's mainloop."""
+    def __init__(self):
+        self.jobs = [] # heap of (due time, job ID, callback); IDs count up, so ties run in the order they were added
+        self.cancelled = set()
+        self.ids = itertools.count()
+
+    def after(self, ms:int, callback):
+        job_id = next(self.ids)
+        heapq.heappush(self.jobs, (time.perf_counter() + ms / 1000, job_id, callback))
+        return job_id
+
+    def after_cancel(self, job_id):
+        self.cancelled.add(job_id)
+
+    def runUntil(self, condition):
+        """Run callbacks until condition() is true."""
+        while not condition():
+            due, job_id, callback = heapq.heappop(self.jobs)
+            if job_id in self.cancelled: continue
+            wait = due - time.perf_counter()
+            if wait > 0: time.sleep(wait)
+            callback()
+
+def run(budget:float, threaded:bool):
+    """Play TURNS search bot turns driven by the event loop. Return the runner's stall statistics."""
+    loop = EventLoop()
+    runner = TaskRunner(loop)
+    game = GameState(2, rng=random.Random(0))
+    bots = [ISMCTSBot(random.Random(i), time_budget=budget) for i in range(0, 2)]
+    turns = [0]
+    def nextTurn():
+        if threaded:
+            runner.submit(planTurn, game.clone(), bots[game.curr_player.id], on_done=turnDone)
+        else:
+            playTurn(game, bots[game.curr_player.id])
+            turnDone(None)
+    def turnDone(plan):
+        if plan is not None: applyPlan(game, plan)
+        turns[0] += 1
+        if (turns[0] < TURNS) and not game.isOver(): loop.after(0, nextTurn)
+        else: turns[0] = TURNS
+    loop.after(0, nextTurn)
+    loop.runUntil(lambda: turns[0] >= TURNS)
+    stats = runner.stats()
+    runner.shutdown()
+    return stats
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 0.1
+    print(f"{TURNS} search bot turns, {budget}s per search, heartbeat every {TaskRunner.HEARTBEAT_INTERVAL} ms")
+    print(f"{'turns computed on':<20}{'heartbeats':>11}{'mean late (ms)':>16}{'max late (ms)':>15}{'stalls':>8}")
+    for threaded in (False, True):
+        stats = run(budget, threaded)
+        where = "worker thread" if threaded else "UI thread"
+        print(f"{where:<20}{stats['heartbeats']:>11}{stats['mean_lateness']*1000:>16.1f}{stats['max_lateness']*1000:>15.1f}{stats['stalls']:>8}")
@@ -0,0 +1,90 @@
+"""
+File: bench_undo.py
+Author: Willow Jordan
+Purpose: Compare two ways of keeping every move of a play phase for undo, on boards with 10 to 1000 groups:
+copying the board after every move (what one save state per move would cost, done safely), against the move history GameState keeps,
+which only holds the groups each move replaced. Also counts the groups "Reset Board" redraws (including the groups it erases),
+against replacing every group, and how often it marked a group changed.
+Run from the repository root with: python -m benchmarks.bench_undo
+"""
+
+import random
+import time
+import tracemalloc
+
+from game_objects.board import BoardState, CardGroup
+from game_objects.game_state import GameState
+
+MOVES = 200
+
+class CountingBoard(BoardState):
+    """Records the groups that would be redrawn (see Board.groupChanged and Board.groupsReplaced; the RenderScheduler draws each once),
+    and how many times a group was marked changed before that."""
+    def __init__(self):
+        super().__init__()
+        self.redraws = set()
+        self.changes = 0
+    def groupChanged(self, group_id:int):
+        self.redraws.add(group_id)
+        self.changes += 1
+    def replaceGroups(self, card_groups:dict):
+        self.redraws.update(self.card_groups.keys()) # the groups that are gone have to be erased
+        self.changes += len(self.card_groups)
+        super().replaceGroups(card_groups)
+    def groupsReplaced(self):
+        self.redraws.update(self.card_groups.keys())
+        self.changes += len(self.card_groups)
+
+def setUp(num_groups:int, seed:int):
+    """Return a game in the play phase with num_groups groups of 3 cards on the board."""
+    decks = (num_groups * 3 + 2 * MOVES) // GameState.DECK_SIZE + 2
+    game = GameState(2, board=CountingBoard(), seed=seed, decks=decks, starting_hand_size=MOVES)
+    for i in range(0, num_groups):
+        game.board.makeGroup(game.deck.dealMany(3))
+    game.startTurn()
+    game.drawFromDeck()
+    return game
+
+def playMoves(game:GameState, rng:random.Random, snapshots:list = None):
+    """Make MOVES moves (mostly cards from the hand onto the board, some split off groups).
+    Return seconds spent. If snapshots is given, a copy of the board is added to it after every move."""
+    board = game.board
+    spent = 0.0
+    for i in range(0, MOVES):
+        group_ids = list(board.card_groups.keys())
+        if i % 4 == 3:
+            group = board.card_groups[rng.choice(group_ids)]
+            card = group[rng.randrange(0, len(group))]
+        else: card = game.curr_player.hand[rng.randrange(0, len(game.curr_player.hand))]
+        group_id = rng.choice(group_ids) if i % 2 == 0 else board.getNextGID()
+        start = time.perf_counter()
+        game.moveCard(card, group_id)
+        if snapshots is not None:
+            snapshots.append(({group_id: CardGroup(group) for group_id, group in board.card_groups.items()}, list(game.curr_player.hand)))
+        spent += time.perf_counter() - start
+    return spent
+
+def run(num_groups:int, keep_snapshots:bool):
+    """Return (microseconds per move, KiB kept for undo per move, groups redrawn by Reset Board, groups it marked changed)."""
+    game = setUp(num_groups, 0)
+    snapshots = [] if keep_snapshots else None
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    spent = playMoves(game, random.Random(1), snapshots)
+    kept = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    game.board.redraws = set()
+    game.board.changes = 0
+    if keep_snapshots:
+        # go back to the first snapshot's board the way the old loadSaveState did: replace every group
+        game.board.replaceGroups(snapshots[0][0])
+    else: game.loadSaveState()
+    return spent / MOVES * 1e6, kept / MOVES / 1024, len(game.board.redraws), game.board.changes
+
+if __name__ == "__main__":
+    print(f"{MOVES} moves per line (timings include tracemalloc overhead, so compare them with each other)")
+    print(f"{'groups':>7}{'undo kept as':>18}{'us/move':>10}{'KiB/move':>10}{'reset redraws':>15}{'marked':>8}")
+    for num_groups in (10, 100, 1000):
+        for name, keep_snapshots in (("board copies", True), ("move history", False)):
+            per_move, kib, redraws, changes = run(num_groups, keep_snapshots)
+            print(f"{num_groups:>7}{name:>18}{per_move:>10.1f}{kib:>10.2f}{redraws:>15}{changes:>8}")
@@ -0,0 +1,159 @@
+"""
+File: autosave.py
+Author: Willow Jordan
+Purpose: This script defines the Autosaver class, which writes saved games (see savefile.py) on a background thread,
+so the UI thread only pays for taking the snapshot and never waits on the disk.
+Each write goes to a temporary file that's renamed over the save, so the save on disk is always a whole one.
+If a snapshot is handed over while another is waiting to be written, the older one is dropped, since only the latest matters.
+The writer thread is started when there's something to write and stops once it's caught up. It isn't a daemon,
+so the last snapshot handed over is still written if the window is closed right after.
+It doesn't import tkinter, and can save headless games too.
+"""
+
+import os
+import threading
+import time
+
+from game_objects.game_state import GameState
+from game_objects.savefile import serializeGame, deserializeGame
+
+class Autosaver():
+    # save path => Autosaver (every screen saving to the same file shares one, so their writes land in order)
+    _autosavers = {}
+    _autosavers_lock = threading.Lock()
+
+    def __init__(self, path:str):
+        """
+        :param path: File to write saves to.
+        """
+        self.path = path
+        self.temp_path = path + ".tmp"
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock) # notified when the writer thread stops
+        self.thread:threading.Thread = None
+        self.pending = False # true if a snapshot is waiting to be written
+        self.pending_data:bytes = None # the snapshot, or None to remove the save
+        self.latest:bytes = None # the last snapshot handed over (None if the save was removed)
+        self.handed_over = False # true once anything has been handed over, so latest is newer than the file
+
+        # statistics (snapshot and handover times are spent on the calling thread, write times on the writer thread)
+        self.snapshots = 0
+        self.total_snapshot_time = 0.0
+        self.max_snapshot_time = 0.0
+        self.max_handover_time = 0.0
+        self.writes = 0
+        self.total_write_time = 0.0
+        self.max_write_time = 0.0
+        self.coalesced = 0 # snapshots dropped because a newer one was handed over before they were written
+        self.errors = 0
+        self.last_error:OSError = None # error of the last write, or None if it succeeded
+
+    @classmethod
+    def forPath(cls, path:str):
+        """Return the autosaver for the given file, creating it if necessary."""
+        with cls._autosavers_lock:
+            autosaver = cls._autosavers.get(path)
+            if autosaver is None:
+                autosaver = cls(path)
+                cls._autosavers[path] = autosaver
+            return autosaver
+
+    def save(self, game:GameState, seats:list = None):
+        """Snapshot the given game and write it in the background (see serializeGame for seats)."""
+        start = time.perf_counter()
+        data = serializeGame(game, seats)
+        snapshot_time = time.perf_counter() - start
+        self.snapshots += 1
+        self.total_snapshot_time += snapshot_time
+        if snapshot_time > self.max_snapshot_time: self.max_snapshot_time = snapshot_time
+        self.handOver(data)
+
+    def clear(self):
+        """Remove the save in the background (e.g. once the game is over, so it can't be continued)."""
+        self.handOver(None)
+
+    def handOver(self, data:bytes):
+        """Give the writer thread a snapshot to write (or None to remove the save), starting it if it isn't running."""
+        start = time.perf_counter()
+        with self.lock:
+            if self.pending: self.coalesced += 1
+            self.pending = True
+            self.pending_data = data
+            self.latest = data
+            self.handed_over = True
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="autosave")
+                self.thread.start()
+        handover_time = time.perf_counter() - start
+        if handover_time > self.max_handover_time: self.max_handover_time = handover_time
+
+    def run(self):
+        """Write snapshots until none are left (runs on the writer thread)."""
+        while True:
+            with self.lock:
+                if not self.pending:
+                    self.thread = None
+                    self.idle.notify_all()
+                    return
+                data = self.pending_data
+                self.pending = False
+                self.pending_data = None
+            start = time.perf_counter()
+            try:
+                if data is None:
+                    if os.path.exists(self.path): os.remove(self.path)
+                else: self.write(data)
+                self.last_error = None
+            except OSError as error:
+                self.errors += 1
+                self.last_error = error
+                continue
+            write_time = time.perf_counter() - start
+            self.writes += 1
+            self.total_write_time += write_time
+            if write_time > self.max_write_time: self.max_write_time = write_time
+
+    def write(self, data:bytes):
+        """Write the save atomically: to the temporary file first, which replaces the save once it's on disk."""
+        with open(self.temp_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(self.temp_path, self.path)
+
+    def wait(self, timeout:float = None):
+        """Block until every snapshot handed over is written. Return false if the timeout ran out first.
+        Only for shutting down and benchmarks: the UI thread shouldn't call this."""
+        with self.lock:
+            return self.idle.wait_for(lambda: self.thread is None, timeout)
+
+    def load(self):
+        """Return the last good save (the last snapshot handed over, or else the file if it can be loaded), or None if there isn't one.
+        A temporary file left behind by a write that was cut off is removed."""
+        with self.lock:
+            if self.handed_over: return self.latest
+            writing = self.thread is not None
+        if (not writing) and os.path.exists(self.temp_path):
+            try: os.remove(self.temp_path)
+            except OSError: pass
+        try:
+            with open(self.path, "rb") as file:
+                data = file.read()
+            deserializeGame(data)
+        except (OSError, ValueError):
+            return None
+        return data
+
+    def stats(self):
+        """Return a dict of snapshot, handover and write statistics (in seconds) and counts."""
+        return {
+            "snapshots": self.snapshots,
+            "mean_snapshot": self.total_snapshot_time / self.snapshots if self.snapshots > 0 else 0.0,
+            "max_snapshot": self.max_snapshot_time,
+            "max_handover": self.max_handover_time, # longest the calling thread waited to hand a snapshot over
+            "writes": self.writes,
+            "mean_write": self.total_write_time / self.writes if self.writes > 0 else 0.0,
+            "max_write": self.max_write_time,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+        }
@@ -0,0 +1,67 @@
+"""
+File: batch.py
+Author: Willow Jordan
+Purpose: This script validates many candidate groups at once with NumPy, for solvers and bots.
+Groups are rows of card codes (see encoding.py) padded to the same width, and are classified the same way as melds.py.
+NumPy is only needed for this module; the game itself doesn't use it.
+"""
+
+import numpy as np
+
+from game_objects.melds import MeldType, ALL_VALUES
+
+# number of set bits for every 13-bit mask
+POPCOUNT = np.array([bin(mask).count("1") for mask in range(0, ALL_VALUES + 1)], dtype=np.int32)
+SUIT_BITS = np.array([1 << suit for suit in range(0, 4)], dtype=np.int32)
+VALUE_BITS = np.array([1 << value for value in range(0, 13)], dtype=np.int32)
+
+def encodeBatch(groups:list, width:int = None, pad:int = -1):
+    """Return (codes, lengths) arrays for the given list of code lists.
+    codes is an N x width array padded with pad, lengths holds the real length of each row."""
+    if width is None: width = max((len(group) for group in groups), default=0)
+    codes = np.full((len(groups), width), pad, dtype=np.int16)
+    lengths = np.zeros(len(groups), dtype=np.int16)
+    for i in range(0, len(groups)):
+        codes[i, :len(groups[i])] = groups[i]
+        lengths[i] = len(groups[i])
+    return codes, lengths
+
+def batchMeldTypes(codes:np.ndarray, lengths:np.ndarray):
+    """Return an array with the MeldType value (0 = invalid, 1 = run, 2 = set) of every row.
+    :param codes: N x k array of card codes. Entries past a row's length are ignored.
+    :param lengths: Array of N row lengths.
+    """
+    codes = np.asarray(codes)
+    lengths = np.asarray(lengths, dtype=np.int32)
+    suit_mask = np.zeros(len(lengths), dtype=np.int32)
+    value_mask = np.zeros(len(lengths), dtype=np.int32)
+    # one column at a time: k is small, and whole-column operations are much faster than a reduce over short rows
+    for column in range(0, codes.shape[1]):
+        column_codes = codes[:, column].astype(np.int32)
+        in_group = column < lengths
+        column_codes[~in_group] = 0 # padding may be negative
+        suit_mask |= np.where(in_group, SUIT_BITS[(column_codes // 13) % 4], 0)
+        value_mask |= np.where(in_group, VALUE_BITS[column_codes % 13], 0)
+
+    # runs: one suit, one distinct value per card, and the values form a single (possibly wrapping) sequence
+    single_suit = (suit_mask & (suit_mask - 1)) == 0
+    below = ((value_mask << 1) | (value_mask >> 12)) & ALL_VALUES
+    starts = value_mask & ~below
+    one_sequence = ((starts != 0) & ((starts & (starts - 1)) == 0)) | (value_mask == ALL_VALUES)
+    is_run = single_suit & (POPCOUNT[value_mask] == lengths) & one_sequence
+    # sets: one value, with any suits (identical cards from other decks are allowed)
+    is_set = (value_mask & (value_mask - 1)) == 0
+
+    types = np.full(len(lengths), MeldType.INVALID.value, dtype=np.int8)
+    types[is_set] = MeldType.SET.value
+    types[is_run] = MeldType.RUN.value
+    types[lengths == 0] = MeldType.INVALID.value
+    return types
+
+def batchValidate(codes:np.ndarray, lengths:np.ndarray, min_length:int = 3):
+    """Return (valid, types) arrays for every row.
+    valid is true where the row is a run or set with at least min_length cards (3, the same as BoardState.validateGroups).
+    types is the result of batchMeldTypes."""
+    types = batchMeldTypes(codes, lengths)
+    valid = (types != MeldType.INVALID.value) & (np.asarray(lengths) >= min_length)
+    return valid, types
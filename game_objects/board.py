@@ -1,11 +1,20 @@
 """
 File: board.py
 Author: Willow Jordan
-Purpose: This script defines the Board class, which represents a board upon which cards can be placed.
+Purpose: This script defines the BoardState class, which holds the card groups placed on the board, and the Board class, which draws them on a canvas.
 """
 
+import heapq
+from typing import TYPE_CHECKING
+
 from game_objects.card import Card, Parent, DEFAULT_CARD_WIDTH, DEFAULT_CARD_HEIGHT
-import tkinter as tk
+from game_objects.melds import isValidMeld
+from game_objects.render import RenderScheduler, ALL
+from game_objects.scene import Scene
+from game_objects.zobrist import cardKey, groupHash, BOARD, MASK_64
+
+if TYPE_CHECKING: # only needed for annotations, so the rules can be imported without tkinter
+    import tkinter as tk
 
 class CardGroup(list):
     def __init__(self, cards:list[Card] = []):
@@ -24,15 +33,16 @@ class CardGroup(list):
             if self[i].value != expected: return False
         return True
 
-    def isValidSet(self):
+    def isValidSet(self, decks:int = 1):
         """Return true if this card group is a valid set, false otherwise.
-        THIS FUNCTION ASSUMES THE LIST IS SORTED.
+        Every card must have the same value, and a different suit unless there's more than one deck.
+        :param decks: Number of decks in the game. Identical cards only exist with more than one, so then suits may repeat.
         """
         value = self[0].value
         suits = [self[0].suit]
         for i in range(1, len(self)):
             if self[i].value != value: return False
-            if self[i].suit in suits: return False
+            if (decks == 1) and (self[i].suit in suits): return False
             suits.append(self[i].suit)
         return True
     
@@ -42,197 +52,390 @@ class CardGroup(list):
             rv += f"\t{card}\n"
         return rv
 
-class Board():
-    START_X = 50
-    START_Y = 125
-    NUM_ROWS = 3
-    NUM_COLS = 8
-    ROW_SPACING = 100
-    COL_SPACING = 90
-    ZOOM_FACTOR = 1
-    STACK_SPACING = 10
-
-    """DRAWVARS = {
-        1: {
-            "NUM_ROWS": 2,
-            "NUM_COLS": 4,
-            "ROW_SPACING": 200,
-            "COL_SPACING": 180,
-            "ZOOM_FACTOR": 2,
-            "STACK_SPACING": 20,
-        },
-        2: {
-            "NUM_ROWS": 4,
-            "NUM_COLS": 8,
-            "ROW_SPACING": 100,
-            "COL_SPACING": 90,
-            "ZOOM_FACTOR": 1,
-            "STACK_SPACING": 10,
-        }
-    }"""
-
-    def __init__(self, canvas:tk.Canvas):
+class BoardState():
+    """The card groups on the board, without any drawing.
+    Subclasses can override groupChanged() and groupsReplaced() to react to changes.
+    Card groups are copy-on-write: a change replaces the group with a new CardGroup instead of changing it in place,
+    so anything holding on to a group (like the undo history in GameState) keeps the cards it had.
+    """
+    def __init__(self):
         # A card group is a set or a run on the board. These cards will be grouped together when drawn
         self.card_groups: dict[int, CardGroup] = {}
-        self.canvas = canvas
-        self.empty_rectangles = {} # card group id => canvas id for rectangle in that spot
-        self.empty_rectangle_hitboxes = {} # card group id => (x0, y0, x1, y1) for clickable region or rectangle
+        # validity is only recalculated for groups that changed since the last check
+        self.dirty_groups: set[int] = set() # IDs of groups changed since their validity was last calculated
+        self.invalid_groups: set[int] = set() # IDs of existing groups that aren't a valid run or set
+        # hash of the board that doesn't depend on group IDs or order (see zobrist.py), kept up to date as cards move
+        self.group_keys: dict[int, int] = {} # group ID => sum of its cards' keys
+        self.group_hashes: dict[int, int] = {} # group ID => what the group currently adds to board_hash
+        self.board_hash = 0
+        # group IDs are handed out lowest first: free_gids is a heap of IDs below end_gid that may be free
+        # (IDs are only removed from it lazily, so it can also hold IDs that were taken again), and every ID from end_gid up is free
+        self.free_gids: list[int] = []
+        self.end_gid = 0
 
-        # drawing variables
-        '''self.expand_level = 1
-        self.loadDrawingVars()'''
+    def groupChanged(self, group_id:int):
+        """Called after the card group with the given ID is created, changed or removed."""
+        pass
 
-    '''def loadDrawingVars(self):
-        """Load the drawing variables based on the current expand level."""
-        self.NUM_ROWS = Board.DRAWVARS[self.expand_level]["NUM_ROWS"]
-        self.NUM_COLS = Board.DRAWVARS[self.expand_level]["NUM_COLS"]
-        self.ROW_SPACING = Board.DRAWVARS[self.expand_level]["ROW_SPACING"]
-        self.COL_SPACING = Board.DRAWVARS[self.expand_level]["COL_SPACING"]
-        self.ZOOM_FACTOR = Board.DRAWVARS[self.expand_level]["ZOOM_FACTOR"]
-        self.STACK_SPACING = Board.DRAWVARS[self.expand_level]["STACK_SPACING"]'''
+    def groupsReplaced(self):
+        """Called after card_groups is replaced as a whole (e.g. when a save state is loaded)."""
+        pass
 
-    def draw(self):
-        """Determine spacing variables, then draw every card group."""
-        # clear empty rectangles if necessary
-        for id in self.empty_rectangles.values():
-            self.canvas.delete(id)
-        self.empty_rectangles = {}
-        self.empty_rectangle_hitboxes = {}
-
-        # determine board size/drawing variables
-        '''max_stacks = Board.NUM_ROWS * Board.NUM_COLS
-        if len(self.card_groups) >= max_stacks:
-            if (self.expand_level+1) in Board.DRAWVARS:
-                # expand board
-                self.expand_level += 1
-                self.loadDrawingVars()
-            else:
-                print("You have reached the maximum expand level")
-        elif len(self.card_groups) < (max_stacks / 4):
-            if (self.expand_level-1) in Board.DRAWVARS:
-                # collapse board
-                self.expand_level -= 1
-                self.loadDrawingVars()
-                # move all card groups to be within board
-                for i in range((max_stacks / 4), max_stacks):
-                    if i not in self.card_groups: continue
-                    self.splitGroup(i, 0, self.getNextGID(), draw=False)'''
-        # for every spot on the board, draw the associated card group or an empty rectangle
-        for i in range(0, Board.NUM_ROWS * Board.NUM_COLS):
-            self.drawCardGroup(i)
+    def touchGroup(self, group_id:int):
+        """Mark the group with the given ID as changed."""
+        self.dirty_groups.add(group_id)
+        self.updateGroupHash(group_id)
+        self.groupChanged(group_id)
 
-    def drawCardGroup(self, group_id):
-        row = group_id // Board.NUM_COLS
-        col = group_id % Board.NUM_COLS
-        x = Board.START_X + col * Board.COL_SPACING
-        y = Board.START_Y + row * Board.ROW_SPACING
+    def updateGroupHash(self, group_id:int):
+        """Swap the group's old contribution to board_hash for its current one."""
+        self.board_hash = (self.board_hash - self.group_hashes.pop(group_id, 0)) & MASK_64
         if group_id in self.card_groups:
-            # draw card group
-            for card in self.card_groups[group_id]:
-                card.draw(self.canvas, x, y, Board.ZOOM_FACTOR)
-                x += Board.STACK_SPACING
-                y += Board.STACK_SPACING
-        else:
-            # draw empty rectangle
-            x1 = x + Board.ZOOM_FACTOR * DEFAULT_CARD_WIDTH
-            y1 = y + Board.ZOOM_FACTOR * DEFAULT_CARD_HEIGHT
-            self.empty_rectangles[group_id] = self.canvas.create_rectangle(x, y, x1, y1, fill = "darkgray", width=0)
-            self.empty_rectangle_hitboxes[group_id] = (x, y, x1, y1)
+            group_hash = groupHash(self.group_keys[group_id])
+            self.group_hashes[group_id] = group_hash
+            self.board_hash = (self.board_hash + group_hash) & MASK_64
+        else: self.group_keys.pop(group_id, None)
+
+    def replaceGroups(self, card_groups:dict):
+        """Replace every card group at once."""
+        self.dirty_groups.update(self.card_groups.keys())
+        self.card_groups = card_groups
+        self.dirty_groups.update(card_groups.keys())
+        self.rebuildFreeGIDs()
+        # rehash from scratch
+        self.group_keys = {}
+        self.group_hashes = {}
+        self.board_hash = 0
+        for group_id in card_groups:
+            self.group_keys[group_id] = 0
+            for card in card_groups[group_id]:
+                self.group_keys[group_id] = (self.group_keys[group_id] + cardKey(card.code, BOARD)) & MASK_64
+            self.updateGroupHash(group_id)
+        self.groupsReplaced()
+
+    def rebuildFreeGIDs(self):
+        """Recalculate the free group IDs from card_groups."""
+        self.end_gid = max(self.card_groups.keys(), default=-1) + 1
+        self.free_gids = [i for i in range(0, self.end_gid) if i not in self.card_groups]
+        heapq.heapify(self.free_gids)
+
+    def claimGID(self, group_id:int):
+        """Record that a group with the given ID was created."""
+        if group_id >= self.end_gid:
+            # the IDs skipped over are free
+            for i in range(self.end_gid, group_id):
+                heapq.heappush(self.free_gids, i)
+            self.end_gid = group_id + 1
+        # if group_id is in free_gids, getNextGID() drops it when it reaches the top
+
+    def releaseGID(self, group_id:int):
+        """Record that the group with the given ID was removed."""
+        if group_id == self.end_gid - 1:
+            # shrink the range of used IDs past every free ID at its end
+            self.end_gid = group_id
+            while (self.end_gid > 0) and (self.end_gid - 1 not in self.card_groups):
+                self.end_gid -= 1
+        else: heapq.heappush(self.free_gids, group_id)
 
     def getNextGID(self):
-        # search for gaps in IDs
-        for i in range(0, len(self.card_groups)):
-            if i not in self.card_groups.keys():
-                return i
-        # if no gap found, add ID at end of range
-        return len(self.card_groups)
-
-    def makeGroup(self, cards:list, group_id:int = None, draw = True):
-        """Create a new card group with the provided cards. If group_id is provided, use it."""
+        """Return the lowest group ID that isn't in use, in O(log n) amortized time."""
+        free_gids = self.free_gids
+        # drop IDs that were taken again or are past the end of the used range
+        while (len(free_gids) > 0) and ((free_gids[0] >= self.end_gid) or (free_gids[0] in self.card_groups)):
+            heapq.heappop(free_gids)
+        if len(free_gids) > 0: return free_gids[0]
+        return self.end_gid
+
+    def getGIDRange(self):
+        """Return one more than the highest group ID in use (0 if there are no groups)."""
+        return self.end_gid
+
+    def makeGroup(self, cards:list, group_id:int = None):
+        """Create a new card group with the provided cards. If group_id is provided, use it.
+        Return the ID of the new group."""
         if group_id is not None:
             if group_id in self.card_groups.keys(): raise ValueError("makeGroup: Provided ID already in card group IDs")
         else: # if none, determine id
             group_id = self.getNextGID()
-        # delete empty rectangle for this group
-        self.canvas.delete(self.empty_rectangles[group_id])
-        del self.empty_rectangles[group_id]
-        del self.empty_rectangle_hitboxes[group_id]
         # make group
-        self.card_groups[group_id] = CardGroup(cards)
-        # update all cards' internal info
-        for card in self.card_groups[group_id]:
-            card.parent_type = Parent.CARDGROUP
-            card.parent_id = group_id
-            card.card_id = len(self.card_groups[group_id]) - 1
-        # redraw
-        if draw:
-            if len(self.card_groups) == 8:
-                # board needs to be expanded, so redraw
-                self.draw()
-            else:
-                # draw the new card group
-                self.drawCardGroup(group_id)
-
-    def addToGroup(self, group_id:int, card:Card, draw = True):
+        self.card_groups[group_id] = CardGroup()
+        self.claimGID(group_id)
+        for card in cards:
+            self.appendCard(group_id, card)
+        self.touchGroup(group_id)
+        return group_id
+
+    def addToGroup(self, group_id:int, card:Card):
         """Add given card to card group with given ID."""
+        self.appendCard(group_id, card)
+        self.touchGroup(group_id)
+
+    def appendCard(self, group_id:int, card:Card):
+        """Add given card to card group with given ID without notifying that the group changed."""
         if group_id not in self.card_groups.keys():
             # create new card group
-            self.makeGroup([], group_id)
-        self.card_groups[group_id].append(card) # add card
+            self.card_groups[group_id] = CardGroup()
+            self.claimGID(group_id)
+        # copy, then add card
+        group = CardGroup(self.card_groups[group_id])
+        group.append(card)
+        self.card_groups[group_id] = group
+        self.group_keys[group_id] = (self.group_keys.get(group_id, 0) + cardKey(card.code, BOARD)) & MASK_64
         # update card's internal info
-        card.parent_type = Parent.CARDGROUP
-        card.parent_id = group_id
-        card.card_id = len(self.card_groups[group_id]) - 1
-        if draw: self.drawCardGroup(group_id) # redraw
+        card.setInternals(Parent.CARDGROUP, group_id, len(group) - 1)
     
-    def removeFromGroup(self, group_id:int, card_id:int, draw = True):
+    def removeFromGroup(self, group_id:int, card_id:int):
         """Remove card with card_id from group with group_id"""
         if group_id not in self.card_groups.keys():
             raise ValueError("Provided group ID does not exist")
-        group = self.card_groups[group_id]
-        del group[card_id] # remove card from group
+        old_group = self.card_groups[group_id]
+        self.group_keys[group_id] = (self.group_keys[group_id] - cardKey(old_group[card_id].code, BOARD)) & MASK_64
+        group = CardGroup(old_group[:card_id] + old_group[card_id+1:]) # copy without the card
+        self.card_groups[group_id] = group
         # update IDs for rest of group
         for i in range(card_id, len(group)):
             group[i].card_id = i
-        if len(self.card_groups[group_id]) == 0:
+        if len(group) == 0:
             del self.card_groups[group_id]
-        if draw: self.drawCardGroup(group_id) # redraw group
+            self.releaseGID(group_id)
+        self.touchGroup(group_id)
+
+    def restoreGroup(self, group_id:int, group:CardGroup):
+        """Put back a card group as it was at some earlier point (e.g. to undo a move), resetting its cards' internals.
+        :param group: The group that had this ID then, or None if there wasn't one.
+        """
+        if group is None:
+            if group_id in self.card_groups:
+                del self.card_groups[group_id]
+                self.releaseGID(group_id)
+        else:
+            if group_id not in self.card_groups: self.claimGID(group_id)
+            self.card_groups[group_id] = group
+            key = 0
+            for i in range(0, len(group)):
+                group[i].setInternals(Parent.CARDGROUP, group_id, i)
+                key = (key + cardKey(group[i].code, BOARD)) & MASK_64
+            self.group_keys[group_id] = key
+        self.touchGroup(group_id)
 
-    def splitGroup(self, group_id:int, card_id:int, new_group_id:int, draw = True):
+    def splitGroup(self, group_id:int, card_id:int, new_group_id:int):
         """Split card group on given card. All cards before selected card will remain in group. All cards including and after selected card will be added to new group.
         :param group_id: ID of group to split
         :param card_id: In-group ID of card to split on
-        :param new_group_id: ID of new group (must not be an existing group)
+        :param new_group_id: ID of new group (may be an existing group, in which case the cards are added on top)
         """
         if group_id not in self.card_groups.keys():
             raise ValueError(f"Provided group ID {group_id} to split doesn't exist")
         new_group_cards = self.card_groups[group_id][card_id:]
         self.card_groups[group_id] = CardGroup(self.card_groups[group_id][:card_id])
+        for card in new_group_cards:
+            self.group_keys[group_id] = (self.group_keys[group_id] - cardKey(card.code, BOARD)) & MASK_64
         if len(self.card_groups[group_id]) == 0:
             del self.card_groups[group_id]
-        #self.makeGroup(new_group_cards, new_group_id, draw)
+            self.releaseGID(group_id)
         for card in new_group_cards:
-            self.addToGroup(new_group_id, card, draw)
-        if draw:
-            self.drawCardGroup(group_id)
-            self.drawCardGroup(new_group_id)
+            self.appendCard(new_group_id, card)
+        self.touchGroup(group_id)
+        self.touchGroup(new_group_id)
+
+    def updateValidity(self):
+        """Recalculate validity for every group that changed since the last check."""
+        for group_id in self.dirty_groups:
+            if (group_id in self.card_groups) and (not isValidMeld(self.card_groups[group_id])):
+                self.invalid_groups.add(group_id)
+            else: self.invalid_groups.discard(group_id)
+        self.dirty_groups.clear()
+
+    def isGroupValid(self, group_id:int):
+        """Return true if the group with the given ID is a valid run or set (see validateGroups)."""
+        if group_id in self.dirty_groups:
+            self.dirty_groups.discard(group_id)
+            if (group_id in self.card_groups) and (not isValidMeld(self.card_groups[group_id])):
+                self.invalid_groups.add(group_id)
+            else: self.invalid_groups.discard(group_id)
+        return group_id not in self.invalid_groups
 
     def validateGroups(self):
         """Return true if every card group is a valid run or set.
         All card groups must have at least 3 cards.
         Valid runs have sequential cards of the same suit.
-        Valid sets have cards of the same value but different suits.
+        Valid sets have cards of the same value (with more than one deck, suits can repeat).
+        The order of cards within a group doesn't matter.
+        Only groups that changed since the last call are checked again.
         """
-        for cgroup_id in self.card_groups:
-            cgroup = self.card_groups[cgroup_id]
-            # length check
-            if len(cgroup) < 3: return False
-            if (not cgroup.isValidRun()) & (not cgroup.isValidSet()):
-                return False
-        return True
-    
+        if len(self.dirty_groups) > 0: self.updateValidity()
+        return len(self.invalid_groups) == 0
+
+class Board(BoardState):
+    """A BoardState that draws its card groups on a canvas whenever they change.
+    Group IDs map to spots on a grid NUM_COLS wide that grows a row at a time, with an empty row always left at the bottom.
+    Only the NUM_ROWS rows in view are drawn; scroll() moves the view.
+    Drawing goes through the canvas's Scene, so redrawing a group that didn't change doesn't call Tk at all.
+    With a RenderScheduler, changed groups are only marked dirty, and drawn together when it flushes.
+    """
+    START_X = 50
+    START_Y = 125
+    NUM_ROWS = 3 # rows in view at once
+    NUM_COLS = 8
+    ROW_SPACING = 100
+    COL_SPACING = 90
+    ZOOM_FACTOR = 1
+    STACK_SPACING = 10
+    INVALID_COLOR = "red" # outline drawn around groups that aren't a valid run or set
+    INVALID_WIDTH = 2
+    SCROLL_TEXT_POS = (790, 105) # where "rows x-y of z" is shown when there are more rows than fit
+    SCROLL_TEXT_COLOR = "white"
+
+    def __init__(self, canvas:'tk.Canvas', scheduler:RenderScheduler = None):
+        """
+        :param canvas: The canvas to draw on.
+        :param scheduler: If provided, the board registers itself with it, and changes are drawn when it flushes instead of straight away.
+        """
+        super().__init__()
+        self.canvas = canvas
+        self.scene = Scene.forCanvas(canvas) if canvas is not None else None
+        self.scheduler = scheduler
+        if scheduler is not None: scheduler.register("board", self.drawDirty, keyed=True)
+        self.auto_draw = True # without a scheduler, redraw groups as soon as they change
+        self.first_row = 0 # topmost row in view
+        self.empty_rectangles = {} # card group id => canvas id for rectangle in that spot
+        self.empty_rectangle_hitboxes = {} # card group id => (x0, y0, x1, y1) for clickable region or rectangle
+        self.invalid_outlines = {} # card group id => canvas id for outline around an invalid group
+        self.drawn_cards:dict[int, Card] = {} # uid => card, for cards this board drew (they may have moved since)
+        self.drawn_rows = Board.NUM_ROWS # number of rows the last time everything was drawn
+        self.scroll_text = None # canvas id for the "rows x-y of z" text
+
+    def getRowCount(self):
+        """Return the number of rows on the board: every row with a group, plus an empty one (and at least NUM_ROWS)."""
+        return max(Board.NUM_ROWS, (self.getGIDRange() + Board.NUM_COLS - 1) // Board.NUM_COLS + 1)
+
+    def isVisible(self, group_id:int):
+        """Return true if the spot for the given group ID is in view."""
+        row = group_id // Board.NUM_COLS
+        return self.first_row <= row < self.first_row + Board.NUM_ROWS
+
+    def scroll(self, rows:int):
+        """Move the view down by the given number of rows (up if negative), then redraw."""
+        self.scrollTo(self.first_row + rows)
+
+    def scrollTo(self, first_row:int):
+        """Move the view so that the given row is at the top, then redraw."""
+        first_row = max(0, min(first_row, self.getRowCount() - Board.NUM_ROWS))
+        if first_row == self.first_row: return
+        self.first_row = first_row
+        self.requestDraw()
+
+    def requestDraw(self, group_id:int = ALL):
+        """Draw the given group (or everything) when the scheduler flushes, or now if there isn't one."""
+        if self.scheduler is not None: self.scheduler.markDirty("board", group_id)
+        elif group_id is ALL: self.draw()
+        else: self.drawDirty({group_id})
+
+    def drawDirty(self, group_ids:set):
+        """Draw the given groups, or everything if the set contains ALL or the number of rows changed."""
+        if (ALL in group_ids) or (self.getRowCount() != self.drawn_rows):
+            self.draw()
+            return
+        for group_id in group_ids:
+            self.drawCardGroup(group_id)
+
+    def draw(self):
+        """Draw every card group in view and erase the ones that aren't."""
+        # keep the view on the board if it shrank
+        self.first_row = max(0, min(self.first_row, self.getRowCount() - Board.NUM_ROWS))
+        # erase the empty rectangles and outlines of spots that left the view (the ones in view are moved or reused)
+        for group_id in list(self.empty_rectangles.keys()) + list(self.invalid_outlines.keys()):
+            if not self.isVisible(group_id): self.eraseCardGroup(group_id)
+        # erase cards that are no longer in view, or were taken out of their group without being put anywhere else
+        # (cards that moved to a hand or the discard pile have been drawn there instead)
+        for card in self.drawn_cards.values():
+            if (card.parent_type == Parent.CARDGROUP) and not (self.isVisible(card.parent_id) and self.isInGroup(card)): card.erase(self.canvas)
+        self.drawn_cards = {}
+        self.drawn_rows = self.getRowCount()
+        # for every spot in view, draw the associated card group or an empty rectangle
+        first_id = self.first_row * Board.NUM_COLS
+        for i in range(first_id, first_id + Board.NUM_ROWS * Board.NUM_COLS):
+            self.drawCardGroup(i)
+        self.drawScrollText()
+
+    def isInGroup(self, card:Card):
+        """Return true if the card is still where its internals say it is on the board."""
+        group = self.card_groups.get(card.parent_id)
+        return (group is not None) and (card.card_id < len(group)) and (group[card.card_id] is card)
+
+    def drawScrollText(self):
+        """Show which rows are in view, if they don't all fit."""
+        num_rows = self.getRowCount()
+        if num_rows <= Board.NUM_ROWS:
+            if self.scroll_text is not None:
+                self.scene.delete(self.scroll_text)
+                self.scroll_text = None
+            return
+        text = f"Rows {self.first_row+1}-{self.first_row+Board.NUM_ROWS} of {num_rows} (scroll to see more)"
+        self.scroll_text = self.scene.draw(self.scroll_text, "text", *Board.SCROLL_TEXT_POS, owner="board", text=text, anchor="ne", fill=Board.SCROLL_TEXT_COLOR)
+
+    def eraseCardGroup(self, group_id:int):
+        """Erase the group's cards and outline, and the empty rectangle in its spot."""
+        self.eraseEmptyRectangle(group_id)
+        self.eraseInvalidOutline(group_id)
+        for card in self.card_groups.get(group_id, ()):
+            if self.drawn_cards.pop(card.uid, None) is not None: card.erase(self.canvas)
+
+    def drawCardGroup(self, group_id):
+        if not self.isVisible(group_id):
+            # out of view: make sure none of it is left on the canvas
+            self.eraseCardGroup(group_id)
+            return
+        row = group_id // Board.NUM_COLS - self.first_row
+        col = group_id % Board.NUM_COLS
+        x = Board.START_X + col * Board.COL_SPACING
+        y = Board.START_Y + row * Board.ROW_SPACING
+        if group_id in self.card_groups:
+            # the spot's empty rectangle is replaced by the card group
+            self.eraseEmptyRectangle(group_id)
+            # draw card group
+            x0, y0 = x, y
+            for card in self.card_groups[group_id]:
+                card.draw(self.canvas, x, y, Board.ZOOM_FACTOR)
+                self.drawn_cards[card.uid] = card
+                x += Board.STACK_SPACING
+                y += Board.STACK_SPACING
+            # highlight the group while it isn't a valid run or set
+            if not self.isGroupValid(group_id):
+                x1 = x - Board.STACK_SPACING + Board.ZOOM_FACTOR * DEFAULT_CARD_WIDTH
+                y1 = y - Board.STACK_SPACING + Board.ZOOM_FACTOR * DEFAULT_CARD_HEIGHT
+                outline = self.invalid_outlines.get(group_id)
+                self.invalid_outlines[group_id] = self.scene.draw(outline, "rectangle", x0, y0, x1, y1, owner="board", on_top=True,
+                                                                  outline=Board.INVALID_COLOR, width=Board.INVALID_WIDTH)
+            else: self.eraseInvalidOutline(group_id)
+        else:
+            self.eraseInvalidOutline(group_id)
+            # draw empty rectangle
+            x1 = x + Board.ZOOM_FACTOR * DEFAULT_CARD_WIDTH
+            y1 = y + Board.ZOOM_FACTOR * DEFAULT_CARD_HEIGHT
+            rectangle = self.empty_rectangles.get(group_id)
+            self.empty_rectangles[group_id] = self.scene.draw(rectangle, "rectangle", x, y, x1, y1, owner="board", fill = "darkgray", width=0)
+            self.empty_rectangle_hitboxes[group_id] = (x, y, x1, y1)
+
+    def eraseEmptyRectangle(self, group_id:int):
+        if group_id in self.empty_rectangles:
+            self.scene.delete(self.empty_rectangles.pop(group_id))
+            del self.empty_rectangle_hitboxes[group_id]
+
+    def eraseInvalidOutline(self, group_id:int):
+        if group_id in self.invalid_outlines:
+            self.scene.delete(self.invalid_outlines.pop(group_id))
+
+    def groupChanged(self, group_id:int):
+        # a group in a new row (or the last group of a row) changes how many rows there are, which drawDirty checks
+        if (self.scheduler is not None) or self.auto_draw: self.requestDraw(group_id)
+
+    def groupsReplaced(self):
+        if (self.scheduler is not None) or self.auto_draw: self.requestDraw()
+
     def getClosestCardGroups(self, clickX, clickY):
-        """Given clickX and clickY, return a list of IDs of the 1-4 closest card groups."""
+        """Given clickX and clickY, return a list of IDs of the 1-4 closest card groups in view.
+        This only looks at the grid position, so it takes the same time however many groups there are."""
         if (clickX < Board.START_X) | (clickY < Board.START_Y): return []
         diffX = clickX - Board.START_X
         prevCol = diffX // Board.COL_SPACING
@@ -245,6 +448,6 @@ class Board():
             for col in [prevCol, prevCol-1]:
                 if col < 0: continue
                 if col >= Board.NUM_COLS: continue
-                id = row * Board.NUM_COLS + col
+                id = (row + self.first_row) * Board.NUM_COLS + col
                 groupIDs.append(id)
         return groupIDs
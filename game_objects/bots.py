@@ -0,0 +1,245 @@
+"""
+File: bots.py
+Author: Willow Jordan
+Purpose: This script defines computer players (bots) that play a GameState headlessly, and playTurn, which runs one bot turn
+and returns what the bot did as a TurnPlan, so it can be repeated on another copy of the game.
+A bot makes the same calls on a GameState that GameScreen makes for a human, so any rule change applies to both.
+"""
+
+import random
+
+from game_objects.card import Card
+from game_objects.game_state import GameState, TurnPhase, Action
+from game_objects.hints import MeldFinder
+
+class Bot():
+    """Base class for bots. Subclasses choose where to draw from, what to play and what to discard."""
+    name = "bot"
+
+    def __init__(self, rng:random.Random = None):
+        """
+        :param rng: Random number generator for the bot's choices. If not provided, a new unseeded one is used.
+        """
+        self.rng = rng if rng is not None else random.Random()
+
+    def chooseDraw(self, game:GameState):
+        """Return true to draw from the discard pile, false to draw from the deck."""
+        raise NotImplementedError()
+
+    def play(self, game:GameState):
+        """Make any plays for the current player. Every group on the board must be valid afterwards,
+        and at least one card must be left in the hand to discard."""
+        raise NotImplementedError()
+
+    def chooseDiscard(self, game:GameState):
+        """Return the ID of the card in the current player's hand to discard."""
+        raise NotImplementedError()
+
+    def close(self):
+        """Release anything the bot holds on to between turns (e.g. worker processes)."""
+        pass
+
+    ### PLAY HELPERS ###
+    @staticmethod
+    def legalPlays(game:GameState):
+        """Return a list of every play the current player can make on its own: (cards, None) to lay down a new meld,
+        or ([card], group ID) to add a card to a group on the board. Plays that would empty the hand are left out."""
+        hand = game.curr_player.hand
+        finder = MeldFinder(hand)
+        plays = [(meld, None) for meld in finder.findMelds() if len(meld) < len(hand)]
+        if len(hand) > 1:
+            plays += [([card], group_id) for card, group_id in finder.findExtensions(game.board.card_groups)]
+        return plays
+
+    @staticmethod
+    def makePlay(game:GameState, cards:list[Card], group_id:int = None):
+        """Move the given hand cards to the given group, or to a new group if group_id is None."""
+        if group_id is None: group_id = game.board.getNextGID()
+        for card in cards:
+            game.moveCard(card, group_id)
+
+class RandomBot(Bot):
+    """Draws from a random pile, makes random legal plays until there are none left and discards a random card."""
+    name = "random"
+
+    def chooseDraw(self, game:GameState):
+        return self.rng.random() < 0.5
+
+    def play(self, game:GameState):
+        while True:
+            plays = Bot.legalPlays(game)
+            if len(plays) == 0: return
+            cards, group_id = self.rng.choice(plays)
+            Bot.makePlay(game, cards, group_id)
+
+    def chooseDiscard(self, game:GameState):
+        return self.rng.randrange(0, len(game.curr_player.hand))
+
+class GreedyBot(Bot):
+    """Takes the discard when it makes a meld, plays the biggest melds and extensions it can,
+    and discards the highest scoring card that is least likely to become part of a meld."""
+    name = "greedy"
+
+    def chooseDraw(self, game:GameState):
+        top = game.discard_pile[-1]
+        hand = game.curr_player.hand
+        # would the top card make a meld with the hand, or fit on the board?
+        if GreedyBot.keepValue(top, hand) >= 2:
+            finder = MeldFinder(hand + [top])
+            for meld in finder.findSets() + finder.findRuns():
+                if any(card.uid == top.uid for card in meld): return True
+        return len(MeldFinder([top]).findExtensions(game.board.card_groups)) > 0
+
+    def play(self, game:GameState):
+        while True:
+            plays = Bot.legalPlays(game)
+            if len(plays) == 0: return
+            # most cards first, then the most points out of the hand
+            cards, group_id = max(plays, key=lambda play: (len(play[0]), sum(GameState.cardScore(card) for card in play[0])))
+            Bot.makePlay(game, cards, group_id)
+
+    def chooseDiscard(self, game:GameState):
+        hand = game.curr_player.hand
+        best_id = 0
+        best_key = None
+        for i in range(0, len(hand)):
+            # fewest connections to the rest of the hand first, then the most points
+            key = (GreedyBot.keepValue(hand[i], hand), -GameState.cardScore(hand[i]))
+            if (best_key is None) or (key < best_key):
+                best_key = key
+                best_id = i
+        return best_id
+
+    @staticmethod
+    def keepValue(card:Card, hand:list[Card]):
+        """Return how many cards in the hand could share a meld with the given card:
+        the same value, or the same suit within two values (wrapping King to Ace)."""
+        value = card.value
+        suit = card.suit._value_
+        count = 0
+        for other in hand:
+            if other.uid == card.uid: continue
+            if other.value == value:
+                count += 1
+            elif other.suit._value_ == suit:
+                gap = (other.value - value) % 13
+                if (gap <= 2) or (gap >= 11): count += 1
+        return count
+
+BOTS = {bot.name: bot for bot in [RandomBot, GreedyBot]} # name => bot class, for choosing bots by name (ismcts.py adds its bot)
+
+def makeBot(name:str, rng:random.Random = None, **options):
+    """Return a new bot of the type with the given name.
+    :param options: Extra keyword arguments for the bot's constructor (e.g. a search bot's time budget).
+    """
+    if name not in BOTS:
+        raise ValueError(f"Unknown bot {name!r}, expected one of: {', '.join(BOTS)}")
+    return BOTS[name](rng, **options)
+
+def drawForBot(game:GameState, bot:Bot):
+    """Draw from the pile the bot chooses. Return true if it drew from the discard pile."""
+    # the deck can't be drawn from when it and the discard pile under its top card are empty
+    if (not game.canDrawFromDeck()) or ((len(game.discard_pile) > 0) and bot.chooseDraw(game)):
+        game.drawFromDiscard()
+        return True
+    game.drawFromDeck()
+    return False
+
+def playTurn(game:GameState, bot:Bot):
+    """Play the rest of the current player's turn with the given bot, from whatever phase it is in until the turn changes.
+    Return a TurnPlan of what it did (see applyPlan). Check game.scores or game.isOver() for the end of the game."""
+    # the game reports every action it makes to its log, so the plan records them there (and passes them on to any log already set)
+    plan = TurnPlan(game.log)
+    game.log = plan
+    try:
+        if game.turn_phase == TurnPhase.READY:
+            game.startTurn()
+        if game.turn_phase == TurnPhase.DRAW:
+            drawForBot(game, bot)
+        if game.turn_phase == TurnPhase.PLAY:
+            bot.play(game)
+            error = game.endPlayPhase()
+            if error is not None:
+                raise RuntimeError(f"{type(bot).__name__} left the play phase unfinished: {error}")
+        game.discard(bot.chooseDiscard(game))
+    finally:
+        game.log = plan.log
+    return plan
+
+def playFallbackTurn(game:GameState):
+    """Finish the current player's turn without a bot, in a way that always works: draw (from the deck, unless it's empty),
+    put back any cards moved this turn and discard the card drawn. For finishing a turn when a bot fails.
+    Return the scores if the game is over, otherwise None."""
+    if game.turn_phase == TurnPhase.READY:
+        game.startTurn()
+    drawn = None
+    if game.turn_phase == TurnPhase.DRAW:
+        drawn = game.drawFromDeck() if game.canDrawFromDeck() else game.drawFromDiscard()
+    if game.turn_phase == TurnPhase.PLAY:
+        game.loadSaveState() # the board was valid when the turn started
+        error = game.endPlayPhase()
+        if error is not None: raise RuntimeError(f"Can't end the play phase after resetting it: {error}")
+    hand = game.curr_player.hand
+    card_id = len(hand) - 1
+    for i in range(0, len(hand)):
+        if (drawn is not None) and (hand[i].uid == drawn.uid): card_id = i
+    game.discard(card_id)
+    return game.scores
+
+class TurnPlan():
+    def __init__(self, log = None):
+        """
+        :param log: Log to pass every recorded action on to (e.g. a MoveLog), if any.
+        """
+        self.log = log
+        self.from_discard:bool = None # where the bot drew from (None if the turn was already past the draw phase)
+        self.moves:list[tuple] = [] # (card uid, group ID) for every card moved in the play phase, in order
+        self.undone:list[tuple] = [] # moves undone, for redoing them
+        self.discard:int = None # uid of the card discarded
+
+    def record(self, action:Action, *arguments):
+        """Record an action (called by GameState after making it, the same as MoveLog.record)."""
+        if action == Action.DRAW_DECK: self.from_discard = False
+        elif action == Action.DRAW_DISCARD: self.from_discard = True
+        elif action == Action.MOVE:
+            self.moves.append(arguments)
+            self.undone = []
+        elif action == Action.UNDO: self.undone.append(self.moves.pop())
+        elif action == Action.REDO: self.moves.append(self.undone.pop())
+        elif action == Action.RESET:
+            self.moves = []
+            self.undone = []
+        elif action == Action.DISCARD: self.discard = arguments[0]
+        if self.log is not None: self.log.record(action, *arguments)
+
+def findCard(game:GameState, uid:int):
+    """Return the card with the given uid (see Card.uid) in the current player's hand or on the board."""
+    for card in game.curr_player.hand:
+        if card.uid == uid: return card
+    for group in game.board.card_groups.values():
+        for card in group:
+            if card.uid == uid: return card
+    raise ValueError(f"No card with uid {uid} in the current player's hand or on the board")
+
+def planTurn(game:GameState, bot:Bot):
+    """Play the rest of the current player's turn with the given bot and return the moves it made as a TurnPlan (see playTurn).
+    :param game: A copy of the game (see GameState.clone) to play forward. Nothing else should use it,
+        so this can run on a worker thread while the real game is only changed by applyPlan on the UI thread.
+    """
+    return playTurn(game, bot)
+
+def applyPlan(game:GameState, plan:TurnPlan):
+    """Make the moves in the given plan (from planTurn on a copy of this game) for the current player.
+    Return the scores if the game is over, otherwise None."""
+    if game.turn_phase == TurnPhase.READY:
+        game.startTurn()
+    if plan.from_discard is not None:
+        if plan.from_discard: game.drawFromDiscard()
+        else: game.drawFromDeck()
+    for uid, group_id in plan.moves:
+        game.moveCard(findCard(game, uid), group_id)
+    if game.turn_phase == TurnPhase.PLAY:
+        error = game.endPlayPhase()
+        if error is not None: raise RuntimeError(f"The planned turn left the play phase unfinished: {error}")
+    game.discard(findCard(game, plan.discard).card_id)
+    return game.scores
@@ -4,12 +4,23 @@ Author: Willow Jordan
 Purpose: This script defines the Card class, which represents a single playing card.
 """
 
-import tkinter as tk
 from enum import Enum
+from typing import TYPE_CHECKING
+
+from game_objects.hitgrid import HitGrid
+from game_objects.scene import Scene
+
+if TYPE_CHECKING: # only needed for annotations, so the rules can be imported without tkinter
+    import tkinter as tk
+    from game_objects.sprites import SpriteCache
 
 DEFAULT_CARD_WIDTH = 42
 DEFAULT_CARD_HEIGHT = 60
 
+# canvas anchor options (same strings as tk.NW and tk.CENTER)
+NW = "nw"
+CENTER = "center"
+
 class Suit(Enum):
     NONE = -1
     HEARTS = 0
@@ -22,7 +33,6 @@ class Parent(Enum):
     CARDGROUP = 1
 
 class Card():
-    PLAYING_CARD_PATH = "./sprites/card_{suit}_{value}.png"
     VALUE_STRINGS = {
         1: ("A", "Ace"),
         2: ("02", "Two"),
@@ -37,9 +47,10 @@ class Card():
         11: ("J", "Jack"),
         12: ("Q", "Queen"),
         13: ("K", "King"),
-    } # first string is for getting photo image, second is for printing
+    } # first string matches the sprite file name, second is for printing
 
-    def __init__(self, suit:Suit, value:int, parent_type:Parent = None, parent_id:int = None, card_id:int = None):
+    def __init__(self, suit:Suit, value:int, parent_type:Parent = None, parent_id:int = None, card_id:int = None, sprites:'SpriteCache' = None,
+                 deck:int = 0):
         """
         :param suit: Suit of the card.
         :param value: Value of the card, from 1-13 (1=Ace, 11=Jack, 12=Queen, 13=King)
@@ -49,55 +60,76 @@ class Card():
             For HAND, the hand's player's ID.
             For CARDGROUP, the card group's group ID.
         :param card_id: The ID of the card within the parent container.
+        :param sprites: The sprite cache to draw this card's image from.
+            Only needed if the card will be drawn, so headless games can leave it as None.
+        :param deck: Which deck the card came from, when playing with more than one. Together with the suit and value,
+            this identifies the card (see uid), since two decks have identical cards.
         """
         if (value < 0) | (value > 13): raise ValueError(f"Cannot create a card with value {value}")
         self.suit = suit
         self.value = value
+        self.code = suit._value_ * 13 + value - 1 # compact integer identifying the suit and value (see encoding.py)
         self.parent_type = parent_type
         self.parent_id = parent_id
         self.card_id = card_id
+        self.deck = deck
 
-        # get photoimage object
         if (value != 0) & (suit != Suit.NONE):
-            value_path, self.value_str = Card.VALUE_STRINGS[value]
+            self.value_str = Card.VALUE_STRINGS[value][1]
             self.suit_str = suit.name.lower()
-            path = Card.PLAYING_CARD_PATH.format(suit=self.suit_str, value=value_path)
-            self.image = tk.PhotoImage(file=path)
-        else:
-            self.image = tk.PhotoImage(file="card_back.png")
+
+        self.sprites = sprites
 
         # variables to be set by draw()
+        self.image = None # PhotoImage from the sprite cache (decoded once per root and shared between cards)
         self.zoomed_image = None # PhotoImage that will actually be drawn on board
         self.image_id = None # id of PhotoImage on canvas
         self.click_region = None # region in which a click will register
     
-    def draw(self, canvas:tk.Canvas, x, y, zoom_factor:int, tk_anchor = tk.NW):
+    def draw(self, canvas:'tk.Canvas', x, y, zoom_factor:int, tk_anchor = NW):
         """Draw the card at x, y with specified zoom factor on specified canvas.
-        Set click_region variable accordingly.
+        Set click_region variable accordingly, and add it to the canvas's HitGrid.
+        A card that's already drawn keeps its image, which is moved (and raised to the top) only if it's somewhere else now.
         Return the image ID.
         Cards are 42x60 px by default."""
-        if self.image_id is not None: self.erase(canvas)
-        self.zoomed_image = self.image.zoom(zoom_factor, zoom_factor)
-        self.image_id = canvas.create_image(x, y, image=self.zoomed_image, anchor=tk_anchor)
+        if self.image is None:
+            if self.sprites is None: raise RuntimeError("Cannot draw a card that has no sprite cache")
+            self.image = self.sprites.get(self.suit, self.value)
+        self.zoomed_image = self.sprites.zoomed(self.image, zoom_factor)
+        image_id = Scene.forCanvas(canvas).draw(self.image_id, "image", x, y, owner="cards", on_top=True, image=self.zoomed_image, anchor=tk_anchor)
         # determine click region
         width = zoom_factor * DEFAULT_CARD_WIDTH
         height = zoom_factor * DEFAULT_CARD_HEIGHT
-        if tk_anchor == tk.NW:
-            self.click_region = (x, y, x+zoom_factor*DEFAULT_CARD_WIDTH, y+zoom_factor*DEFAULT_CARD_HEIGHT)
-        elif tk_anchor == tk.CENTER:
-            self.click_region = (x - width/2, y - height/2, x + width/2, y + height/2)
+        if tk_anchor == NW:
+            click_region = (x, y, x+zoom_factor*DEFAULT_CARD_WIDTH, y+zoom_factor*DEFAULT_CARD_HEIGHT)
+        elif tk_anchor == CENTER:
+            click_region = (x - width/2, y - height/2, x + width/2, y + height/2)
         else: raise RuntimeWarning(f"Card draw function is not yet configured for anchor option {tk_anchor}")
+        # the region only needs to go on top if the image did
+        if (image_id != self.image_id) or (click_region != self.click_region):
+            grid = HitGrid.forCanvas(canvas)
+            if (self.image_id is not None) and (image_id != self.image_id): grid.remove(self.image_id)
+            grid.add(image_id, click_region, self)
+        self.image_id = image_id
+        self.click_region = click_region
         return self.image_id
 
-    def erase(self, canvas:tk.Canvas):
+    def erase(self, canvas:'tk.Canvas'):
         """Erase drawing and unset associated variables."""
         # don't throw error if card has already been erased
         if self.image_id is not None:
-            canvas.delete(self.image_id)
+            Scene.forCanvas(canvas).delete(self.image_id)
+            HitGrid.forCanvas(canvas).remove(self.image_id)
         self.zoomed_image = None
         self.image_id = None
         self.click_region = None
     
+    @property
+    def uid(self):
+        """Integer that identifies this exact card, even among identical cards from other decks.
+        Use this rather than comparing card objects."""
+        return self.deck * 52 + self.code
+
     def setInternals(self, parent_type, parent_id, card_id):
         """Set internal location identification variables."""
         self.parent_type = parent_type
@@ -0,0 +1,135 @@
+"""
+File: encoding.py
+Author: Willow Jordan
+Purpose: This script defines a compact encoding of cards for simulation and search.
+A card is a small int (suit * 13 + value - 1, so 0-51), hands and groups are arrays/bytes of those ints or 52-bit masks,
+(identical cards from different decks share a code, so masks only suit single-deck games),
+and CompactCard is a __slots__ object that can stand in for a Card in the UI.
+"""
+
+from array import array
+
+from game_objects.card import Card, Suit, Parent
+from game_objects.board import CardGroup
+
+NUM_VALUES = 13
+NUM_SUITS = 4
+DECK_SIZE = NUM_VALUES * NUM_SUITS
+
+SUITS = [Suit.HEARTS, Suit.DIAMONDS, Suit.CLUBS, Suit.SPADES] # suit index => Suit
+
+### SINGLE CARDS ###
+def encodeSuitValue(suit:Suit, value:int):
+    """Return the code for the card with the given suit and value (1-13)."""
+    return suit.value * NUM_VALUES + value - 1
+
+def encode(card:Card):
+    """Return the code for the given card."""
+    return card.code
+
+def suitOf(code:int):
+    """Return the suit index (0-3, same as Suit.value) of the given code."""
+    return (code // NUM_VALUES) % NUM_SUITS
+
+def valueOf(code:int):
+    """Return the value (1-13) of the given code."""
+    return code % NUM_VALUES + 1
+
+def decode(code:int, sprites = None):
+    """Return a new Card for the given code."""
+    return Card(SUITS[suitOf(code)], valueOf(code), sprites=sprites)
+
+def codeToString(code:int):
+    """Return a short string for the given code, e.g. "QH" or "10S"."""
+    return f"{Card.VALUE_STRINGS[valueOf(code)][0].lstrip('0')}{SUITS[suitOf(code)].name[0]}"
+
+### HANDS AND GROUPS ###
+def encodeCards(cards:list[Card]):
+    """Return an array of codes for the given cards, in order."""
+    return array('B', [encode(card) for card in cards])
+
+def encodeGroup(group:CardGroup):
+    """Return the given card group as bytes (one code per card, in order)."""
+    return bytes(encode(card) for card in group)
+
+def decodeHand(codes, player_id:int, sprites = None):
+    """Return a list of new Cards for the given codes, with their internals set as player_id's hand."""
+    hand = []
+    for i in range(0, len(codes)):
+        card = decode(codes[i], sprites)
+        card.setInternals(Parent.HAND, player_id, i)
+        hand.append(card)
+    return hand
+
+def decodeGroup(codes, group_id:int, sprites = None):
+    """Return a new CardGroup for the given codes, with its cards' internals set as group group_id."""
+    group = CardGroup([decode(code, sprites) for code in codes])
+    for i in range(0, len(group)):
+        group[i].setInternals(Parent.CARDGROUP, group_id, i)
+    return group
+
+def toMask(codes):
+    """Return a 52-bit mask with the bit for every given code set."""
+    mask = 0
+    for code in codes:
+        mask |= 1 << code
+    return mask
+
+def cardsToMask(cards:list[Card]):
+    """Return a 52-bit mask with the bit for every given card set."""
+    mask = 0
+    for card in cards:
+        mask |= 1 << encode(card)
+    return mask
+
+def fromMask(mask:int):
+    """Return a sorted list of the codes set in the given mask."""
+    codes = []
+    while mask:
+        low = mask & -mask
+        codes.append(low.bit_length() - 1)
+        mask ^= low
+    return codes
+
+class CompactCard():
+    """A lightweight stand-in for Card, holding only a code and the location/drawing fields the UI needs."""
+    __slots__ = ("code", "deck", "parent_type", "parent_id", "card_id", "image_id", "click_region")
+
+    def __init__(self, code:int, parent_type:Parent = None, parent_id:int = None, card_id:int = None, deck:int = 0):
+        self.code = code
+        self.deck = deck
+        self.parent_type = parent_type
+        self.parent_id = parent_id
+        self.card_id = card_id
+        self.image_id = None
+        self.click_region = None
+
+    @property
+    def suit(self):
+        return SUITS[suitOf(self.code)]
+
+    @property
+    def value(self):
+        return valueOf(self.code)
+
+    @property
+    def uid(self):
+        return self.deck * DECK_SIZE + self.code
+
+    def setInternals(self, parent_type, parent_id, card_id):
+        """Set internal location identification variables."""
+        self.parent_type = parent_type
+        self.parent_id = parent_id
+        self.card_id = card_id
+
+    @classmethod
+    def fromCard(cls, card:Card):
+        """Return a CompactCard with the same code and location as the given card."""
+        return cls(encode(card), card.parent_type, card.parent_id, card.card_id, card.deck)
+
+    def toCard(self, sprites = None):
+        """Return a new Card with the same suit, value and location as this one."""
+        return Card(self.suit, self.value, self.parent_type, self.parent_id, self.card_id, sprites=sprites, deck=self.deck)
+
+    def __str__(self):
+        return f"CompactCard object: {codeToString(self.code)} ({self.parent_type}, {self.parent_id}, {self.card_id})"
@@ -0,0 +1,365 @@
+"""
+File: game_state.py
+Author: Willow Jordan
+Purpose: This script defines the GameState class, which holds the rules of the game (dealing, turn phases and scoring) without any drawing.
+It doesn't import tkinter, so games can be run headless. GameScreen drives a GameState and draws the result.
+"""
+
+import copy
+import random
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from game_objects.player import Player
+from game_objects.card import Card, Suit, Parent
+from game_objects.board import BoardState, CardGroup
+from game_objects.shoe import Shoe
+from game_objects.zobrist import cardKey, turnKey, DISCARD_TOP
+
+if TYPE_CHECKING: # only needed for annotations (movelog.py imports this module)
+    from game_objects.movelog import MoveLog
+
+class TurnPhase(Enum):
+    READY = 0
+    DRAW = 1
+    PLAY = 2
+    DISCARD = 3
+
+class Action(Enum):
+    """Actions that change a game, as recorded in a MoveLog."""
+    START_TURN = 0
+    DRAW_DECK = 1
+    DRAW_DISCARD = 2
+    MOVE = 3 # card uid, group ID
+    RESET = 4 # loadSaveState()
+    UNDO = 5
+    REDO = 6
+    END_PLAY = 7
+    DISCARD = 8 # card uid (the turn changes too)
+
+def sameCards(group:CardGroup, other:CardGroup):
+    """Return true if both groups hold the very same cards in the same order (or are both None)."""
+    if (group is None) or (other is None): return group is other
+    return (len(group) == len(other)) and all(a is b for a, b in zip(group, other))
+
+class GameState():
+    STARTING_HAND_SIZES = {2: 10, 3: 7, 4: 7, 5: 6, 6: 6} # number of players => starting hand size
+    LARGE_TABLE_HAND_SIZE = 6 # starting hand size for more than 6 players
+    MIN_PLAYERS = 2
+    DECK_SIZE = 52
+
+    def __init__(self, numPlayers:int = 2, board:BoardState = None, sprites = None, rng:random.Random = None, starting_hand_size:int = None,
+                 seed:int = None, decks:int = 1):
+        """
+        :param numPlayers: Number of players, at least 2. More than 6 players usually needs more than one deck.
+        :param board: The board to play on. If not provided, a BoardState (which draws nothing) is used.
+        :param sprites: Sprite cache handed to every card, so that they can be drawn. Leave as None for headless games.
+        :param rng: Random number generator used for shuffling. If not provided, one is made from seed.
+        :param starting_hand_size: Cards dealt to each player. If not provided, STARTING_HAND_SIZES (or LARGE_TABLE_HAND_SIZE) is used.
+        :param seed: Seed for the random number generator if rng isn't provided, so the deal can be reproduced.
+            If neither is provided, a random seed is chosen (and kept in self.seed).
+        :param decks: Number of 52 card decks shuffled together into the shoe.
+        """
+        if numPlayers < GameState.MIN_PLAYERS:
+            raise ValueError(f"There must be at least {GameState.MIN_PLAYERS} players")
+        if decks < 1:
+            raise ValueError("There must be at least one deck")
+        if starting_hand_size is None:
+            starting_hand_size = GameState.STARTING_HAND_SIZES.get(numPlayers, GameState.LARGE_TABLE_HAND_SIZE)
+        # every player needs at least one card, and one card must be left for the discard pile
+        if (starting_hand_size < 1) or (numPlayers * starting_hand_size >= decks * GameState.DECK_SIZE):
+            raise ValueError(f"Can't deal {starting_hand_size} cards to each of {numPlayers} players from {decks} deck(s)")
+        self.decks = decks
+        if rng is None:
+            if seed is None: seed = random.getrandbits(64)
+            rng = random.Random(seed)
+        self.seed = seed # None if an rng was provided
+        self.rng = rng
+        self.board = board if board is not None else BoardState()
+
+        # create and populate deck (every deck's cards are identical apart from Card.deck)
+        cards:list[Card] = []
+        for deck in range(0, decks):
+            for suit in list(Suit):
+                if suit == Suit.NONE: continue
+                # 1 (ace) thru 13 (king)
+                for value in range(1, 14):
+                    cards.append(Card(suit, value, sprites=sprites, deck=deck))
+        self.deck = Shoe(cards, self.rng)
+        self.deck.shuffle()
+
+        # create players and generate starting hands
+        startingHandSize = starting_hand_size
+        self.players:list[Player] = []
+        for i in range(0, numPlayers):
+            # deal next n cards
+            startingHand = self.deck.dealMany(startingHandSize)
+            for j in range(0, startingHandSize):
+                startingHand[j].setInternals(Parent.HAND, i, j)
+            self.players.append(Player(len(self.players), startingHand))
+        # deal next card from deck for discard pile
+        self.discard_pile:list[Card] = [self.deck.deal()]
+
+        # player whose turn it is
+        self.curr_player:Player = self.players[0]
+        self.turn_phase = TurnPhase.READY
+        self.scores:dict[int, int] = None # set once somebody wins
+
+        # moves made in the play phase, for undo and redo (both cleared at the start of every play phase)
+        # each is (card, index it had in the hand or None if it was on the board, {group ID: group before}, {group ID: group after});
+        # groups are copy-on-write (see BoardState), so a move only holds the groups it changed and shares them with the board
+        self.undo_stack:list[tuple] = []
+        self.redo_stack:list[tuple] = []
+        # every action that changes the game is recorded here, if set (see MoveLog)
+        self.log:'MoveLog' = None
+
+    ### HELPER FUNCTIONS ###
+    def getParent(self, card:Card):
+        """Return the parent container of the given card."""
+        if card.parent_type == Parent.HAND:
+            return self.players[card.parent_id].hand
+        else: # CARDGROUP
+            return self.board.card_groups[card.parent_id]
+
+    def requirePhase(self, phase:TurnPhase):
+        if self.turn_phase != phase:
+            raise RuntimeError(f"This action is only allowed in the {phase.name} phase, not {self.turn_phase.name}")
+
+    def stateHash(self, player_ids:list = None):
+        """Return a 64-bit hash of the board, every hand, the top of the discard pile, whose turn it is and the turn phase.
+        It doesn't depend on the order of groups on the board or cards in hands, so the same position reached by
+        different moves hashes the same. The order of the deck (hidden information) isn't included.
+        :param player_ids: Only hash these players' hands (e.g. the current player's, for what they can see). Every hand if not provided.
+        """
+        rv = self.board.board_hash ^ turnKey(self.curr_player.id, self.turn_phase.value)
+        for player in self.players:
+            if (player_ids is None) or (player.id in player_ids): rv ^= player.hand_hash
+        if len(self.discard_pile) > 0:
+            rv ^= cardKey(self.discard_pile[-1].code, DISCARD_TOP)
+        return rv
+
+    def clone(self, rng:random.Random = None):
+        """Return a copy of this game that shares no cards or containers with it, for searches to play forward.
+        The copy always uses a plain BoardState and no sprites, so it can be sent to other processes.
+        :param rng: Random number generator for the copy. If not provided, a new unseeded one is used.
+        """
+        copies = {} # id of original card => copy
+        def copyCard(card:Card):
+            if id(card) not in copies:
+                copies[id(card)] = Card(card.suit, card.value, card.parent_type, card.parent_id, card.card_id, deck=card.deck)
+            return copies[id(card)]
+
+        game = GameState.__new__(GameState)
+        game.seed = None
+        game.decks = self.decks
+        game.rng = rng if rng is not None else random.Random()
+        game.board = BoardState()
+        game.board.replaceGroups({group_id: CardGroup([copyCard(card) for card in group]) for group_id, group in self.board.card_groups.items()})
+        game.deck = Shoe([copyCard(card) for card in self.deck], game.rng)
+        game.players = []
+        for player in self.players:
+            game.players.append(Player(player.id, [copyCard(card) for card in player.hand]))
+            game.players[-1].score = player.score
+            game.players[-1].picked_up = set(player.picked_up)
+        game.discard_pile = [copyCard(card) for card in self.discard_pile]
+        game.curr_player = game.players[self.curr_player.id]
+        game.turn_phase = self.turn_phase
+        game.scores = copy.copy(self.scores)
+        def copyGroups(groups:dict):
+            return {group_id: None if group is None else CardGroup([copyCard(card) for card in group]) for group_id, group in groups.items()}
+        game.undo_stack = [(copyCard(card), hand_id, copyGroups(before), copyGroups(after)) for card, hand_id, before, after in self.undo_stack]
+        game.redo_stack = [(copyCard(card), hand_id, copyGroups(before), copyGroups(after)) for card, hand_id, before, after in self.redo_stack]
+        game.log = None # the copy's moves are its own
+        return game
+
+    def isOver(self):
+        """Return true if somebody has won."""
+        return self.scores is not None
+
+    @staticmethod
+    def cardScore(card:Card):
+        """Return the points a card left in a player's hand is worth."""
+        if card.value == 1: return 14
+        elif card.value > 10: return 10
+        else: return card.value
+
+    def calculateScores(self):
+        """Return a dict of player ID => score based on cards left in players' hands."""
+        scores = {}
+        for player in self.players:
+            score = 0
+            for card in player.hand:
+                score += GameState.cardScore(card)
+            scores[player.id] = score
+        return scores
+
+    ### PHASE CHANGE FUNCTIONS ###
+    def startTurn(self):
+        """Move the current player from the ready phase to the draw phase."""
+        self.requirePhase(TurnPhase.READY)
+        self.turn_phase = TurnPhase.DRAW
+        if self.log is not None: self.log.record(Action.START_TURN)
+
+    def drawFromDeck(self):
+        """Draw a card from the deck into the current player's hand and move to the play phase.
+        Return the card drawn."""
+        self.requirePhase(TurnPhase.DRAW)
+        if not self.canDrawFromDeck(): raise ValueError("The deck is empty, and so is the discard pile under its top card")
+        self.refillDeck() # (it can run out when the discard pile only had its top card to reshuffle into it)
+        card = self.deck.deal()
+        self.refillDeck()
+        self.takeDrawnCard(card)
+        if self.log is not None: self.log.record(Action.DRAW_DECK)
+        return card
+
+    def canDrawFromDeck(self):
+        """Return true if there's a card to draw from the deck, counting the ones under the top of the discard pile,
+        which are reshuffled into it when it runs out."""
+        return (len(self.deck) > 0) or (len(self.discard_pile) > 1)
+
+    def refillDeck(self):
+        """If the deck is empty, shuffle all but the top of the discard pile into it."""
+        if (len(self.deck) == 0) and (len(self.discard_pile) > 1):
+            self.discard_pile = [self.deck.reshuffleFrom(self.discard_pile)]
+
+    def drawFromDiscard(self):
+        """Draw the top card of the discard pile into the current player's hand and move to the play phase.
+        Return the card drawn."""
+        self.requirePhase(TurnPhase.DRAW)
+        if len(self.discard_pile) == 0: raise ValueError("The discard pile is empty")
+        card = self.discard_pile.pop()
+        self.curr_player.picked_up.add(card.uid)
+        self.takeDrawnCard(card)
+        if self.log is not None: self.log.record(Action.DRAW_DISCARD)
+        return card
+
+    def takeDrawnCard(self, card:Card):
+        self.curr_player.addToHand(card)
+        self.turn_phase = TurnPhase.PLAY
+        # create save state of board and player's hand that can be reverted to
+        self.createSaveState()
+
+    def getEndPlayError(self):
+        """Return a message explaining why the play phase can't end yet, or None if it can."""
+        if len(self.curr_player.hand) < 1:
+            return "You must keep at least one card in your hand to discard."
+        if not self.board.validateGroups():
+            return "Not every group on the board is a valid run or set."
+        return None
+
+    def endPlayPhase(self):
+        """Run checks to make sure board is valid. If it is, move to discard phase.
+        Return None on success, otherwise a message explaining why the phase can't end."""
+        self.requirePhase(TurnPhase.PLAY)
+        error = self.getEndPlayError()
+        if error is not None: return error
+        self.turn_phase = TurnPhase.DISCARD
+        if self.log is not None: self.log.record(Action.END_PLAY)
+        return None
+
+    def discard(self, card_id:int):
+        """Discard the card with the given ID from the current player's hand, then change turns.
+        Return the discarded card."""
+        self.requirePhase(TurnPhase.DISCARD)
+        card = self.curr_player.hand[card_id]
+        self.discard_pile.append(card)
+        self.curr_player.removeFromHand(card_id)
+        self.curr_player.picked_up.discard(card.uid)
+        self.changeTurns()
+        if self.log is not None: self.log.record(Action.DISCARD, card.uid)
+        return card
+
+    def changeTurns(self):
+        """Check if the current player won. If they did, calculate scores. Otherwise, change to the next player.
+        Return the scores if the game is over, otherwise None."""
+        # check if current player won
+        if len(self.curr_player.hand) == 0:
+            self.scores = self.calculateScores()
+            return self.scores
+        # if all checks pass, advance turn
+        next_id = self.curr_player.id + 1
+        if next_id >= len(self.players):
+            next_id = 0
+        self.curr_player = self.players[next_id]
+        self.turn_phase = TurnPhase.READY
+        return None
+
+    ### PLAY PHASE FUNCTIONS ###
+    def createSaveState(self):
+        """Make the board and current player's hand as they are now the state that loadSaveState() goes back to.
+        Takes O(1) time: it only forgets the moves made before."""
+        self.undo_stack = []
+        self.redo_stack = []
+
+    def loadSaveState(self):
+        """Reset the board and current player's hand to the last save state by undoing every move since.
+        Each group is put back once, as it was before the first move that changed it, and only if it ended up different,
+        so a group moved through several times is only redrawn once (or not at all). The moves can be redone."""
+        self.requirePhase(TurnPhase.PLAY)
+        groups = {} # group ID => group before the first move that changed it
+        while len(self.undo_stack) > 0:
+            move = self.undo_stack.pop()
+            card, hand_id, before, after = move
+            groups.update(before) # the moves are undone last first, so earlier moves overwrite later ones
+            if hand_id is not None: self.curr_player.insertIntoHand(hand_id, card)
+            self.redo_stack.append(move)
+        card_groups = self.board.card_groups
+        for group_id, group in groups.items():
+            if not sameCards(card_groups.get(group_id), group): self.board.restoreGroup(group_id, group)
+        if self.log is not None: self.log.record(Action.RESET)
+
+    def undo(self):
+        """Undo the last move made in this play phase. Return false if there was nothing to undo."""
+        self.requirePhase(TurnPhase.PLAY)
+        if not self.undoMove(): return False
+        if self.log is not None: self.log.record(Action.UNDO)
+        return True
+
+    def undoMove(self):
+        if len(self.undo_stack) == 0: return False
+        move = self.undo_stack.pop()
+        card, hand_id, before, after = move
+        for group_id, group in before.items():
+            self.board.restoreGroup(group_id, group)
+        if hand_id is not None: self.curr_player.insertIntoHand(hand_id, card)
+        self.redo_stack.append(move)
+        return True
+
+    def redo(self):
+        """Make the last undone move again. Return false if there was nothing to redo."""
+        self.requirePhase(TurnPhase.PLAY)
+        if len(self.redo_stack) == 0: return False
+        move = self.redo_stack.pop()
+        card, hand_id, before, after = move
+        if hand_id is not None: self.curr_player.removeFromHand(hand_id)
+        for group_id, group in after.items():
+            self.board.restoreGroup(group_id, group)
+        self.undo_stack.append(move)
+        if self.log is not None: self.log.record(Action.REDO)
+        return True
+
+    def moveCard(self, card:Card, to_group_id:int):
+        """Move card to specified card group on board.
+        If card is in a group, split that group on that card.
+        :param to_group_id: ID of card group to move card to
+        """
+        self.requirePhase(TurnPhase.PLAY)
+        card_groups = self.board.card_groups
+        if card.parent_type == Parent.HAND:
+            if card.parent_id != self.curr_player.id:
+                raise RuntimeError("This card is in another player's hand!")
+            hand_id = card.card_id
+            before = {to_group_id: card_groups.get(to_group_id)}
+            # remove card from hand
+            self.curr_player.removeFromHand(card.card_id)
+            # add to specified card group
+            self.board.addToGroup(to_group_id, card)
+        else: # CARDGROUP
+            hand_id = None
+            before = {card.parent_id: card_groups.get(card.parent_id), to_group_id: card_groups.get(to_group_id)}
+            self.board.splitGroup(card.parent_id, card.card_id, to_group_id)
+        # the groups in before were replaced rather than changed, so the move keeps them as they were
+        after = {group_id: card_groups.get(group_id) for group_id in before}
+        self.undo_stack.append((card, hand_id, before, after))
+        self.redo_stack = []
+        if self.log is not None: self.log.record(Action.MOVE, card.uid, to_group_id)
@@ -0,0 +1,107 @@
+"""
+File: hints.py
+Author: Willow Jordan
+Purpose: This script defines the MeldFinder class, which finds every set and run in a hand, and every hand card that extends a group on the board.
+It indexes the hand by value and by suit once, so each search only looks at cards that could belong to a meld.
+"""
+
+from functools import lru_cache
+from itertools import product
+
+from game_objects.card import Card
+from game_objects.board import CardGroup
+from game_objects.melds import MeldType, meldType
+
+MIN_MELD_SIZE = 3 # same as BoardState.validateGroups
+
+@lru_cache(maxsize=None)
+def setCounts(copies:tuple):
+    """Return every way to pick a set from cards of one value, given how many copies of each suit there are,
+    by size and then by suits. Each is a tuple of (suit index, copy index) for every card picked (the first copies of each suit)."""
+    counts = [count for count in product(*[range(0, number + 1) for number in copies]) if sum(count) >= MIN_MELD_SIZE]
+    counts.sort(key=lambda count: (sum(count), [-number for number in count]))
+    return [tuple((suit, i) for suit in range(0, 4) for i in range(0, count[suit])) for count in counts]
+
+def findHints(hand:list[Card], card_groups:dict[int, CardGroup]):
+    """Return (melds, extensions): every meld in the hand (longest first) and every (card, group ID) that extends a group.
+    Pass copies of the hand and groups if the real ones may change while this runs (e.g. on a worker thread)."""
+    finder = MeldFinder(hand)
+    melds = finder.findMelds()
+    melds.sort(key=len, reverse=True)
+    return melds, finder.findExtensions(card_groups)
+
+class MeldFinder():
+    def __init__(self, hand:list[Card]):
+        self.hand = hand
+        # value => every card with that value, and suit index => {value => card}
+        # (with more than one deck, runs can only use one copy of a card, so by_suit keeps the first)
+        self.by_value: dict[int, list[Card]] = {}
+        self.by_suit: list[dict[int, Card]] = [{}, {}, {}, {}]
+        for card in hand:
+            self.by_value.setdefault(card.value, []).append(card)
+            self.by_suit[card.suit._value_].setdefault(card.value, card)
+
+    def findSets(self):
+        """Return a list of every set (as a list of cards) that can be made from the hand, smallest first.
+        Identical cards from other decks are interchangeable, so each set is a count of cards per suit (using the first copies in the hand):
+        at most (copies + 1)^4 sets per value, rather than every combination of the copies."""
+        sets = []
+        for value in sorted(self.by_value):
+            cards = self.by_value[value]
+            if len(cards) < MIN_MELD_SIZE: continue
+            suits = [[], [], [], []] # the cards in each suit
+            for card in cards:
+                suits[card.suit._value_].append(card)
+            for picks in setCounts(tuple(len(cards) for cards in suits)):
+                sets.append([suits[suit][i] for suit, i in picks])
+        return sets
+
+    def findRuns(self):
+        """Return a list of every run (as a list of cards, in order) that can be made from the hand.
+        Runs may wrap from King to Ace, the same as CardGroup.isValidRun."""
+        runs = []
+        for suit_cards in self.by_suit:
+            if len(suit_cards) < MIN_MELD_SIZE: continue
+            if len(suit_cards) == 13:
+                # every start gives the same 13 cards, so only list the full suit once
+                runs.append([suit_cards[value] for value in range(1, 14)])
+            for start in range(1, 14):
+                if start not in suit_cards: continue
+                run = [suit_cards[start]]
+                value = start
+                while len(run) < 12: # a gap always ends the run before it can wrap back to start
+                    value = value % 13 + 1
+                    if value not in suit_cards: break
+                    run.append(suit_cards[value])
+                    if len(run) >= MIN_MELD_SIZE: runs.append(list(run))
+        return runs
+
+    def findMelds(self):
+        """Return a list of every set and run that can be made from the hand."""
+        return self.findSets() + self.findRuns()
+
+    def findExtensions(self, card_groups:dict[int, CardGroup]):
+        """Return a list of (card, group ID) for every hand card that can be added to a valid group on the board
+        so that it stays a valid run or set."""
+        extensions = []
+        seen = set() # (value, group ID) of run extensions found, since both ends of a 12 card run are the same missing value
+        for group_id in sorted(card_groups):
+            group = card_groups[group_id]
+            if len(group) < MIN_MELD_SIZE: continue
+            group_type = meldType(group)
+            if group_type == MeldType.SET:
+                # any card of the same value extends a set (there are no more left in a single deck once all four suits are in it)
+                for card in self.by_value.get(group[0].value, []):
+                    extensions.append((card, group_id))
+            elif (group_type == MeldType.RUN) and (len(group) < 13):
+                suit_cards = self.by_suit[group[0].suit._value_]
+                values = set(card.value for card in group)
+                # the only values that extend a run are the ones just past either end
+                for value in values:
+                    above = value % 13 + 1
+                    below = (value - 2) % 13 + 1
+                    for end in (above, below):
+                        if (end not in values) and (end in suit_cards) and ((end, group_id) not in seen):
+                            seen.add((end, group_id))
+                            extensions.append((suit_cards[end], group_id))
+        return extensions
@@ -0,0 +1,84 @@
+"""
+File: hitgrid.py
+Author: Willow Jordan
+Purpose: This script defines the HitGrid class, a spatial index of the click regions of the cards drawn on a canvas.
+Regions are bucketed into a uniform grid of square cells, so finding the card under a point only looks at the few cards
+that overlap its cell, however many are on screen. Card.draw() and Card.erase() keep it up to date.
+"""
+
+import weakref
+
+class HitGrid():
+    CELL_SIZE = 64 # pixels per side of a cell; about a card's size, so most regions touch 1-4 cells
+
+    # canvas => HitGrid (every canvas has its own, like its items)
+    _grids = weakref.WeakKeyDictionary()
+
+    def __init__(self, cell_size:int = CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells:dict[tuple, dict] = {} # (column, row) => {item ID: (bounds, value, order)} for every region touching the cell
+        self.regions:dict[int, tuple] = {} # item ID => (bounds, value, order)
+        self.next_order = 0 # regions added later are on top (canvas items are raised when they're drawn again, see Scene.draw)
+
+    @classmethod
+    def forCanvas(cls, canvas):
+        """Return the hit grid for the given canvas, creating it if necessary."""
+        grid = cls._grids.get(canvas)
+        if grid is None:
+            grid = cls()
+            cls._grids[canvas] = grid
+        return grid
+
+    def cellRange(self, bounds:tuple):
+        """Return the (first column, first row, last column, last row) of the cells the given bounds touch."""
+        size = self.cell_size
+        return (int(bounds[0] // size), int(bounds[1] // size), int(bounds[2] // size), int(bounds[3] // size))
+
+    def add(self, item_id:int, bounds:tuple, value):
+        """Add a clickable region.
+        :param item_id: Canvas item ID of the region. The region goes on top of every other one.
+        :param bounds: (x0, y0, x1, y1) of the region, including its edges.
+        :param value: What hit() returns for this region (e.g. the card).
+        """
+        if item_id in self.regions: self.remove(item_id)
+        entry = (bounds, value, self.next_order)
+        self.next_order += 1
+        self.regions[item_id] = entry
+        col0, row0, col1, row1 = self.cellRange(bounds)
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                cell = self.cells.get((col, row))
+                if cell is None:
+                    cell = {}
+                    self.cells[(col, row)] = cell
+                cell[item_id] = entry
+
+    def remove(self, item_id:int):
+        """Remove the region with the given item ID, if there is one."""
+        entry = self.regions.pop(item_id, None)
+        if entry is None: return
+        col0, row0, col1, row1 = self.cellRange(entry[0])
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                cell = self.cells[(col, row)]
+                del cell[item_id]
+                if len(cell) == 0: del self.cells[(col, row)]
+
+    def hit(self, x, y, accept = None):
+        """Return the value of the topmost region containing (x, y), or None if there isn't one.
+        :param accept: Optional function of a value; regions whose value it returns false for are skipped.
+        """
+        cell = self.cells.get((int(x // self.cell_size), int(y // self.cell_size)))
+        if cell is None: return None
+        top_order = -1
+        top = None
+        for bounds, value, order in cell.values():
+            if order <= top_order: continue
+            if (x < bounds[0]) or (y < bounds[1]) or (x > bounds[2]) or (y > bounds[3]): continue
+            if (accept is not None) and not accept(value): continue
+            top_order = order
+            top = value
+        return top
+
+    def __len__(self):
+        return len(self.regions)
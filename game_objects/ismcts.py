@@ -0,0 +1,290 @@
+"""
+File: ismcts.py
+Author: Willow Jordan
+Purpose: This script defines ISMCTSBot, a bot that chooses every draw, play and discard with information set Monte Carlo tree search.
+Each iteration deals the cards the bot can't see (other players' hands and the deck) at random, consistent with what it has seen
+(its own hand, the board, the discard pile, how many cards everyone holds and which cards they took from the discard pile), then walks a single tree shared by every deal.
+Games are finished with GreedyBot, and every player is rewarded by how many opponents they finish ahead of.
+The legal actions of every position reached are kept in a transposition table keyed by GameState.stateHash, so positions
+visited again (by later iterations, or by making the same plays in another order) don't search the hand for melds again.
+Searches can run in several processes at once (root parallelization); their root visit counts are added together.
+"""
+
+import math
+import multiprocessing
+import random
+import time
+
+from game_objects.card import Card, Parent
+from game_objects.game_state import GameState, TurnPhase
+from game_objects.shoe import Shoe
+from game_objects.bots import BOTS, Bot, GreedyBot, playTurn
+from game_objects.zobrist import TranspositionTable
+
+EXPLORATION = 0.7 # UCB exploration constant (rewards are between 0 and 1)
+ROLLOUT_TURNS = 40 # turns to play out before scoring hands as they are
+MAX_CACHED_POSITIONS = 50000 # positions whose legal actions are kept per search
+GREEDY = GreedyBot() # for ordering actions (its draw choice doesn't use its random number generator)
+
+# actions, as tuples that mean the same thing in every deal:
+# ("draw", "deck") or ("draw", "discard") to draw, ("meld", codes) to lay down a new meld, ("extend", code, group ID) to add to a group,
+# ("end",) to end the play phase and ("discard", code) to discard
+DRAW_DECK = ("draw", "deck")
+DRAW_DISCARD = ("draw", "discard")
+END_PLAY = ("end",)
+
+def legalActions(game:GameState):
+    """Return a list of every action the current player can take, in the order GreedyBot would prefer them.
+    The search tries actions in this order and breaks ties with it, so short searches play like GreedyBot."""
+    phase = game.turn_phase
+    if phase == TurnPhase.DRAW:
+        actions = []
+        if game.canDrawFromDeck(): actions.append(DRAW_DECK)
+        if len(game.discard_pile) > 0:
+            if (len(actions) > 0) and GREEDY.chooseDraw(game): actions.insert(0, DRAW_DISCARD)
+            else: actions.append(DRAW_DISCARD)
+        return actions
+    if phase == TurnPhase.PLAY:
+        plays = Bot.legalPlays(game)
+        plays.sort(key=lambda play: (len(play[0]), sum(GameState.cardScore(card) for card in play[0])), reverse=True)
+        actions = []
+        for cards, group_id in plays:
+            if group_id is None: actions.append(("meld", tuple(sorted(card.code for card in cards))))
+            else: actions.append(("extend", cards[0].code, group_id))
+        actions.append(END_PLAY)
+        return actions
+    if phase == TurnPhase.DISCARD:
+        hand = game.curr_player.hand
+        hand = sorted(hand, key=lambda card: (GreedyBot.keepValue(card, hand), -GameState.cardScore(card)))
+        actions = []
+        for card in hand:
+            if ("discard", card.code) not in actions: actions.append(("discard", card.code))
+        return actions
+    return []
+
+def cachedActions(game:GameState, table:TranspositionTable):
+    """Return legalActions(game), from the table if the position was reached before.
+    Positions are keyed by the board, the current player's hand, the top of the discard pile and the phase, which is everything
+    the play and discard actions depend on. The same board can have different group IDs when it was reached by another order of plays,
+    so extensions are stored by the hash of the group they extend (see BoardState.group_hashes) rather than its ID."""
+    if game.turn_phase == TurnPhase.DRAW: return legalActions(game) # (also depends on whether the deck can be drawn from, which isn't hashed)
+    key = game.stateHash([game.curr_player.id])
+    cached = table.get(key)
+    if cached is not None:
+        group_ids = {group_hash: group_id for group_id, group_hash in game.board.group_hashes.items()}
+        actions = []
+        for action in cached:
+            if action[0] == "extend": action = ("extend", action[1], group_ids[action[2]])
+            if action not in actions: actions.append(action) # (identical groups from different decks share a hash)
+        return actions
+    actions = legalActions(game)
+    group_hashes = game.board.group_hashes
+    table.put(key, [("extend", action[1], group_hashes[action[2]]) if action[0] == "extend" else action for action in actions])
+    return actions
+
+def findInHand(game:GameState, code:int, skip:list[Card] = ()):
+    """Return the card with the given code in the current player's hand.
+    :param skip: Cards not to return, so that identical cards from other decks can be picked one at a time.
+    """
+    for card in game.curr_player.hand:
+        if (card.code == code) and all(card.uid != other.uid for other in skip): return card
+    raise ValueError(f"No card with code {code} in player {game.curr_player.id}'s hand")
+
+def findAllInHand(game:GameState, codes:tuple):
+    """Return a different card from the current player's hand for each of the given codes."""
+    cards = []
+    for code in codes:
+        cards.append(findInHand(game, code, cards))
+    return cards
+
+def applyAction(game:GameState, action:tuple):
+    """Apply the given action for the current player. Starts the next player's turn if this one ended."""
+    kind = action[0]
+    if action == DRAW_DECK: game.drawFromDeck()
+    elif action == DRAW_DISCARD: game.drawFromDiscard()
+    elif kind == "meld": Bot.makePlay(game, findAllInHand(game, action[1]))
+    elif kind == "extend": Bot.makePlay(game, [findInHand(game, action[1])], action[2])
+    elif kind == "end":
+        error = game.endPlayPhase()
+        if error is not None: raise RuntimeError(f"Can't end the play phase: {error}")
+    else: # discard
+        game.discard(findInHand(game, action[1]).card_id)
+    if (not game.isOver()) and (game.turn_phase == TurnPhase.READY):
+        game.startTurn()
+
+def determinize(game:GameState, observer_id:int, rng:random.Random):
+    """Return a copy of the game with every card the observer can't see dealt at random.
+    Other players keep their hand sizes and the cards everyone saw them take from the discard pile (see Player.picked_up),
+    and the deck keeps its size."""
+    state = game.clone(random.Random(rng.random()))
+    hidden:list[Card] = list(state.deck)
+    for player in state.players:
+        if player.id != observer_id: hidden += [card for card in player.hand if card.uid not in player.picked_up]
+    rng.shuffle(hidden)
+    start = 0
+    for player in state.players:
+        if player.id == observer_id: continue
+        hand = [card for card in player.hand if card.uid in player.picked_up]
+        count = len(player.hand) - len(hand)
+        hand += hidden[start:start + count]
+        start += count
+        for i in range(0, len(hand)):
+            hand[i].setInternals(Parent.HAND, player.id, i)
+        player.setHand(hand)
+    state.deck = Shoe(hidden[start:], state.rng)
+    return state
+
+def rewards(game:GameState):
+    """Return a list with every player's reward: the fraction of opponents they finish ahead of (ties count half).
+    Lower scores are better. Unfinished games are scored on the hands as they are."""
+    scores = game.scores if game.isOver() else game.calculateScores()
+    num_players = len(game.players)
+    result = []
+    for player in game.players:
+        ahead = 0.0
+        for other in game.players:
+            if other.id == player.id: continue
+            if scores[player.id] < scores[other.id]: ahead += 1
+            elif scores[player.id] == scores[other.id]: ahead += 0.5
+        result.append(ahead / (num_players - 1))
+    return result
+
+class Node():
+    __slots__ = ("action", "parent", "player", "children", "visits", "reward", "available")
+
+    def __init__(self, action:tuple = None, parent:'Node' = None, player:int = None):
+        """
+        :param action: The action that leads to this node from its parent.
+        :param parent: The parent node.
+        :param player: ID of the player who took the action (their reward is what this node collects).
+        """
+        self.action = action
+        self.parent = parent
+        self.player = player
+        self.children:dict[tuple, Node] = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.available = 0 # times this node's action was legal when its parent was visited
+
+    def ucb(self):
+        return self.reward / self.visits + EXPLORATION * math.sqrt(math.log(self.available) / self.visits)
+
+def search(game:GameState, time_budget:float, seed:int):
+    """Search from the current player's point of view until the time budget runs out.
+    Return (root statistics, iterations, transposition table statistics): root statistics are a dict of action => [visits, total reward]
+    for every action tried at the root."""
+    rng = random.Random(seed)
+    table = TranspositionTable(MAX_CACHED_POSITIONS)
+    observer_id = game.curr_player.id
+    rollout_bots = [GreedyBot(random.Random(rng.random())) for player in game.players]
+    root = Node()
+    deadline = time.perf_counter() + time_budget
+    iterations = 0
+    # always finish at least one iteration, so there's something to choose from
+    while (iterations == 0) or (time.perf_counter() < deadline):
+        iterations += 1
+        state = determinize(game, observer_id, rng)
+        node = root
+        # selection and expansion
+        while not state.isOver():
+            actions = cachedActions(state, table)
+            untried = []
+            for action in actions:
+                child = node.children.get(action)
+                if child is None: untried.append(action)
+                else: child.available += 1
+            player_id = state.curr_player.id
+            if len(untried) > 0:
+                action = untried[0]
+                child = Node(action, node, player_id)
+                child.available = 1
+                node.children[action] = child
+                applyAction(state, action)
+                node = child
+                break
+            node = max((node.children[action] for action in actions), key=Node.ucb)
+            applyAction(state, node.action)
+        # rollout
+        for turn in range(0, ROLLOUT_TURNS):
+            if state.isOver(): break
+            playTurn(state, rollout_bots[state.curr_player.id])
+        # backpropagation
+        result = rewards(state)
+        while node is not None:
+            node.visits += 1
+            if node.player is not None: node.reward += result[node.player]
+            node = node.parent
+    return {action: [child.visits, child.reward] for action, child in root.children.items()}, iterations, table.stats()
+
+def searchTask(task:tuple):
+    game, time_budget, seed = task
+    return search(game, time_budget, seed)
+
+class ISMCTSBot(Bot):
+    """Chooses every action by ISMCTS. Draws and discards are one search each, and each play in the play phase is another."""
+    name = "ismcts"
+
+    def __init__(self, rng:random.Random = None, time_budget:float = 0.2, workers:int = 1):
+        """
+        :param rng: Random number generator for the bot's searches. If not provided, a new unseeded one is used.
+        :param time_budget: Seconds to search for each action.
+        :param workers: Processes to search in at once. With more than 1, a pool is started on the first search (see close).
+        """
+        super().__init__(rng)
+        self.time_budget = time_budget
+        self.workers = workers
+        self.pool = None
+        self.iterations = 0 # total iterations (playouts) over every search, for benchmarks
+        self.search_time = 0.0 # total seconds spent searching
+        self.cache_lookups = 0 # legal action lookups in the searches' transposition tables, and how many found the position
+        self.cache_hits = 0
+
+    def close(self):
+        """Shut down the search processes, if any were started."""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+    def chooseAction(self, game:GameState):
+        """Return the best action for the current player, searching only if there is a choice to make."""
+        actions = legalActions(game)
+        if len(actions) == 1: return actions[0]
+        # search a copy on a plain board, so the real board isn't touched and the state can be sent to other processes
+        state = game.clone()
+        if (self.workers > 1) and (self.pool is None): self.pool = multiprocessing.Pool(self.workers)
+        start = time.perf_counter()
+        if self.workers <= 1:
+            results = [search(state, self.time_budget, self.rng.getrandbits(64))]
+        else:
+            tasks = [(state, self.time_budget, self.rng.getrandbits(64)) for i in range(0, self.workers)]
+            results = self.pool.map(searchTask, tasks)
+        self.search_time += time.perf_counter() - start
+        # root parallelization: add up every search's visit counts, then pick the most visited action
+        # (ties go to the action GreedyBot prefers, since actions are in that order)
+        merged:dict[tuple, list] = {}
+        for stats, iterations, table_stats in results:
+            self.iterations += iterations
+            self.cache_lookups += table_stats["lookups"]
+            self.cache_hits += table_stats["hits"]
+            for action, (visits, reward) in stats.items():
+                total = merged.setdefault(action, [0, 0.0])
+                total[0] += visits
+                total[1] += reward
+        return max(actions, key=lambda action: merged.get(action, [0, 0.0]))
+
+    def chooseDraw(self, game:GameState):
+        return self.chooseAction(game) == DRAW_DISCARD
+
+    def play(self, game:GameState):
+        while True:
+            action = self.chooseAction(game)
+            if action == END_PLAY: return
+            applyAction(game, action)
+
+    def chooseDiscard(self, game:GameState):
+        return findInHand(game, self.chooseAction(game)[1]).card_id
+
+    def __del__(self):
+        self.close()
+
+BOTS[ISMCTSBot.name] = ISMCTSBot
@@ -0,0 +1,63 @@
+"""
+File: melds.py
+Author: Willow Jordan
+Purpose: This script validates sets and runs using suit/value bitmasks, so the order of the cards doesn't matter.
+Runs may wrap from King to Ace (e.g. Q K A 2), the same as CardGroup.isValidRun.
+With more than one deck, a set may hold identical cards (e.g. two 7 of hearts), but a run may not.
+"""
+
+from enum import Enum
+
+from game_objects.card import Card
+
+ALL_VALUES = (1 << 13) - 1 # one bit per value, Ace (bit 0) thru King (bit 12)
+SUIT_BITS = [1 << suit for suit in range(0, 4)] # Suit.value => bit
+VALUE_BITS = [0] + [1 << (value - 1) for value in range(1, 14)] # value => bit
+SUIT_SHIFT = 13 # a card mask holds its value bit, and its suit bit shifted above the value bits
+CARD_MASKS = [(SUIT_BITS[code // 13] << SUIT_SHIFT) | VALUE_BITS[code % 13 + 1] for code in range(0, 52)] # Card.code => card mask
+
+class MeldType(Enum):
+    INVALID = 0
+    RUN = 1
+    SET = 2
+
+def isCyclicRun(value_mask:int):
+    """Return true if the set bits of value_mask are consecutive, allowing King to wrap around to Ace."""
+    if value_mask == ALL_VALUES: return True
+    # a bit starts a run if the bit for the value below it (King for Ace) is not set
+    below = ((value_mask << 1) | (value_mask >> 12)) & ALL_VALUES
+    starts = value_mask & ~below
+    return (starts != 0) & (starts & (starts - 1) == 0) # exactly one run
+
+# value mask => number of values in it if they make a run, otherwise 0 (so a run of count distinct values is RUN_LENGTHS[mask] == count)
+RUN_LENGTHS = bytes(value_mask.bit_count() if (value_mask != 0) and isCyclicRun(value_mask) else 0 for value_mask in range(0, ALL_VALUES + 1))
+
+def classifyMasks(count:int, suit_mask:int, value_mask:int):
+    """Return the MeldType of count cards with the given suit and value masks.
+    The masks have one bit per distinct suit (bit = Suit.value) and value (bit = value - 1)."""
+    # duplicate cards collapse into one bit, so counting bits rejects them from runs
+    if (suit_mask & (suit_mask - 1) == 0) and (RUN_LENGTHS[value_mask] == count): # single suit
+        return MeldType.RUN
+    if value_mask & (value_mask - 1) == 0: # single value, with any suits (only one of each in a single deck)
+        return MeldType.SET
+    return MeldType.INVALID
+
+def meldType(cards:list[Card]):
+    """Return the MeldType of the given cards, in any order. An empty list is invalid."""
+    if len(cards) == 0: return MeldType.INVALID
+    mask = 0
+    for card in cards:
+        mask |= CARD_MASKS[card.code]
+    return classifyMasks(len(cards), mask >> SUIT_SHIFT, mask & ALL_VALUES)
+
+def meldTypeOfCodes(codes):
+    """Return the MeldType of the given card codes (see encoding.py), in any order."""
+    if len(codes) == 0: return MeldType.INVALID
+    mask = 0
+    for code in codes:
+        mask |= CARD_MASKS[code % 52]
+    return classifyMasks(len(codes), mask >> SUIT_SHIFT, mask & ALL_VALUES)
+
+def isValidMeld(cards:list[Card]):
+    """Return true if the given cards form a set or run of at least 3 cards."""
+    return (len(cards) >= 3) and (meldType(cards) != MeldType.INVALID)
@@ -0,0 +1,195 @@
+"""
+File: movelog.py
+Author: Willow Jordan
+Purpose: This script defines MoveLog, an append-only record of every action that changes a game (see Action in game_state.py),
+and Replayer, which plays a log back headless or onto a screen's board.
+A log starts with the game's seed and a keyframe (the whole game, saved with savefile.py), followed by one record per action,
+a few bytes each. Another keyframe is added every KEYFRAME_INTERVAL actions (at the first point outside a play phase,
+since keyframes don't hold the undo history), so seeking only replays the actions since the nearest one.
+
+Layout (little-endian), version 1:
+    header:   magic "RLOG", version (H), flags (B), seed (Q, 0 if there isn't one)
+    records:  action (B) followed by its arguments: card uid (H) for DISCARD, card uid and group ID (H, H) for MOVE, nothing otherwise;
+              or KEYFRAME (B) followed by the number of actions before it (I), the save's length (I) and the save
+The first record is always a keyframe. A log cut off partway through a record (if the game crashed while writing it)
+is replayed up to the last whole one.
+"""
+
+import struct
+
+from game_objects.board import BoardState
+from game_objects.game_state import GameState, Action, TurnPhase
+from game_objects.savefile import serializeGame, deserializeGame
+
+MAGIC = b"RLOG"
+VERSION = 1
+HEADER = struct.Struct("<4sHBQ")
+FLAG_SEED = 1
+KEYFRAME = 255 # record type of a keyframe (actions use Action values)
+KEYFRAME_HEADER = struct.Struct("<BII")
+ARGUMENTS = {Action.MOVE: struct.Struct("<HH"), Action.DISCARD: struct.Struct("<H")} # action => struct of its arguments
+ACTIONS = {action.value: action for action in Action} # record type => action
+KEYFRAME_INTERVAL = 256
+
+class MoveLog():
+    def __init__(self, game:GameState, path:str = None, keyframe_interval:int = KEYFRAME_INTERVAL):
+        """Start logging the given game's actions (the game's log is set to this).
+        :param path: Optional file to write the log to as it grows. Every record is flushed as soon as it's added,
+            so the log survives a crash. Call close() when done.
+        :param keyframe_interval: Actions between keyframes (more often means faster seeking and a bigger log).
+        """
+        if (len(game.undo_stack) > 0) or (len(game.redo_stack) > 0):
+            raise ValueError("Can't start logging partway through a play phase with moves to undo or redo")
+        self.game = game
+        self.keyframe_interval = keyframe_interval
+        self.actions = 0 # actions recorded
+        self.since_keyframe = 0 # actions recorded since the last keyframe
+        self.file = open(path, "wb") if path is not None else None
+        self.data = bytearray()
+        seed = game.seed if game.seed is not None else 0
+        self.append(HEADER.pack(MAGIC, VERSION, FLAG_SEED if game.seed is not None else 0, seed))
+        self.addKeyframe()
+        game.log = self
+
+    def append(self, record:bytes):
+        self.data += record
+        if self.file is not None:
+            self.file.write(record)
+            self.file.flush()
+
+    def addKeyframe(self):
+        save = serializeGame(self.game)
+        self.append(KEYFRAME_HEADER.pack(KEYFRAME, self.actions, len(save)) + save)
+        self.since_keyframe = 0
+
+    def record(self, action:Action, *arguments):
+        """Add an action (called by GameState after making it)."""
+        arguments_struct = ARGUMENTS.get(action)
+        if arguments_struct is None: self.append(bytes((action.value,)))
+        else: self.append(bytes((action.value,)) + arguments_struct.pack(*arguments))
+        self.actions += 1
+        self.since_keyframe += 1
+        if (self.since_keyframe >= self.keyframe_interval) and (self.game.turn_phase != TurnPhase.PLAY):
+            self.addKeyframe()
+
+    def getBytes(self):
+        """Return the whole log so far."""
+        return bytes(self.data)
+
+    def close(self):
+        """Stop logging and close the log's file, if it has one."""
+        if self.game.log is self: self.game.log = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class Replayer():
+    def __init__(self, data:bytes, board:BoardState = None, sprites = None):
+        """Index the given log (see MoveLog) and load the game as it was when logging started.
+        :param board: The board to replay onto (e.g. a screen's Board). If not provided, a BoardState (which draws nothing) is used.
+        :param sprites: Sprite cache handed to every card, so that they can be drawn. Leave as None for headless replays.
+        """
+        self.data = data
+        self.board = board
+        self.sprites = sprites
+        try: magic, version, flags, seed = HEADER.unpack_from(data, 0)
+        except struct.error: raise ValueError("The log is truncated")
+        if magic != MAGIC: raise ValueError("This isn't a move log")
+        if version != VERSION: raise ValueError(f"Move logs of version {version} aren't supported (this is version {VERSION})")
+        self.seed = seed if flags & FLAG_SEED else None
+        # find every keyframe and action
+        self.keyframes:list[tuple] = [] # (actions before it, offset of its save, length of its save)
+        self.offsets:list[int] = [] # offset of every action
+        self.truncated = False # true if the log ends partway through a record (e.g. the game crashed while writing it), which is ignored
+        offset = HEADER.size
+        while offset < len(data):
+            kind = data[offset]
+            if kind == KEYFRAME:
+                if offset + KEYFRAME_HEADER.size > len(data):
+                    self.truncated = True
+                    break
+                kind, actions, length = KEYFRAME_HEADER.unpack_from(data, offset)
+                if actions != len(self.offsets): raise ValueError("A keyframe in the log is out of place")
+                if offset + KEYFRAME_HEADER.size + length > len(data):
+                    self.truncated = True
+                    break
+                self.keyframes.append((actions, offset + KEYFRAME_HEADER.size, length))
+                offset += KEYFRAME_HEADER.size + length
+                continue
+            action = ACTIONS.get(kind)
+            if action is None: raise ValueError(f"Unknown record type {kind} in the log")
+            size = 1 + (ARGUMENTS[action].size if action in ARGUMENTS else 0)
+            if offset + size > len(data):
+                self.truncated = True
+                break
+            self.offsets.append(offset)
+            offset += size
+        if (len(self.keyframes) == 0) or (self.keyframes[0][0] != 0): raise ValueError("The log doesn't start with a keyframe")
+        self.game:GameState = None
+        self.position = 0 # actions replayed so far
+        self.seek(0)
+
+    def __len__(self):
+        """Return the number of actions in the log."""
+        return len(self.offsets)
+
+    def loadKeyframe(self, index:int):
+        actions, offset, length = self.keyframes[index]
+        self.game, seats = deserializeGame(self.data[offset:offset + length], self.board, self.sprites)
+        self.position = actions
+        # every card, by uid (cards are never replaced during a game, so this stays valid until the next keyframe is loaded)
+        self.cards = {}
+        for card in self.game.deck: self.cards[card.uid] = card
+        for card in self.game.discard_pile: self.cards[card.uid] = card
+        for player in self.game.players:
+            for card in player.hand: self.cards[card.uid] = card
+        for group in self.game.board.card_groups.values():
+            for card in group: self.cards[card.uid] = card
+
+    def getAction(self, index:int):
+        """Return the action with the given index (0 for the first)."""
+        return ACTIONS[self.data[self.offsets[index]]]
+
+    def seek(self, position:int):
+        """Move to the game as it was after the given number of actions, from the nearest keyframe at or before it
+        (or from where the replay is, if that's closer). Return the game."""
+        if (position < 0) or (position > len(self.offsets)): raise ValueError(f"Can't seek to action {position} of {len(self.offsets)}")
+        # the last keyframe at or before the position
+        low, high = 0, len(self.keyframes)
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self.keyframes[middle][0] <= position: low = middle
+            else: high = middle
+        if (self.game is None) or (position < self.position) or (self.keyframes[low][0] > self.position):
+            self.loadKeyframe(low)
+        while self.position < position:
+            self.step()
+        return self.game
+
+    def step(self):
+        """Replay the next action. Return it, or None at the end of the log."""
+        if self.position >= len(self.offsets): return None
+        offset = self.offsets[self.position]
+        action = ACTIONS[self.data[offset]]
+        game = self.game
+        if action == Action.MOVE:
+            uid, group_id = ARGUMENTS[action].unpack_from(self.data, offset + 1)
+            game.moveCard(self.cards[uid], group_id)
+        elif action == Action.DISCARD:
+            uid, = ARGUMENTS[action].unpack_from(self.data, offset + 1)
+            game.discard(self.cards[uid].card_id)
+        elif action == Action.START_TURN: game.startTurn()
+        elif action == Action.DRAW_DECK: game.drawFromDeck()
+        elif action == Action.DRAW_DISCARD: game.drawFromDiscard()
+        elif action == Action.RESET: game.loadSaveState()
+        elif action == Action.UNDO: game.undo()
+        elif action == Action.REDO: game.redo()
+        else: # END_PLAY
+            error = game.endPlayPhase()
+            if error is not None: raise ValueError(f"Action {self.position} of the log can't be replayed: {error}")
+        self.position += 1
+        return action
+
+    def replayAll(self):
+        """Replay every action left. Return the game as it ended up."""
+        return self.seek(len(self.offsets))
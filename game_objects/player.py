@@ -5,20 +5,42 @@ Purpose: This script defines the Player class, which represents one human player
 """
 
 from game_objects.card import Card, Parent
+from game_objects.zobrist import handKey, MASK_64
 
 class Player():
     def __init__(self, id:int, starting_hand:list = []):
         self.score = 0
         self.id = id
-        self.hand = starting_hand # list of cards
+        self.setHand(starting_hand)
+        # uids of the cards this player took from the discard pile, which every player saw (a card is forgotten once it's discarded again)
+        self.picked_up:set[int] = set()
+
+    def setHand(self, hand:list):
+        """Replace the whole hand (list of cards)."""
+        self.hand = hand
+        # sum of every card's key, so the hash doesn't depend on the order of the hand
+        # (a sum rather than XOR so that two identical cards don't cancel out)
+        self.hand_hash = 0
+        for card in hand:
+            self.hand_hash = (self.hand_hash + handKey(card.code, self.id)) & MASK_64
     
     def addToHand(self, card:Card):
         self.hand.append(card)
         card.setInternals(Parent.HAND, self.id, len(self.hand)-1)
+        self.hand_hash = (self.hand_hash + handKey(card.code, self.id)) & MASK_64
     
+    def insertIntoHand(self, id:int, card:Card):
+        """Put a card back into the hand at the given ID (e.g. to undo a move)."""
+        self.hand.insert(id, card)
+        # update the IDs of this card and every card after it
+        for i in range(id, len(self.hand)):
+            self.hand[i].setInternals(Parent.HAND, self.id, i)
+        self.hand_hash = (self.hand_hash + handKey(card.code, self.id)) & MASK_64
+
     def removeFromHand(self, id:int):
         """Remove card with given id from hand."""
         if id >= len(self.hand): raise ValueError("Provided ID does not exist")
+        self.hand_hash = (self.hand_hash - handKey(self.hand[id].code, self.id)) & MASK_64
         del self.hand[id]
         # update all subsequent card's internal IDs
         for i in range(id, len(self.hand)):
@@ -0,0 +1,87 @@
+"""
+File: render.py
+Author: Willow Jordan
+Purpose: This script defines the RenderScheduler class, which coalesces redraws.
+Instead of drawing as soon as something changes, code marks the parts of the screen that changed as dirty,
+and they're all drawn once, in a fixed order, when the event being handled is finished (with after_idle()).
+Like TaskRunner, it doesn't import tkinter: anything with after_idle() and after_cancel() (like a tk widget) can drive it.
+"""
+
+ALL = None # key meaning "all of the component", for components drawn in parts
+
+class RenderScheduler():
+    def __init__(self, widget, coalesce:bool = True):
+        """
+        :param widget: Widget whose after_idle() runs the flush on the UI thread.
+        :param coalesce: If false, every mark is drawn straight away (the old way of drawing), for comparisons.
+        """
+        self.widget = widget
+        self.coalesce = coalesce
+        self.components:list[tuple] = [] # (name, draw function, keyed, names of components it also draws), in drawing order
+        self.dirty:dict[str, set] = {} # component name => keys marked dirty since the last flush
+        self.job = None # pending after_idle() call
+        self.closed = False
+        # statistics
+        self.frames = 0 # flushes that drew something
+        self.marks = 0 # calls to markDirty()
+        self.draws = 0 # component draw functions called
+
+    def register(self, name:str, draw, keyed:bool = False, covers:tuple = ()):
+        """Add a component. Components are drawn in the order they're registered, so register what others depend on first
+        (e.g. the cards before the selection outline around one).
+        :param draw: Function that draws the component. Keyed components are passed the set of dirty keys (which may contain ALL).
+        :param keyed: If true, the component is drawn in parts (e.g. one card group), marked dirty separately.
+        :param covers: Names of components that drawing this one also draws, so they're skipped in the same flush.
+        """
+        self.components.append((name, draw, keyed, covers))
+
+    def markDirty(self, name:str, key = ALL):
+        """Mark a component (or one part of a keyed component) to be drawn in the next flush."""
+        if self.closed: return
+        self.marks += 1
+        self.dirty.setdefault(name, set()).add(key)
+        if not self.coalesce:
+            self.flush()
+        elif self.job is None:
+            self.job = self.widget.after_idle(self.flush)
+
+    def isPending(self):
+        """Return true if anything is waiting to be drawn."""
+        return len(self.dirty) > 0
+
+    def flush(self):
+        """Draw every dirty component now. Called when the UI thread is idle, or early by code that needs the screen up to date
+        (e.g. before finding what was clicked)."""
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+        if len(self.dirty) == 0: return
+        self.frames += 1
+        for name, draw, keyed, covers in self.components:
+            keys = self.dirty.pop(name, None)
+            if keys is None: continue
+            for covered in covers:
+                self.dirty.pop(covered, None)
+            self.draws += 1
+            if keyed: draw(keys)
+            else: draw()
+        # anything marked while drawing (by a component already drawn this frame) is drawn in the next one
+        if (len(self.dirty) > 0) and (self.job is None) and not self.closed:
+            self.job = self.widget.after_idle(self.flush)
+
+    def stats(self):
+        """Return a dict of how many marks were coalesced into how many frames."""
+        return {
+            "frames": self.frames,
+            "marks": self.marks,
+            "draws": self.draws,
+            "marks_per_frame": self.marks / self.frames if self.frames > 0 else 0.0,
+        }
+
+    def shutdown(self):
+        """Stop drawing; anything still dirty is dropped."""
+        self.closed = True
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+        self.dirty = {}
@@ -0,0 +1,170 @@
+"""
+File: savefile.py
+Author: Willow Jordan
+Purpose: This script defines the binary save format: a whole game (shoe order, discard pile, hands, board groups with their IDs,
+whose turn it is and the turn phase, plus who plays each seat) packed with struct.
+The cards take about 2 bytes each; the random number generator's state, which makes later reshuffles of the discard pile
+come out the same as if the game had never been closed, takes another 2.5 KB and can be left out.
+Loading builds the GameState straight from the saved containers, without dealing or replaying any moves.
+Cards are stored by uid (see Card.uid), so identical cards from different decks keep their deck.
+Which cards players took from the discard pile (see Player.picked_up) isn't saved, so after loading, bots only know about later pickups.
+
+Layout (little-endian), version 1:
+    header:   magic "RUMY", version (H), players (B), decks (B), current player (B), turn phase (B), flags (B), uid size (B)
+    seed:     (Q) if FLAG_SEED
+    rng:      624 words of Mersenne Twister state, its position (625 I), and gauss_next (B flag, d) if FLAG_RNG
+    shoe:     card list of the cards left, in dealing order
+    discard:  card list, bottom to top
+    players:  per player, score (i) and card list of their hand
+    board:    number of groups (H), then per group its ID (H) and card list
+    scores:   per player (i) if FLAG_SCORES
+    seats:    per player, bot name length (B) and UTF-8 name (length 0 for a human)
+A card list is a count (H) followed by that many uids, one byte each (two with more than 4 decks).
+"""
+
+import random
+import struct
+
+from game_objects.board import BoardState, CardGroup
+from game_objects.card import Card, Parent
+from game_objects.encoding import SUITS, DECK_SIZE, suitOf, valueOf
+from game_objects.game_state import GameState, TurnPhase
+from game_objects.player import Player
+from game_objects.shoe import Shoe
+
+MAGIC = b"RUMY"
+VERSION = 1
+HEADER = struct.Struct("<4sHBBBBBB")
+RNG_STATE = struct.Struct("<625IBd")
+# flags
+FLAG_SEED = 1
+FLAG_RNG = 2
+FLAG_SCORES = 4
+
+class Reader():
+    """Reads values from save data in order, raising ValueError if it runs out."""
+    def __init__(self, data:bytes):
+        self.data = data
+        self.offset = 0
+
+    def read(self, fmt:str):
+        try: values = struct.unpack_from(fmt, self.data, self.offset)
+        except struct.error: raise ValueError("The save data is truncated")
+        self.offset += struct.calcsize(fmt)
+        return values
+
+def packCards(parts:list, cards, uid_format:str):
+    parts.append(struct.pack(f"<H{len(cards)}{uid_format}", len(cards), *[card.uid for card in cards]))
+
+def serializeGame(game:GameState, seats:list = None, include_rng:bool = True):
+    """Return the given game as bytes.
+    :param seats: Optional list with the name of the bot playing each seat (None for humans). Every seat is human if not provided.
+    :param include_rng: If false, the random number generator's state isn't saved, and a loaded game gets a new one from its seed.
+    """
+    num_players = len(game.players)
+    if seats is None: seats = [None] * num_players
+    uid_format = "B" if game.decks * DECK_SIZE <= 256 else "H"
+    flags = 0
+    if game.seed is not None: flags |= FLAG_SEED
+    if include_rng and (type(game.rng) is random.Random): flags |= FLAG_RNG # (not SystemRandom, which has no state to save)
+    if game.scores is not None: flags |= FLAG_SCORES
+    parts = [HEADER.pack(MAGIC, VERSION, num_players, game.decks, game.curr_player.id, game.turn_phase.value, flags, struct.calcsize(uid_format))]
+    if flags & FLAG_SEED: parts.append(struct.pack("<Q", game.seed))
+    if flags & FLAG_RNG:
+        version, internal_state, gauss_next = game.rng.getstate()
+        parts.append(RNG_STATE.pack(*internal_state, gauss_next is not None, gauss_next or 0.0))
+    packCards(parts, list(game.deck), uid_format)
+    packCards(parts, game.discard_pile, uid_format)
+    for player in game.players:
+        parts.append(struct.pack("<i", player.score))
+        packCards(parts, player.hand, uid_format)
+    card_groups = game.board.card_groups
+    parts.append(struct.pack("<H", len(card_groups)))
+    for group_id, group in card_groups.items():
+        parts.append(struct.pack("<H", group_id))
+        packCards(parts, group, uid_format)
+    if flags & FLAG_SCORES:
+        parts.append(struct.pack(f"<{num_players}i", *[game.scores[player.id] for player in game.players]))
+    for name in seats:
+        encoded = (name or "").encode("utf-8")
+        parts.append(struct.pack("<B", len(encoded)) + encoded)
+    return b"".join(parts)
+
+def deserializeGame(data:bytes, board:BoardState = None, sprites = None):
+    """Return (game, seats) for the given save data (see serializeGame).
+    The game is in the same phase it was saved in; in the play phase, "Reset Board" goes back to the board as it was saved.
+    :param board: The board to put the saved groups on. If not provided, a BoardState (which draws nothing) is used.
+    :param sprites: Sprite cache handed to every card, so that they can be drawn. Leave as None for headless games.
+    """
+    reader = Reader(data)
+    magic, version, num_players, decks, curr_player, turn_phase, flags, uid_size = reader.read(HEADER.format)
+    if magic != MAGIC: raise ValueError("This isn't a saved game")
+    if version != VERSION: raise ValueError(f"Saved games of version {version} aren't supported (this is version {VERSION})")
+    if (num_players < GameState.MIN_PLAYERS) or (decks < 1) or (curr_player >= num_players) or (uid_size not in (1, 2)):
+        raise ValueError("The saved game's header is invalid")
+    uid_format = "B" if uid_size == 1 else "H"
+    # every card, by uid
+    cards = [Card(SUITS[suitOf(uid)], valueOf(uid), sprites=sprites, deck=uid // DECK_SIZE) for uid in range(0, decks * DECK_SIZE)]
+    seen = set()
+    def readCards():
+        count, = reader.read("<H")
+        uids = reader.read(f"<{count}{uid_format}")
+        for uid in uids:
+            if (uid >= len(cards)) or (uid in seen): raise ValueError(f"Card {uid} is missing from the deck or saved twice")
+            seen.add(uid)
+        return [cards[uid] for uid in uids]
+
+    game = GameState.__new__(GameState)
+    game.decks = decks
+    game.seed = reader.read("<Q")[0] if flags & FLAG_SEED else None
+    if flags & FLAG_RNG:
+        state = reader.read(RNG_STATE.format)
+        game.rng = random.Random()
+        game.rng.setstate((3, tuple(state[:625]), state[626] if state[625] else None))
+    else: game.rng = random.Random(game.seed)
+    game.deck = Shoe(readCards(), game.rng)
+    game.discard_pile = readCards()
+    game.players = []
+    for player_id in range(0, num_players):
+        score, = reader.read("<i")
+        hand = readCards()
+        for i in range(0, len(hand)):
+            hand[i].setInternals(Parent.HAND, player_id, i)
+        game.players.append(Player(player_id, hand))
+        game.players[-1].score = score
+    card_groups = {}
+    num_groups, = reader.read("<H")
+    for i in range(0, num_groups):
+        group_id, = reader.read("<H")
+        group = CardGroup(readCards())
+        if (group_id in card_groups) or (len(group) == 0): raise ValueError(f"Group {group_id} is empty or saved twice")
+        for j in range(0, len(group)):
+            group[j].setInternals(Parent.CARDGROUP, group_id, j)
+        card_groups[group_id] = group
+    if len(seen) != len(cards): raise ValueError("The saved game is missing cards")
+    game.scores = None
+    if flags & FLAG_SCORES:
+        game.scores = dict(enumerate(reader.read(f"<{num_players}i")))
+    seats = []
+    for player_id in range(0, num_players):
+        length, = reader.read("<B")
+        name = bytes(reader.read(f"<{length}s")[0]).decode("utf-8")
+        seats.append(name if len(name) > 0 else None)
+    game.board = board if board is not None else BoardState()
+    game.board.replaceGroups(card_groups)
+    game.curr_player = game.players[curr_player]
+    game.turn_phase = TurnPhase(turn_phase)
+    game.undo_stack = []
+    game.redo_stack = []
+    game.log = None
+    return game, seats
+
+def saveGame(path:str, game:GameState, seats:list = None):
+    """Write the given game to a file (see serializeGame)."""
+    with open(path, "wb") as file:
+        file.write(serializeGame(game, seats))
+
+def loadGame(path:str, board:BoardState = None, sprites = None):
+    """Read a game written by saveGame. Return (game, seats) (see deserializeGame)."""
+    with open(path, "rb") as file:
+        return deserializeGame(file.read(), board, sprites)
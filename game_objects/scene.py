@@ -0,0 +1,122 @@
+"""
+File: scene.py
+Author: Willow Jordan
+Purpose: This script defines the Scene class, a retained-mode layer over a canvas.
+Every drawn thing (a card, a board slot, a menu label) keeps one canvas item for as long as it's shown.
+Redrawing it only sends Tk the coordinates and options that changed, and nothing at all if none did,
+instead of deleting the item and creating a new one. The Tk calls made are counted, so redraws can be measured.
+Items belong to an owner (the part of the screen that drew them), which is also their canvas tag,
+so an owner's items can be deleted with a single call and counted to catch leaks.
+(Owners are passed to Tk as a one-tag tuple: a string would be split into a tag per word, so "turn menu" would become "turn" and "menu".)
+Like TaskRunner, it doesn't import tkinter: anything with the canvas item methods can be drawn on.
+"""
+
+import weakref
+
+class Scene():
+    # canvas => Scene (every canvas has its own, like its items)
+    _scenes = weakref.WeakKeyDictionary()
+
+    def __init__(self, canvas, retained:bool = True):
+        """
+        :param canvas: The canvas to draw on.
+        :param retained: If false, every redraw deletes the item and creates a new one (the old way of drawing), for comparisons.
+        """
+        self.canvas = canvas
+        self.retained = retained
+        self.items:dict[int, tuple] = {} # item ID => (kind, coordinates, options) it was last drawn with
+        self.owners:dict[int, str] = {} # item ID => owner
+        self.owned:dict[str, set] = {} # owner => IDs of its items
+        self.peaks:dict[str, int] = {} # owner => most items it has had at once
+        self.calls:dict[str, int] = {"create": 0, "coords": 0, "itemconfigure": 0, "raise": 0, "delete": 0} # Tk calls made
+
+    @classmethod
+    def forCanvas(cls, canvas):
+        """Return the scene for the given canvas, creating it if necessary."""
+        scene = cls._scenes.get(canvas)
+        if scene is None:
+            scene = cls(canvas)
+            cls._scenes[canvas] = scene
+        return scene
+
+    def draw(self, item_id:int, kind:str, *coords, owner:str = "other", on_top:bool = False, **options):
+        """Draw an item, reusing the existing one if there is one. Return the item's ID (use it for the next draw).
+        :param item_id: ID the item was last drawn with, or None to create it.
+        :param kind: What canvas.create_<kind> makes (e.g. "image", "rectangle", "text", "line").
+        :param owner: Name of the part of the screen the item belongs to, used as its tag. Only used when the item is created.
+        :param on_top: If true and the item moved, raise it above every other item, as if it had just been created.
+        :param options: Item options (fill, text, image, state...). Options left out keep their current value.
+        """
+        if item_id is not None:
+            drawn = self.items.get(item_id)
+            if (drawn is not None) and (drawn[0] == kind) and self.retained:
+                return self.update(item_id, drawn, coords, options, on_top)
+            owner = self.owners.get(item_id, owner)
+            self.delete(item_id)
+        item_id = getattr(self.canvas, "create_" + kind)(*coords, tags=(owner,), **options)
+        self.calls["create"] += 1
+        self.items[item_id] = (kind, coords, options)
+        self.owners[item_id] = owner
+        owned = self.owned.setdefault(owner, set())
+        owned.add(item_id)
+        if len(owned) > self.peaks.get(owner, 0): self.peaks[owner] = len(owned)
+        return item_id
+
+    def update(self, item_id:int, drawn:tuple, coords:tuple, options:dict, on_top:bool):
+        kind, old_coords, old_options = drawn
+        moved = coords != old_coords
+        if moved:
+            self.canvas.coords(item_id, *coords)
+            self.calls["coords"] += 1
+            if on_top:
+                self.canvas.tag_raise(item_id)
+                self.calls["raise"] += 1
+        changed = {}
+        for name, value in options.items():
+            if (name not in old_options) or (old_options[name] is not value and old_options[name] != value):
+                changed[name] = value
+        if len(changed) > 0:
+            self.canvas.itemconfigure(item_id, **changed)
+            self.calls["itemconfigure"] += 1
+            old_options = {**old_options, **changed}
+        if moved or (len(changed) > 0):
+            self.items[item_id] = (kind, coords, old_options)
+        return item_id
+
+    def setState(self, item_id:int, visible:bool):
+        """Show or hide an item without deleting it (in either mode)."""
+        self.update(item_id, self.items[item_id], self.items[item_id][1], {"state": "normal" if visible else "hidden"}, False)
+
+    def delete(self, item_id:int):
+        """Delete an item, if it's still on the canvas."""
+        if self.items.pop(item_id, None) is None: return
+        self.owned[self.owners.pop(item_id)].discard(item_id)
+        self.canvas.delete(item_id)
+        self.calls["delete"] += 1
+
+    def deleteOwner(self, owner:str):
+        """Delete every item belonging to the given owner, with one call (by tag)."""
+        owned = self.owned.get(owner)
+        if not owned: return
+        for item_id in owned:
+            del self.items[item_id]
+            del self.owners[item_id]
+        owned.clear()
+        self.canvas.delete(owner)
+        self.calls["delete"] += 1
+
+    def liveCounts(self):
+        """Return a dict of owner => (items it has now, most items it has had at once), to check that long games don't leak items."""
+        return {owner: (len(self.owned[owner]), self.peaks[owner]) for owner in self.owned}
+
+    def totalCalls(self):
+        return sum(self.calls.values())
+
+    def takeCalls(self):
+        """Return the Tk calls made since the last takeCalls(), by kind, and start counting again."""
+        calls = self.calls
+        self.calls = {name: 0 for name in calls}
+        return calls
+
+    def __len__(self):
+        return len(self.items)
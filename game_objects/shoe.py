@@ -0,0 +1,63 @@
+"""
+File: shoe.py
+Author: Willow Jordan
+Purpose: This script defines the Shoe class, the pile of cards players draw from.
+Cards are dealt by moving an index forward, so dealing never copies or shifts the list,
+and the discard pile is reshuffled into it in place. All shuffling uses the random number generator it is given,
+so the same seed always gives the same deal.
+"""
+
+import random
+
+from game_objects.card import Card
+
+class Shoe():
+    def __init__(self, cards:list[Card], rng:random.Random):
+        """
+        :param cards: The cards in the shoe, in dealing order. The shoe takes ownership of the list.
+        :param rng: Random number generator used for every shuffle.
+        """
+        self.cards = cards
+        self.rng = rng
+        self.next = 0 # index of the next card to deal; cards before it have been dealt
+
+    def __len__(self):
+        return len(self.cards) - self.next
+
+    def __iter__(self):
+        """Iterate over the cards left, in dealing order."""
+        for i in range(self.next, len(self.cards)):
+            yield self.cards[i]
+
+    def shuffle(self):
+        """Shuffle the cards left in the shoe."""
+        if self.next > 0:
+            # drop the dealt cards first so that only the rest are shuffled
+            del self.cards[:self.next]
+            self.next = 0
+        self.rng.shuffle(self.cards)
+
+    def deal(self):
+        """Deal the next card."""
+        if self.next >= len(self.cards): raise ValueError("The shoe is empty")
+        card = self.cards[self.next]
+        self.next += 1
+        return card
+
+    def dealMany(self, count:int):
+        """Deal the next count cards, as a list in dealing order."""
+        if count > len(self): raise ValueError(f"Can't deal {count} cards from a shoe with {len(self)} left")
+        cards = self.cards[self.next:self.next + count]
+        self.next += count
+        return cards
+
+    def reshuffleFrom(self, discard_pile:list[Card]):
+        """Move every card but the top one from the discard pile into the shoe and shuffle them.
+        The discard pile's list is shuffled in place and becomes the shoe's list, and the top card is returned
+        (it is the whole discard pile from now on). The shoe must be empty."""
+        if len(self) > 0: raise RuntimeError("Can't reshuffle the discard pile into a shoe that still has cards")
+        top = discard_pile.pop()
+        self.cards = discard_pile
+        self.next = 0
+        self.rng.shuffle(self.cards)
+        return top
@@ -0,0 +1,210 @@
+"""
+File: solver.py
+Author: Willow Jordan
+Purpose: This script defines the BoardSolver class, which rearranges the board to play as many cards from a hand as possible.
+Every card already on the board must stay on the board, so the result is a full partition of the board cards (plus the hand cards played) into valid sets and runs.
+The search is exponential in the worst case, so it prunes, memoizes and stops at a wall-clock budget, returning the best result found so far.
+"""
+
+import time
+from itertools import combinations, product
+
+from game_objects.card import Card
+from game_objects.board import CardGroup
+from game_objects.melds import isValidMeld
+from game_objects.zobrist import TranspositionTable
+
+MIN_MELD_SIZE = 3 # same as BoardState.validateGroups
+CHECK_TIME_EVERY = 1024 # nodes between wall-clock checks
+MAX_MEMO_SIZE = 1000000 # memoized positions kept before the oldest is evicted
+
+class OutOfTime(Exception):
+    pass
+
+class SolverResult():
+    def __init__(self, groups:list[list[Card]], placed:list[Card], complete:bool, nodes:int, elapsed:float):
+        """
+        :param groups: Every group on the rearranged board, each a valid run or set in display order.
+        :param placed: The hand cards played onto the board.
+        :param complete: True if the search finished, so no arrangement plays more cards. False if it ran out of time.
+        :param nodes: Number of search nodes visited.
+        :param elapsed: Seconds spent searching.
+        """
+        self.groups = groups
+        self.placed = placed
+        self.complete = complete
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __str__(self):
+        status = "optimal" if self.complete else "best found before time ran out"
+        return f"SolverResult: {len(self.placed)} cards placed in {len(self.groups)} groups ({status}, {self.nodes} nodes, {self.elapsed:.3f}s)"
+
+def orderMeld(cards:list[Card]):
+    """Return the cards of a valid set or run in display order (runs in sequence, starting after the gap)."""
+    if len(set(card.value for card in cards)) == 1:
+        return sorted(cards, key=lambda card: card.suit._value_)
+    values = set(card.value for card in cards)
+    ordered = sorted(cards, key=lambda card: card.value)
+    # a run that wraps King to Ace starts at the value whose predecessor is missing
+    for i in range(0, len(ordered)):
+        if ((ordered[i].value - 2) % 13 + 1) not in values:
+            return ordered[i:] + ordered[:i]
+    return ordered
+
+class BoardSolver():
+    def __init__(self, card_groups:dict[int, CardGroup], hand:list[Card], time_budget:float = 1.0):
+        """
+        :param card_groups: The groups currently on the board (their cards must all stay on the board).
+        :param hand: The cards that may be played.
+        :param time_budget: Seconds to search before returning the best result found so far.
+        """
+        self.time_budget = time_budget
+        self.start_groups = [list(group) for group in card_groups.values()]
+        # every card gets a bit: board cards first, then hand cards
+        self.cards:list[Card] = [card for group in self.start_groups for card in group] + list(hand)
+        self.board_mask = (1 << sum(len(group) for group in self.start_groups)) - 1
+        self.hand_mask = ((1 << len(self.cards)) - 1) & ~self.board_mask
+        self.melds_of = self.findCandidateMelds()
+        # remaining cards mask => (most hand cards placeable, meld chosen or 0 to skip a hand card)
+        # the mask is already independent of move order, so it is used as the key directly
+        self.memo = TranspositionTable(MAX_MEMO_SIZE)
+
+    def findCandidateMelds(self):
+        """Return a list holding, for every card bit, the masks of every meld the card could be part of.
+        Melds that play more hand cards come first so good results are found early."""
+        # (suit index, value) => bits of cards with that suit and value (several with more than one deck)
+        index:dict[tuple, list[int]] = {}
+        for i in range(0, len(self.cards)):
+            key = (self.cards[i].suit._value_, self.cards[i].value)
+            index.setdefault(key, []).append(1 << i)
+        melds = set()
+        # sets: 3 or more cards of one value (any suits, since identical cards from other decks may share a set)
+        for value in range(1, 14):
+            bits = [bit for suit in range(0, 4) for bit in index.get((suit, value), [])]
+            for size in range(MIN_MELD_SIZE, len(bits) + 1):
+                for combo in combinations(bits, size):
+                    melds.add(sum(combo))
+        # runs: 3-13 consecutive values of one suit, wrapping King to Ace
+        for suit in range(0, 4):
+            for start in range(1, 14):
+                values = []
+                for length in range(1, 14):
+                    value = (start + length - 2) % 13 + 1
+                    if (suit, value) not in index: break
+                    values.append(value)
+                    if (length < MIN_MELD_SIZE) | ((length == 13) & (start != 1)): continue
+                    for bits in product(*[index[(suit, v)] for v in values]):
+                        melds.add(sum(bits))
+        melds_of = [[] for card in self.cards]
+        for meld in melds:
+            bits = meld
+            while bits:
+                low = bits & -bits
+                melds_of[low.bit_length() - 1].append(meld)
+                bits ^= low
+        for meld_list in melds_of:
+            meld_list.sort(key=lambda meld: ((meld & self.hand_mask).bit_count(), meld.bit_count()), reverse=True)
+        return melds_of
+
+    def solve(self):
+        """Search for the arrangement that places the most hand cards. Return a SolverResult."""
+        self.start_time = time.perf_counter()
+        self.deadline = self.start_time + self.time_budget
+        self.nodes = 0
+        self.path:list[int] = [] # melds chosen on the way to the current node
+        self.best_placed = -1
+        self.best_path = None
+        # the current layout is a valid answer that places nothing
+        if all(isValidMeld(group) for group in self.start_groups):
+            self.best_placed = 0
+            self.best_path = None # None means "keep the current groups"
+        all_cards = (1 << len(self.cards)) - 1
+        try:
+            placed = self.search(all_cards, 0)
+            complete = True
+            if placed >= 0:
+                self.deadline = float("inf") # reconstructing may need to search again if part of the memo was evicted
+                self.best_placed = placed
+                self.best_path = self.reconstruct(all_cards)
+        except OutOfTime:
+            complete = False
+        return self.makeResult(complete)
+
+    def search(self, remaining:int, placed:int):
+        """Return the most hand cards that can be placed using the remaining cards, or -1 if some remaining board card can't be placed.
+        :param remaining: Mask of cards not yet in a meld.
+        :param placed: Hand cards placed on the path to this node (only used to record the best result so far).
+        """
+        known = self.memo.get(remaining)
+        if known is not None: return known[0]
+        self.nodes += 1
+        if self.nodes % CHECK_TIME_EVERY == 0:
+            if time.perf_counter() > self.deadline: raise OutOfTime()
+        required = remaining & self.board_mask
+        hand_left = remaining & self.hand_mask
+        if required == 0:
+            # every board card is placed, so this path is a valid board
+            if placed > self.best_placed:
+                self.best_placed = placed
+                self.best_path = list(self.path)
+            if hand_left == 0:
+                return self.remember(remaining, 0, 0)
+            card_bit = hand_left & -hand_left
+        else:
+            card_bit = required & -required
+        best = -1
+        best_meld = 0
+        upper = hand_left.bit_count() # can't place more than every hand card left
+        if required == 0:
+            # the lowest hand card may simply stay in the hand
+            best = self.search(remaining & ~card_bit, placed)
+        for meld in self.melds_of[card_bit.bit_length() - 1]:
+            if meld & ~remaining: continue # uses a card that is already placed
+            gained = (meld & self.hand_mask).bit_count()
+            if gained + (hand_left & ~meld).bit_count() <= best: continue # can't beat what we have
+            self.path.append(meld)
+            rest = self.search(remaining & ~meld, placed + gained)
+            self.path.pop()
+            if (rest >= 0) and (gained + rest > best):
+                best = gained + rest
+                best_meld = meld
+                if best == upper: break # every hand card placed
+        return self.remember(remaining, best, best_meld)
+
+    def remember(self, remaining:int, best:int, best_meld:int):
+        self.memo.put(remaining, (best, best_meld))
+        return best
+
+    def reconstruct(self, remaining:int):
+        """Return the list of melds chosen from the memo, starting at the given remaining mask."""
+        path = []
+        while remaining:
+            known = self.memo.get(remaining)
+            if known is None:
+                # evicted from the memo on the way; search this part again (it is small by now)
+                self.search(remaining, 0)
+                known = self.memo.get(remaining)
+            meld = known[1]
+            if meld == 0: # lowest hand card stays in hand
+                hand_left = remaining & self.hand_mask
+                remaining &= ~(hand_left & -hand_left)
+            else:
+                path.append(meld)
+                remaining &= ~meld
+        return path
+
+    def makeResult(self, complete:bool):
+        elapsed = time.perf_counter() - self.start_time
+        if self.best_placed < 0:
+            # not even the current board can be completed
+            return SolverResult([], [], complete, self.nodes, elapsed)
+        if self.best_path is None:
+            return SolverResult([orderMeld(group) for group in self.start_groups], [], complete, self.nodes, elapsed)
+        groups = []
+        placed = []
+        for meld in self.best_path:
+            cards = [self.cards[i] for i in range(0, len(self.cards)) if meld >> i & 1]
+            groups.append(orderMeld(cards))
+            placed += [self.cards[i] for i in range(0, len(self.cards)) if (meld & self.hand_mask) >> i & 1]
+        return SolverResult(groups, placed, complete, self.nodes, elapsed)
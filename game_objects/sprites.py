@@ -0,0 +1,106 @@
+"""
+File: sprites.py
+Author: Willow Jordan
+Purpose: This script defines the SpriteCache class, which decodes each card sprite once per tkinter root and shares it between every Card.
+"""
+
+import tkinter as tk
+import weakref
+from collections import OrderedDict
+
+class SpriteCache():
+    SPRITE_PATH = "./sprites/card_{suit}_{value}.png"
+    CARD_BACK_PATH = "./sprites/card_back.png"
+    CARD_BACK_SMALL_PATH = "./sprites/card_back_small.png"
+    VALUE_PATHS = {
+        1: "A", 2: "02", 3: "03", 4: "04", 5: "05", 6: "06", 7: "07",
+        8: "08", 9: "09", 10: "10", 11: "J", 12: "Q", 13: "K",
+    }
+
+    MAX_ZOOMED = 128 # zoomed variants kept before the least recently used one is evicted
+
+    # tk root => SpriteCache (PhotoImages belong to a single interpreter, so they can't be shared across roots)
+    _caches = weakref.WeakKeyDictionary()
+
+    def __init__(self, root:tk.Misc):
+        self.root = root
+        self.images: dict[tuple, tk.PhotoImage] = {} # (suit, value) => decoded PhotoImage
+        self.hits = 0
+        self.misses = 0
+        self.zoomed_images: OrderedDict[tuple, tk.PhotoImage] = OrderedDict() # (sprite name, zoom) => zoomed PhotoImage
+        self.zoom_hits = 0
+        self.zoom_misses = 0
+        self.zoom_evictions = 0
+
+    @classmethod
+    def forRoot(cls, widget:tk.Misc):
+        """Return the sprite cache for the root of the given widget (or root), creating it if necessary."""
+        root = widget
+        while root.master is not None: # any widget resolves to the root it was created under
+            root = root.master
+        cache = cls._caches.get(root)
+        if cache is None:
+            cache = cls(root)
+            cls._caches[root] = cache
+        return cache
+
+    def loadImage(self, path:str):
+        """Decode the sprite at the given path."""
+        return tk.PhotoImage(master=self.root, file=path)
+
+    def get(self, suit, value:int):
+        """Return the PhotoImage for the card with the given suit and value.
+        Suit.NONE or a value of 0 returns the card back.
+        """
+        if (value == 0) | (suit.value < 0):
+            return self.getFile(SpriteCache.CARD_BACK_PATH)
+        key = (suit.value, value)
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+        self.misses += 1
+        path = SpriteCache.SPRITE_PATH.format(suit=suit.name.lower(), value=SpriteCache.VALUE_PATHS[value])
+        image = self.loadImage(path)
+        self.images[key] = image
+        return image
+
+    def getFile(self, path:str):
+        """Return the PhotoImage for a sprite that isn't a card face (e.g. the small card back)."""
+        image = self.images.get(path)
+        if image is not None:
+            self.hits += 1
+            return image
+        self.misses += 1
+        image = self.loadImage(path)
+        self.images[path] = image
+        return image
+
+    def zoomed(self, image:tk.PhotoImage, zoom_factor:int):
+        """Return the given sprite zoomed by zoom_factor.
+        Zoomed variants are cached, so zooming the same sprite twice returns the same object.
+        A zoom factor of 1 returns the sprite itself.
+        """
+        if zoom_factor == 1: return image
+        key = (str(image), zoom_factor)
+        zoomed = self.zoomed_images.get(key)
+        if zoomed is not None:
+            self.zoom_hits += 1
+            self.zoomed_images.move_to_end(key)
+            return zoomed
+        self.zoom_misses += 1
+        zoomed = image.zoom(zoom_factor, zoom_factor)
+        self.zoomed_images[key] = zoomed
+        if len(self.zoomed_images) > SpriteCache.MAX_ZOOMED:
+            # evict least recently used (cards still holding it keep it alive until redrawn)
+            self.zoomed_images.popitem(last=False)
+            self.zoom_evictions += 1
+        return zoomed
+
+    def stats(self):
+        """Return a dict of cache statistics."""
+        return {
+            "sprites": len(self.images), "hits": self.hits, "misses": self.misses,
+            "zoomed": len(self.zoomed_images), "zoom_hits": self.zoom_hits,
+            "zoom_misses": self.zoom_misses, "zoom_evictions": self.zoom_evictions,
+        }
@@ -0,0 +1,113 @@
+"""
+File: tasks.py
+Author: Willow Jordan
+Purpose: This script defines the TaskRunner class, which runs slow game computations (bot turns, hints) on worker threads
+and hands their results back to the UI thread, so the window never freezes while they run.
+Results are collected by polling with after(), since tkinter must only be used from the thread running mainloop.
+It also keeps a heartbeat on the UI thread to measure how long the event loop was stalled.
+It doesn't import tkinter: anything with after() and after_cancel() (like a tk widget) can drive it.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class TaskRunner():
+    POLL_INTERVAL = 15 # milliseconds between checks for finished tasks
+    HEARTBEAT_INTERVAL = 50 # milliseconds between heartbeats
+    STALL_THRESHOLD = 0.1 # seconds a heartbeat can be late before it counts as a stall
+
+    def __init__(self, widget, workers:int = 1):
+        """
+        :param widget: Widget whose after() runs callbacks on the UI thread.
+        :param workers: Worker threads. Bots that need more CPU can still use processes of their own (see ISMCTSBot).
+        """
+        self.widget = widget
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="game-task")
+        # tasks started before the last cancelAll() belong to an older generation, and their results are thrown away
+        self.generation = 0
+        self.pending:list[tuple] = [] # (future, on_done, on_error, generation) of tasks whose results haven't been delivered
+        self.poll_job = None
+        self.closed = False
+
+        # stall measurement: how late each heartbeat ran compared to when it was scheduled
+        self.heartbeats = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+        self.stalls = 0
+        self.heartbeat_due = time.perf_counter() + TaskRunner.HEARTBEAT_INTERVAL / 1000
+        self.heartbeat_job = self.widget.after(TaskRunner.HEARTBEAT_INTERVAL, self.heartbeat)
+
+    def submit(self, function, *args, on_done = None, on_error = None):
+        """Run function(*args) on a worker thread. When it finishes, call on_done(result) on the UI thread,
+        or on_error(exception) if it raised. Neither is called if cancelAll() is called first.
+        Return the Future for the task."""
+        if self.closed: raise RuntimeError("Can't submit a task to a TaskRunner that was shut down")
+        future = self.executor.submit(function, *args)
+        self.pending.append((future, on_done, on_error, self.generation))
+        if self.poll_job is None:
+            self.poll_job = self.widget.after(TaskRunner.POLL_INTERVAL, self.poll)
+        return future
+
+    def isBusy(self):
+        """Return true if any task's result hasn't been delivered yet."""
+        return len(self.pending) > 0
+
+    def cancelAll(self):
+        """Cancel every task that hasn't started and throw away the results of those that have.
+        Call this whenever the state the tasks were working on is no longer current (e.g. the turn changed)."""
+        self.generation += 1
+        for future, on_done, on_error, generation in self.pending:
+            future.cancel()
+        self.pending = []
+
+    def poll(self):
+        """Deliver the results of finished tasks on the UI thread, then check again later if any are left."""
+        self.poll_job = None
+        still_pending = []
+        finished = []
+        for task in self.pending:
+            if task[0].done(): finished.append(task)
+            else: still_pending.append(task)
+        self.pending = still_pending
+        for future, on_done, on_error, generation in finished:
+            # a callback may have cancelled everything else
+            if (generation != self.generation) or future.cancelled(): continue
+            error = future.exception()
+            if error is not None:
+                if on_error is None: raise error
+                on_error(error)
+            elif on_done is not None:
+                on_done(future.result())
+        if (len(self.pending) > 0) and (self.poll_job is None) and not self.closed:
+            self.poll_job = self.widget.after(TaskRunner.POLL_INTERVAL, self.poll)
+
+    def heartbeat(self):
+        now = time.perf_counter()
+        lateness = max(0.0, now - self.heartbeat_due)
+        self.heartbeats += 1
+        self.total_lateness += lateness
+        if lateness > self.max_lateness: self.max_lateness = lateness
+        if lateness > TaskRunner.STALL_THRESHOLD: self.stalls += 1
+        self.heartbeat_due = now + TaskRunner.HEARTBEAT_INTERVAL / 1000
+        self.heartbeat_job = self.widget.after(TaskRunner.HEARTBEAT_INTERVAL, self.heartbeat)
+
+    def stats(self):
+        """Return a dict of UI thread stall statistics (in seconds) and task counts."""
+        return {
+            "heartbeats": self.heartbeats,
+            "mean_lateness": self.total_lateness / self.heartbeats if self.heartbeats > 0 else 0.0,
+            "max_lateness": self.max_lateness,
+            "stalls": self.stalls, # heartbeats more than STALL_THRESHOLD late
+            "pending": len(self.pending),
+            "generation": self.generation,
+        }
+
+    def shutdown(self):
+        """Cancel every task and stop polling. Running tasks are left to finish on their own, and their results are thrown away."""
+        self.cancelAll()
+        self.closed = True
+        for job in (self.poll_job, self.heartbeat_job):
+            if job is not None: self.widget.after_cancel(job)
+        self.poll_job = None
+        self.heartbeat_job = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,87 @@
+"""
+File: zobrist.py
+Author: Willow Jordan
+Purpose: This script defines Zobrist-style keys for hashing game states, and a bounded TranspositionTable for searches that reach the same state by different move orders.
+Every (card, location) pair has a random 64-bit key. A hand hashes to the sum (mod 2^64) of its cards' keys.
+A board hashes to the sum of a mixed key per group, so the hash depends on which cards are grouped together but not on the order of groups, their slot IDs or the order of cards within a group.
+Sums are used rather than XOR so that identical cards (with more than one deck) don't cancel out.
+"""
+
+MASK_64 = (1 << 64) - 1
+BOARD = 0 # location of cards on the board (player i's hand is location i + 1)
+DISCARD_TOP = -1 # location of the top card of the discard pile
+
+def mix64(x:int):
+    """Return x scrambled into a well-distributed 64-bit value (the splitmix64 finalizer)."""
+    x = (x + 0x9E3779B97F4A7C15) & MASK_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return x ^ (x >> 31)
+
+_keys:dict[tuple, int] = {} # (card code, location) => key, filled in as keys are needed
+
+def cardKey(code:int, location:int):
+    """Return the key for the card with the given code (see Card.code) at the given location."""
+    key = _keys.get((code, location))
+    if key is None:
+        key = mix64((location + 2) << 16 | code)
+        _keys[(code, location)] = key
+    return key
+
+def handKey(code:int, player_id:int):
+    """Return the key for the card with the given code in the given player's hand."""
+    return cardKey(code, player_id + 1)
+
+def groupHash(group_key:int):
+    """Return the hash a group contributes to the board, given the sum of its cards' board keys.
+    Mixing stops groups from cancelling out, so {A B}{C} and {A}{B C} hash differently."""
+    return mix64(group_key ^ 0x5851F42D4C957F2D)
+
+def turnKey(player_id:int, phase:int):
+    """Return the key for whose turn it is and the turn phase."""
+    return mix64((1 << 40) | (player_id << 8) | phase)
+
+class TranspositionTable():
+    """A bounded mapping from state hash to search results. The oldest entry is evicted when full.
+    (Evicting the oldest rather than least recently used keeps lookups to a single dict access, which matters in tight search loops.)"""
+    def __init__(self, max_entries:int = 100000):
+        self.max_entries = max_entries
+        self.entries:dict[int, object] = {} # dicts keep insertion order, so the first key is the oldest
+        self.lookups = 0
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def get(self, key:int, default = None):
+        """Return the value stored for key, or default if there isn't one."""
+        self.lookups += 1
+        value = self.entries.get(key, default)
+        if value is not default: self.hits += 1
+        return value
+
+    def put(self, key:int, value):
+        """Store value for key, evicting the oldest entry if the table is full."""
+        self.stores += 1
+        self.entries[key] = value
+        if len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+            self.evictions += 1
+
+    def __contains__(self, key:int):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def hitRate(self):
+        """Return the fraction of lookups that found an entry."""
+        if self.lookups == 0: return 0.0
+        return self.hits / self.lookups
+
+    def stats(self):
+        """Return a dict of table statistics."""
+        return {
+            "entries": len(self.entries), "lookups": self.lookups, "hits": self.hits,
+            "misses": self.lookups - self.hits, "hit_rate": self.hitRate(),
+            "stores": self.stores, "evictions": self.evictions,
+        }
@@ -9,6 +9,7 @@ import tkinter as tk
 from screens.TitleScreen import TitleScreen
 from screens.SettingsScreen import SettingsScreen
 from screens.GameScreen import GameScreen
+from screens.ReplayScreen import ReplayScreen
 from screens.VictoryScreen import VictoryScreen
 
 from ui_constants import BG_COLOR
@@ -38,11 +39,20 @@ class Game(tk.Tk):
         self.current_screen = SettingsScreen(self)
         self.current_screen.pack()
 
-    def display_game(self, numPlayers):
-        """Destroy current screen and display the game screen using the provided list of players."""
+    def display_game(self, numPlayers = 2, bots = None, decks = 1, save = None):
+        """Destroy current screen and display the game screen using the provided number of players and decks.
+        bots is an optional list of bot names, one per seat (None for a human).
+        save is an optional saved game to resume instead (see game_objects/savefile.py)."""
         if self.current_screen is not None:
             self.current_screen.destroy()
-        self.current_screen = GameScreen(self, numPlayers)
+        self.current_screen = GameScreen(self, numPlayers, bots, decks, save)
+        self.current_screen.pack()
+
+    def display_replay(self, log):
+        """Destroy current screen and display a replay of the given move log (see game_objects/movelog.py)."""
+        if self.current_screen is not None:
+            self.current_screen.destroy()
+        self.current_screen = ReplayScreen(self, log)
         self.current_screen.pack()
 
     def display_victory(self, scores):
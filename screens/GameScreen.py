@@ -1,37 +1,47 @@
 """
 File: GameScreen.py
 Author: Willow Jordan
-Purpose: This script defines the GameScreen object (overriding tk.Canvas). It handles user input and a good portion of the game logic.
+Purpose: This script defines the GameScreen object (overriding tk.Canvas). It handles user input and draws the GameState it drives.
 """
 
-import copy
-import random
 import tkinter as tk
-from enum import Enum
+import traceback
 
 from game_objects.player import Player
-from game_objects.card import Card, Suit, Parent
+from game_objects.card import Card, Parent
 from game_objects.board import Board
-
-from ui_constants import BG_COLOR, UI_FONT
+from game_objects.game_state import GameState, TurnPhase
+from game_objects.hints import findHints
+from game_objects.bots import Bot, TurnPlan, makeBot, planTurn, applyPlan, playFallbackTurn
+from game_objects.ismcts import ISMCTSBot # adds the search bot to the bots that can be chosen
+from game_objects.tasks import TaskRunner
+from game_objects.encoding import encode, codeToString
+from game_objects.sprites import SpriteCache
+from game_objects.hitgrid import HitGrid
+from game_objects.scene import Scene
+from game_objects.render import RenderScheduler, ALL
+from game_objects.savefile import deserializeGame
+from game_objects.autosave import Autosaver
+from game_objects.movelog import MoveLog
+
+from ui_constants import BG_COLOR, UI_FONT, SAVE_PATH, LOG_PATH
 
 SELECTION_COLOR = "lightblue"
 SELECTION_WIDTH = 2
 
 HAND_MENU_Y = 450
 TURN_MENU_Y = 700
-TURN_MENU_PLAYER_WIDTH = 100
+TURN_MENU_PLAYER_WIDTH = 100 # widest a player's entry in the turn menu gets
+TURN_MENU_WIDTH = 600 # space for every player's entry, left of the deck and discard pile
+TURN_MENU_CARDS_PER_ROW = 7
 
 DECK_X = 640
 DECK_Y = 750
 DISCARD_X = 700
 DISCARD_Y = 750
 
-class TurnPhase(Enum):
-    READY = 0
-    DRAW = 1
-    PLAY = 2
-    DISCARD = 3
+BOT_TURN_DELAY = 600 # milliseconds to wait before a bot takes its turn, so that people can follow the game
+CONTROL_MASK = 0x4 # bit set in a key event's state while Ctrl is held
 
 """class GameButton():
     def __init__(self, canvas:tk.Canvas, x, y, width, height, color, on_click:function):
@@ -47,327 +57,443 @@ class TurnPhase(Enum):
         self.label = self.canvas.create_text(x, y, text=text, fill=textColor, font=font, anchor=tk.CENTER)"""
 
 class GameScreen(tk.Canvas):
-    def __init__(self, master, numPlayers = 2):
+    def __init__(self, master, numPlayers = 2, bots:list = None, decks:int = 1, save:bytes = None, log_path:str = LOG_PATH,
+                 autosave_path:str = SAVE_PATH):
+        """
+        :param numPlayers: Number of players, at least 2.
+        :param bots: Optional list of bot names, one per seat. Seats with None (or all seats, if not provided) are humans.
+        :param decks: Number of decks shuffled together.
+        :param save: Optional saved game (see savefile.py) to resume instead of dealing a new one.
+            The number of players, bots and decks are taken from it.
+        :param log_path: File to log every action of the game to (see movelog.py), or None not to log it.
+        :param autosave_path: File the game is saved to at the start of every turn (see autosave.py), or None not to autosave it.
+        """
         super().__init__(master, width=800, height=800, bd=0, highlightthickness=0, relief='ridge')
         self.master = master
-        self.board = Board(self)
+        # changes mark parts of the screen dirty, and they're drawn once when the event being handled is finished
+        # (the board registers first, so it's drawn before the selection outlines around its cards)
+        self.render = RenderScheduler(self)
+        self.board = Board(self, self.render)
         
-        # create photo images to be used later
-        self.card_back = tk.PhotoImage(file="./sprites/card_back.png")
-        self.card_back_small = tk.PhotoImage(file="./sprites/card_back_small.png")
-
-        # create and populate deck
-        self.deck = []
-        for suit in list(Suit):
-            if suit == Suit.NONE: continue
-            # 1 (ace) thru 13 (king)
-            for value in range(1, 14):
-                self.deck.append(Card(suit, value))
-        random.shuffle(self.deck)
-
-        # create players and generate starting hands
-        if numPlayers == 2:
-            startingHandSize = 10
-        elif (numPlayers == 3) | (numPlayers == 4):
-            startingHandSize = 7
-        elif (numPlayers == 5) | (numPlayers == 6):
-            startingHandSize = 6
-        else: raise ValueError("Number of players must be between 2 and 6")
-        self.players = []
-        for i in range(0, numPlayers):
-            # draw first n cards
-            startingHand = self.deck[0:startingHandSize]
-            self.deck = self.deck[startingHandSize:]
-            for j in range(0, startingHandSize):
-                startingHand[j].setInternals(Parent.HAND, i, j)
-            self.players.append(Player(len(self.players), startingHand))
-        # draw top card from deck for discard pile
-        self.discard_pile:list[Card] = [self.deck[0]]
-        self.deck = self.deck[1:]
-
-        # player whose turn it is
-        self.curr_player:Player = self.players[0]
-        #self.curr_player:Player = self.players[random.randint(0, len(self.players)-1)]
+        # photo images are decoded once per root and reused by every game
+        self.sprites = SpriteCache.forRoot(master)
+        self.card_back = self.sprites.getFile(SpriteCache.CARD_BACK_PATH)
+        self.card_back_small = self.sprites.getFile(SpriteCache.CARD_BACK_SMALL_PATH)
+
+        # the game itself (deck, hands, turn phases); this screen only draws it and handles input
+        self.game, bots = self.makeGame(numPlayers, bots, decks, save)
+        numPlayers = len(self.game.players)
+        # every action is logged as it's made, so the game can be replayed (e.g. to reproduce a bug)
+        self.move_log:MoveLog = None
+        if log_path is not None:
+            try: self.move_log = MoveLog(self.game, log_path)
+            except OSError: pass # the game can still be played without a log
+        # the game is saved in the background at every turn change, so it can be continued after the window is closed
+        self.autosaver:Autosaver = Autosaver.forPath(autosave_path) if autosave_path is not None else None
+        # every player's entry in the turn menu shares the space left of the deck
+        self.player_width = min(TURN_MENU_PLAYER_WIDTH, TURN_MENU_WIDTH // numPlayers)
+        # bot playing each seat, or None for humans
+        self.bots:list[Bot] = [None] * numPlayers
+        if bots is not None:
+            self.bots = [makeBot(name) if name is not None else None for name in bots]
+        self.bot_job = None # pending after() call for the next bot turn
+        # slow computations (bot turns, hints) run on a worker thread so the window stays responsive
+        self.tasks = TaskRunner(self)
+        self.last_bot_turn:str = None # description of the last bot turn, shown to the next player
         # the card that's currently selected
         self.selected_card:Card = None
-        self.turn_phase = TurnPhase.READY
-
-        # canvas object ID containers (for easy deletion)
+        # click regions of every card drawn on this screen, for finding the card under the mouse
+        self.hit_grid = HitGrid.forCanvas(self)
+
+        # everything is drawn through the scene, which keeps each item and only sends Tk what changed when it's redrawn
+        # items are tagged with the part of the screen that owns them: "background", "board", "cards", "turn menu", "player",
+        # "buttons", "selection" and "info" (F12 shows how many each has, which shouldn't grow over a long game)
+        self.scene = Scene.forCanvas(self)
+        # canvas object ID containers (for reuse and easy deletion)
+        self.info = "" # text for the info bar
+        self.info_text = None
         self.selection_lines = [] # lines making up the selection
-        self.hand_items = []
-        self.turnmenu_items = [] # background squares/lines in turn menu
-        self.player_turnmenu_items = [] # player specific items in turn menu
-        for player in self.players:
-            self.player_turnmenu_items.append([])
-        self.readyscreen_items = []
+        self.turnmenu_items:dict = {} # name => ID of background squares/lines, deck and discard pile in turn menu
+        self.player_turnmenu_items:list[dict] = [] # player specific items in turn menu: "name" or ("card", i) => ID
+        for player in self.game.players:
+            self.player_turnmenu_items.append({})
+        self.discard_card:Card = None # card drawn on top of the discard pile
+        self.play_buttons:list[int] = [] # shown in the play phase, hidden otherwise
 
         # button regions
         self.deck_bounds = (619, 720, 661, 780)
         self.discard_bounds = (679, 720, 721, 780)
-        self.next_turn_bounds = (725, 720, 795, 740)
-        self.reset_bounds = (725, 760, 795, 780)
+        # the play phase buttons are stacked right of the discard pile (the info bar above the board can take several lines)
+        self.next_turn_bounds = (725, 705, 795, 725)
+        self.reset_bounds = (725, 740, 795, 760)
+        self.hint_bounds = (725, 775, 795, 795)
 
         # bind mouse1 to onClick function
         self.bind("<Button-1>", self.onClick)
+        # scroll the board with the mouse wheel (Button-4/5 on X11) or Page Up/Page Down
+        self.bind("<MouseWheel>", lambda event: self.scrollBoard(-1 if event.delta > 0 else 1))
+        self.bind("<Button-4>", lambda event: self.scrollBoard(-1))
+        self.bind("<Button-5>", lambda event: self.scrollBoard(1))
         self.master.bind("<Key>", self.onKeyPress)
 
-        # start the game
+        # the rest of the screen, in drawing order
+        self.render.register("hand", self.drawHand)
+        self.render.register("turn menu", self.drawTurnMenu, covers=("player", "deck", "discard"))
+        self.render.register("player", self.drawPlayers, keyed=True)
+        self.render.register("deck", self.drawDeck)
+        self.render.register("discard", self.drawDiscard)
+        self.render.register("selection", self.drawSelection)
+        self.render.register("info", self.drawInfo)
+
+        # start the game (or carry on from where it was saved)
         self.drawBackground()
-        self.board.draw()
-        self.startReadyPhase()
+        self.board.requestDraw()
+        self.resumeTurn()
+        self.autosave()
+
+    def makeGame(self, numPlayers:int, bots:list, decks:int, save:bytes):
+        """Return (game, bot names) for a new game on this screen's board, or the saved one if save is provided."""
+        if save is None: return GameState(numPlayers, board=self.board, sprites=self.sprites, decks=decks), bots
+        return deserializeGame(save, board=self.board, sprites=self.sprites)
 
     ### DRAWING FUNCTIONS ###
     def drawBackground(self):
         """Draw things that won't change."""
+        # drawn again from scratch if called again
+        self.scene.deleteOwner("background")
         # component backgrounds
-        self.create_rectangle(0, 0, 800, 100, fill="darkred", width=0) # info
-        self.create_rectangle(0, 100, 800, HAND_MENU_Y, fill=BG_COLOR, width=0) # board
-        self.create_rectangle(0, HAND_MENU_Y, 800, 800, fill="darkred", width=0) # hand
+        self.scene.draw(None, "rectangle", 0, 0, 800, 100, owner="background", fill="darkred", width=0) # info
+        self.scene.draw(None, "rectangle", 0, 100, 800, HAND_MENU_Y, owner="background", fill=BG_COLOR, width=0) # board
+        self.scene.draw(None, "rectangle", 0, HAND_MENU_Y, 800, 800, owner="background", fill="darkred", width=0) # hand
 
         # lines separating components
-        self.create_line(0, 100, 800, 100, width=2)
-        self.create_line(0, HAND_MENU_Y, 800, HAND_MENU_Y, width=2)
-        self.create_line(0, HAND_MENU_Y, 800, HAND_MENU_Y, width=2)
+        self.scene.draw(None, "line", 0, 100, 800, 100, owner="background", width=2)
+        self.scene.draw(None, "line", 0, HAND_MENU_Y, 800, HAND_MENU_Y, owner="background", width=2)
 
         # border lines
-        self.create_line(0, 0, 0, 800, width=2)
-        self.create_line(0, 800, 800, 800, width=2)
-        self.create_line(800, 800, 800, 0, width=2)
-        self.create_line(800, 0, 0, 0, width=2)
+        self.scene.draw(None, "line", 0, 0, 0, 800, owner="background", width=2)
+        self.scene.draw(None, "line", 0, 800, 800, 800, owner="background", width=2)
+        self.scene.draw(None, "line", 800, 800, 800, 0, owner="background", width=2)
+        self.scene.draw(None, "line", 800, 0, 0, 0, owner="background", width=2)
 
     def printInfo(self, info:str):
-        """Print a message to the info bar at the top of the screen"""
-        # delete current info text if it exists
-        try:
-            if self.info_text is not None:
-                self.delete(self.info_text)
-        except AttributeError: pass
-        self.info_text = self.create_text(10, 10, text=info, anchor=tk.NW, fill="white")
+        """Print a message to the info bar at the top of the screen (the last message printed while handling an event is shown)"""
+        self.info = info
+        self.render.markDirty("info")
+
+    def drawInfo(self):
+        self.info_text = self.scene.draw(self.info_text, "text", 10, 10, owner="info", text=self.info, anchor=tk.NW, fill="white")
 
     def drawHand(self):
-        """Draw current player's hand."""
+        """Draw current player's hand. Nobody's hand is shown between turns."""
+        if self.game.turn_phase == TurnPhase.READY: return
         x = 8
         y = HAND_MENU_Y
-        for card in self.curr_player.hand:
+        for card in self.game.curr_player.hand:
             if x >= 800:
                 x -= 800
                 y += 120
             card.draw(self, x, y, 2)
             x += 100
     
+    def drawItem(self, items:dict, key, kind:str, *coords, owner:str = "turn menu", **options):
+        """Draw the item stored under key in items (see Scene.draw), creating it the first time."""
+        items[key] = self.scene.draw(items.get(key), kind, *coords, owner=owner, **options)
+
     def drawTurnMenu(self):
-        """Draw the list of players, and their facedown cards."""
-        # erase the previous turn menu
-        for item_id in self.turnmenu_items:
-            self.delete(item_id)
-        for item_list in self.player_turnmenu_items:
-            for item_id in item_list:
-                self.delete(item_id)
-        self.turnmenu_items.append(self.create_rectangle(0, TURN_MENU_Y, 800, 800, fill="silver"))
+        """Draw the list of players, and their facedown cards.
+        Items are only created the first time; after that they're updated where they changed."""
+        items = self.turnmenu_items
+        self.drawItem(items, "background", "rectangle", 0, TURN_MENU_Y, 800, 800, fill="silver")
         # player background squares in turn menu
-        for i in range(0, len(self.players)):
+        for i in range(0, len(self.game.players)):
             # draw background rectangle for player, highlighting if it's their turn
             bg_fill = "silver"
-            if self.players[i] == self.curr_player: bg_fill = "gold"
-            playerbg = self.create_rectangle(i * TURN_MENU_PLAYER_WIDTH, TURN_MENU_Y, (i+1) * TURN_MENU_PLAYER_WIDTH, 800, fill=bg_fill, width=0)
-            self.turnmenu_items.append(playerbg)
-            self.drawPlayer(self.players[i])
-        for i in range(0, len(self.players)):
+            if self.game.players[i].id == self.game.curr_player.id: bg_fill = "gold"
+            self.drawItem(items, ("player", i), "rectangle", i * self.player_width, TURN_MENU_Y, (i+1) * self.player_width, 800, fill=bg_fill, width=0)
+            self.drawPlayer(self.game.players[i])
+        for i in range(0, len(self.game.players)):
             # draw line between this player and next player
-            line_x = TURN_MENU_PLAYER_WIDTH * (i+1)
-            line = self.create_line(line_x, TURN_MENU_Y, line_x, 800, width=2)
-            self.turnmenu_items.append(line)
+            line_x = self.player_width * (i+1)
+            self.drawItem(items, ("line", i), "line", line_x, TURN_MENU_Y, line_x, 800, width=2)
         # line separating turn menu from hand
-        line = self.create_line(0, TURN_MENU_Y, 800, TURN_MENU_Y, width=2)
-        self.turnmenu_items.append(line)
+        self.drawItem(items, "line", "line", 0, TURN_MENU_Y, 800, TURN_MENU_Y, width=2)
         # buttons for drawing/advancing turn/resetting board
-        drawmenu_x = TURN_MENU_PLAYER_WIDTH * 6
+        drawmenu_x = TURN_MENU_WIDTH
         self.drawDeck()
-        decklabel = self.create_text(drawmenu_x + 40, TURN_MENU_Y+10, text="Deck", anchor=tk.CENTER)
+        self.drawItem(items, "deck label", "text", drawmenu_x + 40, TURN_MENU_Y+10, text="Deck", anchor=tk.CENTER)
         self.drawDiscard()
-        discardlabel = self.create_text(drawmenu_x + 100, TURN_MENU_Y+10, text="Discard", anchor=tk.CENTER)
-        self.turnmenu_items += [decklabel, discardlabel]
+        self.drawItem(items, "discard label", "text", drawmenu_x + 100, TURN_MENU_Y+10, text="Discard", anchor=tk.CENTER)
+
+    def drawPlayers(self, player_ids:set):
+        """Draw the turn menu entries of the players with the given IDs (or everyone's, if the set contains ALL)."""
+        if ALL in player_ids: player_ids = range(0, len(self.game.players))
+        for player_id in player_ids:
+            self.drawPlayer(self.game.players[player_id])
 
     def drawPlayer(self, player:Player):
         """Draw a single player's name and cards in the turn menu."""
-        # erase current items in player's turn menu
-        for item_id in self.player_turnmenu_items[player.id]:
-            self.delete(item_id)
-        start_x = player.id * TURN_MENU_PLAYER_WIDTH
-        text_x = start_x + (TURN_MENU_PLAYER_WIDTH/2)
+        items = self.player_turnmenu_items[player.id]
+        start_x = player.id * self.player_width
+        text_x = start_x + (self.player_width/2)
         text_y = TURN_MENU_Y + 10
-        textbox = self.create_text(text_x, text_y, text=f"Player {player.id+1}", anchor=tk.CENTER)
-        self.player_turnmenu_items[player.id].append(textbox)
+        # short names when the table is too crowded for the full ones
+        if self.player_width >= TURN_MENU_PLAYER_WIDTH:
+            name = f"Player {player.id+1}" if self.bots[player.id] is None else f"Player {player.id+1} (bot)"
+        else:
+            name = f"P{player.id+1}" if self.bots[player.id] is None else f"P{player.id+1} (bot)"
+        self.drawItem(items, "name", "text", text_x, text_y, owner="player", text=name, anchor=tk.CENTER)
         hand_x = start_x + 10
         hand_y = TURN_MENU_Y + 40
+        # overlap the cards more in narrow entries (a row is 10px margins either side of the 20px wide small cards)
+        card_spacing = max(1, min(10, (self.player_width - 40) / (TURN_MENU_CARDS_PER_ROW - 1)))
         # print a blank card for every card in player's hand
-        for i in range(0, len(player.hand), 7):
-            for j in range(0, 7):
+        for i in range(0, len(player.hand), TURN_MENU_CARDS_PER_ROW):
+            for j in range(0, TURN_MENU_CARDS_PER_ROW):
                 if i+j >= len(player.hand): break
-                card_x = hand_x + j*10
+                card_x = hand_x + j*card_spacing
                 card_y = hand_y + i
-                cardImg = self.create_image(card_x, card_y, image=self.card_back_small, anchor=tk.NW)
-                self.player_turnmenu_items[player.id].append(cardImg)
+                self.drawItem(items, ("card", i+j), "image", card_x, card_y, owner="player", image=self.card_back_small, anchor=tk.NW)
+        # remove the cards the player no longer has
+        for i in range(len(player.hand), len(items) - 1):
+            self.scene.delete(items.pop(("card", i)))
 
     def drawDeck(self):
         """Draw the deck centered at DECK_X, DECK_Y"""
-        deck = self.create_image(DECK_X, DECK_Y, image=self.card_back, anchor=tk.CENTER)
-        cards_left = self.create_text(DECK_X, DECK_Y, text=str(len(self.deck)), anchor=tk.CENTER)
-        self.turnmenu_items += [deck, cards_left]
+        self.drawItem(self.turnmenu_items, "deck", "image", DECK_X, DECK_Y, image=self.card_back, anchor=tk.CENTER)
+        self.drawItem(self.turnmenu_items, "deck count", "text", DECK_X, DECK_Y, text=str(len(self.game.deck)), anchor=tk.CENTER)
 
     def drawDiscard(self):
         """Draw the discard pile centered at DISCARD_X, DISCARD_Y"""
-        if len(self.discard_pile) == 0:
-            dpile = self.create_image(DISCARD_X, DISCARD_Y, image=self.card_back, anchor=tk.CENTER)
+        discard_pile = self.game.discard_pile
+        top = discard_pile[-1] if len(discard_pile) > 0 else None
+        # the old top card is erased once it's covered (if it was picked up, it's drawn in the hand instead)
+        if (self.discard_card is not None) and (self.discard_card is not top) and (self.discard_card in discard_pile):
+            self.discard_card.erase(self)
+        self.discard_card = top
+        if top is None:
+            self.drawItem(self.turnmenu_items, "discard", "image", DISCARD_X, DISCARD_Y, image=self.card_back, anchor=tk.CENTER)
         else:
-            dpile = self.discard_pile[len(self.discard_pile)-1].draw(self, DISCARD_X, DISCARD_Y, 1, tk_anchor=tk.CENTER)
-        self.turnmenu_items += [dpile]
+            if "discard" in self.turnmenu_items: self.scene.delete(self.turnmenu_items.pop("discard"))
+            top.draw(self, DISCARD_X, DISCARD_Y, 1, tk_anchor=tk.CENTER)
 
-    def drawBlankCard(self, x, y, zoom_factor, tk_anchor = tk.NW):
-        card = Card(Suit.NONE, 0)
-        return card.draw(self, x, y, zoom_factor, tk_anchor)
-    
     def drawPlayButtons(self):
-        """Draw buttons to be used during play phase."""
-        nextturnbutton = self.create_rectangle(725, 720, 795, 740, fill="green")
-        nextturnlabel = self.create_text(760, 730, text="End Turn", anchor=tk.CENTER)
-        resetbutton = self.create_rectangle(725, 760, 795, 780, fill="green")
-        resetlabel = self.create_text(760, 770, text="Reset Board", anchor=tk.CENTER)
-        self.play_buttons = [nextturnbutton, nextturnlabel, resetbutton, resetlabel]
+        """Draw buttons to be used during play phase. They're created once, then shown again."""
+        if len(self.play_buttons) > 0:
+            for item_id in self.play_buttons:
+                self.scene.setState(item_id, True)
+            return
+        nextturnbutton = self.scene.draw(None, "rectangle", *self.next_turn_bounds, owner="buttons", fill="green")
+        nextturnlabel = self.scene.draw(None, "text", 760, 715, owner="buttons", text="End Turn", anchor=tk.CENTER)
+        resetbutton = self.scene.draw(None, "rectangle", *self.reset_bounds, owner="buttons", fill="green")
+        resetlabel = self.scene.draw(None, "text", 760, 750, owner="buttons", text="Reset Board", anchor=tk.CENTER)
+        hintbutton = self.scene.draw(None, "rectangle", *self.hint_bounds, owner="buttons", fill="green")
+        hintlabel = self.scene.draw(None, "text", 760, 785, owner="buttons", text="Hint", anchor=tk.CENTER)
+        self.play_buttons = [nextturnbutton, nextturnlabel, resetbutton, resetlabel, hintbutton, hintlabel]
 
     def erasePlayButtons(self):
-        """Erase buttons from play phase."""
+        """Hide buttons from play phase."""
         for item_id in self.play_buttons:
-            self.delete(item_id)
+            self.scene.setState(item_id, False)
 
     def drawCardSelection(self):
-        """Draw an outline around the selected card and any cards above it on the stack."""
-        if self.selection_lines != []: # existing selection
-            self.eraseCardSelection()
-        self.drawOutline(self.selected_card)
+        """Draw an outline around the selected card and any cards above it on the stack.
+        The lines of the previous selection are moved into place, and any left over are erased."""
+        outlined = [self.selected_card]
         if self.selected_card.parent_type == Parent.CARDGROUP:
             # iterate through card group starting at card above selected one
-            card_group = self.getParent(self.selected_card)
+            card_group = self.game.getParent(self.selected_card)
             for i in range(self.selected_card.card_id+1, len(card_group)):
-                self.drawOutline(card_group[i])
+                outlined.append(card_group[i])
+        for i in range(0, len(outlined)):
+            self.drawOutline(outlined[i], i)
+        while len(self.selection_lines) > 4 * len(outlined):
+            self.scene.delete(self.selection_lines.pop())
     
-    def drawOutline(self, card:Card):
-        """Draw an outline around the given card"""
+    def drawOutline(self, card:Card, index:int = 0):
+        """Draw an outline around the given card, with the index-th set of selection lines."""
         bounds = card.click_region
-        self.selection_lines.append(self.create_line(bounds[0], bounds[1], bounds[2], bounds[1], fill=SELECTION_COLOR, width=SELECTION_WIDTH))
-        self.selection_lines.append(self.create_line(bounds[2], bounds[1], bounds[2], bounds[3], fill=SELECTION_COLOR, width=SELECTION_WIDTH))
-        self.selection_lines.append(self.create_line(bounds[2], bounds[3], bounds[0], bounds[3], fill=SELECTION_COLOR, width=SELECTION_WIDTH))
-        self.selection_lines.append(self.create_line(bounds[0], bounds[3], bounds[0], bounds[1], fill=SELECTION_COLOR, width=SELECTION_WIDTH))
+        sides = [(bounds[0], bounds[1], bounds[2], bounds[1]), (bounds[2], bounds[1], bounds[2], bounds[3]),
+                 (bounds[2], bounds[3], bounds[0], bounds[3]), (bounds[0], bounds[3], bounds[0], bounds[1])]
+        for i in range(0, 4):
+            line = 4 * index + i
+            if line < len(self.selection_lines):
+                self.selection_lines[line] = self.scene.draw(self.selection_lines[line], "line", *sides[i], owner="selection", on_top=True, fill=SELECTION_COLOR, width=SELECTION_WIDTH)
+            else:
+                self.selection_lines.append(self.scene.draw(None, "line", *sides[i], owner="selection", fill=SELECTION_COLOR, width=SELECTION_WIDTH))
+
+    def drawSelection(self):
+        """Draw the outline around the selected card, or erase it if nothing is selected (or the selection is scrolled out of view)."""
+        if (self.selected_card is None) or (self.selected_card.image_id is None): self.eraseCardSelection()
+        else: self.drawCardSelection()
+
+    def scrollBoard(self, rows:int):
+        """Scroll the board by the given number of rows, keeping the selection (which may now be out of view)."""
+        self.board.scroll(rows)
+        self.render.markDirty("selection")
 
     def eraseCardSelection(self):
         """Erase outline around selected card."""
-        for line_id in self.selection_lines:
-            self.delete(line_id)
+        self.scene.deleteOwner("selection")
         self.selection_lines = []
 
-    ### HELPER FUNCTIONS ###
-    def getParent(self, card:Card):
-        """Return the parent container of the given card."""
-        if card.parent_type == Parent.HAND:
-            return self.players[card.parent_id].hand
-        else: # CARDGROUP
-            return self.board.card_groups[card.parent_id]
-
     ### PHASE CHANGE FUNCTIONS ###
     def startReadyPhase(self):
-        self.turn_phase = TurnPhase.READY
-        self.drawTurnMenu()
-        self.printInfo(f"Player {self.curr_player.id+1}, press ENTER to begin your turn")
+        self.render.markDirty("turn menu")
+        note = "" if self.last_bot_turn is None else self.last_bot_turn + "\n"
+        if self.bots[self.game.curr_player.id] is not None:
+            self.printInfo(note + f"Player {self.game.curr_player.id+1} (bot) is taking their turn...")
+            self.bot_job = self.after(BOT_TURN_DELAY, self.playBotTurn)
+        else:
+            self.printInfo(note + f"Player {self.game.curr_player.id+1}, press ENTER to begin your turn")
+
+    def resumeTurn(self):
+        """Draw the current turn in whatever phase the game is in (a saved game may be partway through a turn)."""
+        phase = self.game.turn_phase
+        # bots plan their turn from any phase
+        if (phase == TurnPhase.READY) or (self.bots[self.game.curr_player.id] is not None):
+            self.startReadyPhase()
+            return
+        self.render.markDirty("turn menu")
+        if phase == TurnPhase.DRAW: self.showDrawPhase()
+        elif phase == TurnPhase.PLAY: self.moveToPlayPhase()
+        else:
+            self.render.markDirty("hand")
+            self.showDiscardPhase()
+
+    def playBotTurn(self):
+        """Start planning the current player's turn with their bot on a worker thread."""
+        self.bot_job = None
+        # the bot plays on a copy, so the real game is only changed on this thread (in applyBotTurn)
+        self.tasks.submit(planTurn, self.game.clone(), self.bots[self.game.curr_player.id],
+                          on_done=self.applyBotTurn, on_error=self.botTurnFailed)
+
+    def applyBotTurn(self, plan:TurnPlan):
+        """Make the moves the bot planned, then draw the result once."""
+        player = self.game.curr_player
+        # the groups the bot changes are drawn once, after its whole turn
+        try: applyPlan(self.game, plan)
+        except (RuntimeError, ValueError) as error:
+            self.botTurnFailed(error)
+            return
+        self.last_bot_turn = f"Player {player.id+1} (bot) played {len(plan.moves)} card(s) and discarded {codeToString(plan.discard)}."
+        self.changeTurns(player)
+
+    def botTurnFailed(self, error:Exception):
+        """Finish the current player's turn by drawing a card and discarding it, since their bot failed, and say so."""
+        traceback.print_exception(error) # so the bot's bug can still be found
+        player = self.game.curr_player
+        playFallbackTurn(self.game) # the board marks the groups it puts back dirty
+        self.last_bot_turn = (f"Player {player.id+1}'s bot failed ({type(error).__name__}: {error}), "
+                              "so it drew a card and discarded it.")
+        self.changeTurns(player)
+
+    def destroy(self):
+        # don't let a pending bot turn or task run on a destroyed screen
+        if self.bot_job is not None:
+            self.after_cancel(self.bot_job)
+            self.bot_job = None
+        self.tasks.shutdown()
+        self.render.shutdown()
+        if self.move_log is not None: self.move_log.close()
+        for bot in self.bots:
+            if bot is not None: bot.close()
+        # the key binding is on the window, which outlives this screen
+        self.master.unbind("<Key>")
+        super().destroy()
 
     def startTurn(self):
         """Run start-of-turn routines for the current player. Move to draw phase."""
-        self.turn_phase = TurnPhase.DRAW
-        # erase ready phase visual items
-        for item_id in self.readyscreen_items:
-            self.delete(item_id)
-        self.drawHand()
-        self.printInfo(f"Player {self.curr_player.id+1}: Draw a card by clicking the deck or discard pile")
+        self.game.startTurn()
+        self.showDrawPhase()
+
+    def showDrawPhase(self):
+        self.render.markDirty("hand")
+        self.printInfo(f"Player {self.game.curr_player.id+1}: Draw a card by clicking the deck or discard pile")
 
     def moveToPlayPhase(self):
-        """Move to the play phase."""
-        self.turn_phase = TurnPhase.PLAY
+        """Draw the play phase (the game moves to it when a card is drawn)."""
         # redraw hand (since a card was drawn)
-        self.drawHand()
+        self.render.markDirty("hand")
         # redraw player's entry in menu (since a card was drawn)
-        self.drawPlayer(self.curr_player)
+        self.render.markDirty("player", self.game.curr_player.id)
         self.drawPlayButtons()
-        # create save state of board and player's hand that can be reverted to
-        self.createSaveState()
-        self.printInfo(f"""Player {self.curr_player.id+1}: Play cards from your hand to form sets and runs. You may also move cards around on the board.
+        self.printInfo(f"""Player {self.game.curr_player.id+1}: Play cards from your hand to form sets and runs. You may also move cards around on the board.
 Set: A group of cards of the same value, but different suits. Run: A group of cards of the same suit increasing in value.
 Both sets and runs must contain at least 3 cards.
-Click "Reset Board" to reset the board to its state at the start of this turn.
+Click "Reset Board" to reset the board to its state at the start of this turn, or press Ctrl+Z/Ctrl+Y to undo/redo one move.
 Click "End Turn" when you are done playing/moving cards.""")
 
     def moveToDiscardPhase(self):
         """Run checks to make sure board is valid. If it is, move to discard phase."""
-        if len(self.curr_player.hand) < 1:
-            self.printInfo("You must keep at least one card in your hand to discard.\nClick \"Reset Board\" to get your cards back and play differently.")
-            return
-        if not self.board.validateGroups():
-            self.printInfo("Not every group on the board is a valid run or set. Try again.")
+        error = self.game.endPlayPhase()
+        if error is not None:
+            if len(self.game.curr_player.hand) < 1:
+                self.printInfo(error + "\nClick \"Reset Board\" to get your cards back and play differently.")
+            else: self.printInfo(error + " Try again.")
             return
         
         # checks passed, move on to discard phase
-        self.turn_phase = TurnPhase.DISCARD
         self.erasePlayButtons()
         self.clearSelection()
-        self.printInfo(f"Player {self.curr_player.id+1}: Click a card in your hand to discard it.")
-
-    def changeTurns(self):
-        """Check if the current player won. If they did, move to the victory screen. Otherwise, change to the next player."""
-        # check if current player won
-        if len(self.curr_player.hand) == 0:
-            # calculate scores based on cards left in players' hands
-            scores = {}
-            for player in self.players:
-                score = 0
-                for card in player.hand:
-                    if card.value == 1: score += 14
-                    elif card.value > 10: score += 10
-                    else: score += card.value
-                scores[player.id] = score
-            self.master.display_victory(scores)
-        # erase current player's hand
-        for card in self.curr_player.hand:
+        self.showDiscardPhase()
+
+    def showDiscardPhase(self):
+        self.printInfo(f"Player {self.game.curr_player.id+1}: Click a card in your hand to discard it.")
+
+    def getSeats(self):
+        """Return the name of the bot playing each seat (None for humans)."""
+        return [bot.name if bot is not None else None for bot in self.bots]
+
+    def saveGame(self, path:str = SAVE_PATH):
+        """Save the game to a file (in the background), so it can be resumed later from the title screen."""
+        if self.game.isOver(): # its save was removed, and there's nothing left to resume
+            self.printInfo("The game is over, so there's nothing to save.")
+            return
+        autosaver = Autosaver.forPath(path)
+        # writes finish after this returns, so only an earlier failure can be reported
+        if autosaver.last_error is not None:
+            self.printInfo(f"Couldn't save the game: {autosaver.last_error}")
+        else: self.printInfo("Game saved. Choose \"Continue\" on the title screen to resume it.")
+        autosaver.save(self.game, self.getSeats())
+
+    def autosave(self):
+        """Save the game in the background, or remove the save once the game is over."""
+        if self.autosaver is None: return
+        if self.game.isOver(): self.autosaver.clear()
+        else: self.autosaver.save(self.game, self.getSeats())
+
+    def changeTurns(self, player:Player):
+        """Draw the result of the game changing turns after player discarded.
+        If they won, move to the victory screen. Otherwise, start the next player's ready phase."""
+        # anything still computing was for the turn that just ended
+        self.tasks.cancelAll()
+        self.autosave()
+        if self.game.isOver():
+            self.master.display_victory(self.game.scores)
+            return
+        # erase previous player's hand
+        for card in player.hand:
             card.erase(self)
-        # if all checks pass, advance turn
-        next_id = self.curr_player.id + 1
-        if next_id >= len(self.players):
-            next_id = 0
-        self.curr_player = self.players[next_id]
         self.startReadyPhase()
 
     ### PLAY PHASE FUNCTIONS ###
-    def createSaveState(self):
-        """Create a save state of the board and current player's hand."""
-        # shallow copy so that we don't copy the cards as well
-        self.saved_cgroups = copy.copy(self.board.card_groups)
-        self.saved_hand = copy.copy(self.curr_player.hand)
-
     def loadSaveState(self):
         """Reset the board and current player's hand to the last save state."""
         self.clearSelection()
-        self.board.card_groups = self.saved_cgroups
-        self.curr_player.hand = self.saved_hand
-        # reset cards' internal data (this may have been overwritten in the copy)
-        for cgroup_id in self.board.card_groups:
-            for i in range(0, len(self.board.card_groups[cgroup_id])):
-                card:Card = self.board.card_groups[cgroup_id][i]
-                card.setInternals(Parent.CARDGROUP, cgroup_id, i)
-        for i in range(0, len(self.curr_player.hand)):
-            card:Card = self.curr_player.hand[i]
-            card.setInternals(Parent.HAND, self.curr_player.id, i)
-        # redraw everything
-        print("Save state loaded")
-        print(self.board.card_groups)
-        self.board.draw()
-        self.drawHand()
+        self.game.loadSaveState() # the board marks the groups that changed dirty
+        self.render.markDirty("hand")
+
+    def undoMove(self, redo:bool = False):
+        """Undo the last card moved this turn (or redo the last one undone), redrawing only what it changed."""
+        if self.game.turn_phase != TurnPhase.PLAY: return
+        if self.bots[self.game.curr_player.id] is not None: return # bots play on a copy, and their moves are made all at once
+        done = self.game.redo() if redo else self.game.undo() # the board marks the groups that changed dirty
+        if not done:
+            self.printInfo("Nothing to redo." if redo else "Nothing to undo.")
+            return
+        self.clearSelection()
+        self.render.markDirty("hand")
 
     def moveSelectedCard(self, to_group_id:int):
         """Move selected card to specified card group on board.
@@ -375,56 +501,80 @@ Click "End Turn" when you are done playing/moving cards.""")
         :param to_group_id: ID of card group to move ID to
         """
         card = self.selected_card
-        if card.parent_type == Parent.HAND:
-            if card.parent_id != self.curr_player.id:
-                raise RuntimeError("This card is in another player's hand!")
-            # remove card from hand
-            self.curr_player.removeFromHand(card.card_id)
-            # add to specified card group
-            self.board.addToGroup(to_group_id, card)
-            self.drawHand() # redraw hand
-        else: # CARDGROUP
-            self.board.splitGroup(card.parent_id, card.card_id, to_group_id)
+        from_hand = card.parent_type == Parent.HAND
+        self.game.moveCard(card, to_group_id) # the board marks the changed groups dirty
+        if from_hand: self.render.markDirty("hand") # redraw hand
         self.clearSelection()
     
+    def showHints(self):
+        """Find the sets and runs in the current player's hand, and the cards that extend groups on the board, on a worker thread."""
+        self.printInfo("Hint: Looking for melds...")
+        # copies, since cards may be moved while the search runs
+        hand = list(self.game.curr_player.hand)
+        card_groups = {group_id: list(group) for group_id, group in self.board.card_groups.items()}
+        self.tasks.submit(findHints, hand, card_groups, on_done=self.printHints, on_error=self.hintsFailed)
+
+    def printHints(self, hints:tuple):
+        """Print the (melds, extensions) found by showHints."""
+        melds, extensions = hints
+        if (len(melds) == 0) & (len(extensions) == 0):
+            self.printInfo("Hint: No sets or runs in your hand, and no cards that fit on the board.")
+            return
+        lines = []
+        if len(melds) > 0:
+            # longest first, since those play the most cards
+            meld_strings = [" ".join(codeToString(encode(card)) for card in meld) for meld in melds[:6]]
+            lines.append("Melds in your hand: " + ", ".join(meld_strings) + (" ..." if len(melds) > 6 else ""))
+        if len(extensions) > 0:
+            # board spots are numbered left to right, top to bottom
+            ext_strings = [f"{codeToString(encode(card))} on spot {group_id+1}" for card, group_id in extensions[:8]]
+            lines.append("Cards that fit on the board: " + ", ".join(ext_strings) + (" ..." if len(extensions) > 8 else ""))
+        self.printInfo("Hint:\n" + "\n".join(lines))
+
+    def hintsFailed(self, error:Exception):
+        traceback.print_exception(error)
+        self.printInfo(f"Hint: Couldn't search for melds ({type(error).__name__}: {error}).")
+
     def selectCard(self, card:Card):
         """Select specified card and draw an outline around it."""
         self.selected_card = card
-        self.drawCardSelection()
+        self.render.markDirty("selection")
 
     def clearSelection(self):
         """Clear internal selection info and erase selection outline."""
         self.selected_card = None
-        self.eraseCardSelection()
+        self.render.markDirty("selection")
 
     ### INPUT HANDLING FUNCTIONS ###
     def onClick(self, event:tk.Event):
-        if self.turn_phase == TurnPhase.READY:
+        # clicks are found on what's drawn, so draw anything an earlier event left dirty first
+        self.render.flush()
+        turn_phase = self.game.turn_phase
+        if turn_phase == TurnPhase.READY:
             return
-        elif self.turn_phase == TurnPhase.DRAW:
+        elif turn_phase == TurnPhase.DRAW:
             self.handleClick_Draw(event)
-        elif self.turn_phase == TurnPhase.PLAY:
+        elif turn_phase == TurnPhase.PLAY:
             self.handleClick_Play(event)
-        elif self.turn_phase == TurnPhase.DISCARD:
+        elif turn_phase == TurnPhase.DISCARD:
             self.handleClick_Discard(event)
     
     def handleClick_Draw(self, event:tk.Event):
         """Handle a click in the draw phase"""
         if self.posInBounds(self.deck_bounds, (event.x, event.y)):
-            # draw a card from the deck
-            card = self.deck.pop()
-            # if deck is empty, shuffle discard into deck
-            if len(self.deck) == 0:
-                self.deck = copy.copy(self.discard_pile)
-                random.shuffle(self.deck)
-                self.discard_pile = [self.deck.pop()]
-            self.drawDeck()
+            # draw a card from the deck (it can't be drawn from when it and the discard pile under its top card are empty,
+            # but then the discard pile can still be drawn from, see drawForBot)
+            if not self.game.canDrawFromDeck():
+                self.printInfo(f"Player {self.game.curr_player.id+1}: The deck is empty. Draw from the discard pile instead.")
+                return
+            self.game.drawFromDeck()
+            self.render.markDirty("deck")
         elif self.posInBounds(self.discard_bounds, (event.x, event.y)):
             # draw a card from the discard pile
-            card = self.discard_pile.pop()
-            self.drawDiscard()
+            if len(self.game.discard_pile) == 0: return
+            self.game.drawFromDiscard()
+            self.render.markDirty("discard")
         else: return
-        self.curr_player.addToHand(card)
         self.moveToPlayPhase()
 
     def handleClick_Play(self, event:tk.Event):
@@ -446,73 +596,93 @@ Click "End Turn" when you are done playing/moving cards.""")
                     self.moveSelectedCard(cgroup_id)
                 else: # if no selection, select clicked card
                     self.selectCard(cgroup[i])"""
-            # check only the nearest card stacks
-            groups_to_check = self.board.getClosestCardGroups(event.x, event.y)
-            groups_to_check.sort() # check lowest group first
-            for group_id in groups_to_check:
-                if group_id in self.board.card_groups:
-                    cgroup = self.board.card_groups[group_id]
-                    for i in range(len(cgroup)-1, -1, -1):
-                        if not self.wasAreaClicked(cgroup[i].click_region, event):
-                            continue
-                        if self.selected_card is not None:
-                            # if selected card is clicked, deselect
-                            if cgroup[i] == self.selected_card:
-                                self.clearSelection()
-                                return
-                            # if another card in the group is clicked, select that card
-                            if cgroup == self.getParent(self.selected_card):
-                                self.selectCard(cgroup[i])
-                                return
-                            self.moveSelectedCard(group_id)
-                        else: # if no selection, select clicked card
-                            self.selectCard(cgroup[i])
+            card = self.getCardAt(event.x, event.y, Parent.CARDGROUP)
+            if card is not None:
+                group_id = card.parent_id
+                if self.selected_card is not None:
+                    # if selected card is clicked, deselect
+                    if card.uid == self.selected_card.uid:
+                        self.clearSelection()
                         return
-                else: # no card group here
-                    if not self.wasAreaClicked(self.board.empty_rectangle_hitboxes[group_id], event):
-                        continue
-                    if self.selected_card is not None:
-                        self.moveSelectedCard(group_id)
-                    return
-        elif event.y < TURN_MENU_Y: # in hand
-            hand = self.curr_player.hand
-            # loop backwards through cards in hand
-            for i in range(len(hand)-1, -1, -1):
-                if not self.wasAreaClicked(hand[i].click_region, event):
+                    # if another card in the group is clicked, select that card
+                    if (self.selected_card.parent_type == Parent.CARDGROUP) and (self.selected_card.parent_id == group_id):
+                        self.selectCard(card)
+                        return
+                    self.moveSelectedCard(group_id)
+                else: # if no selection, select clicked card
+                    self.selectCard(card)
+                return
+            # no card here, so check the nearest empty spots
+            for group_id in self.board.getClosestCardGroups(event.x, event.y):
+                if group_id in self.board.card_groups: continue
+                if not self.wasAreaClicked(self.board.empty_rectangle_hitboxes[group_id], event):
                     continue
-                # if card was clicked:
-                if hand[i] == self.selected_card:
-                    # if selected card is clicked, deselect
-                    self.clearSelection()
-                else:
-                    self.selectCard(hand[i])
+                if self.selected_card is not None:
+                    self.moveSelectedCard(group_id)
                 return
+        elif event.y < TURN_MENU_Y: # in hand
+            card = self.getCardAt(event.x, event.y, Parent.HAND)
+            if card is None: return
+            if (self.selected_card is not None) and (card.uid == self.selected_card.uid):
+                # if selected card is clicked, deselect
+                self.clearSelection()
+            else:
+                self.selectCard(card)
         else: # in turn menu
             if self.wasAreaClicked(self.next_turn_bounds, event):
                 self.moveToDiscardPhase()
             elif self.wasAreaClicked(self.reset_bounds, event):
                 self.loadSaveState()
+            elif self.wasAreaClicked(self.hint_bounds, event):
+                self.showHints()
     
     def handleClick_Discard(self, event:tk.Event):
         """Handle a click in the discard phase"""
         if (event.y < TURN_MENU_Y) & (event.y > HAND_MENU_Y): # in hand
-            hand = self.curr_player.hand
-            # loop backwards through cards in hand
-            for i in range(len(hand)-1, -1, -1):
-                if not self.wasAreaClicked(hand[i].click_region, event):
-                    continue
-                # if card was clicked, discard it
-                hand[i].erase(self)
-                self.discard_pile.append(hand[i])
-                self.curr_player.removeFromHand(i)
-                self.changeTurns()
-                return
+            card = self.getCardAt(event.x, event.y, Parent.HAND)
+            if card is None: return
+            # if card was clicked, discard it
+            player = self.game.curr_player
+            self.last_bot_turn = None
+            card.erase(self)
+            self.game.discard(card.card_id)
+            self.changeTurns(player)
 
     def onKeyPress(self, event:tk.Event):
-        if self.turn_phase != TurnPhase.READY: return
+        if event.keysym == "F12": # report how responsive the window has been, and how much drawing it's done
+            stats = self.tasks.stats()
+            calls = self.scene.takeCalls()
+            render = self.render.stats()
+            live = self.scene.liveCounts()
+            self.printInfo(f"UI thread: {stats['heartbeats']} heartbeats, {stats['mean_lateness']*1000:.1f} ms late on average, "
+                           f"{stats['max_lateness']*1000:.1f} ms at worst, {stats['stalls']} stall(s) over {TaskRunner.STALL_THRESHOLD*1000:.0f} ms\n"
+                           f"Canvas: {len(self.scene)} items, {sum(calls.values())} Tk calls since the last F12 "
+                           f"({', '.join(f'{count} {name}' for name, count in calls.items())})\n"
+                           f"Redraws: {render['marks']} changes drawn in {render['frames']} frames\n"
+                           f"Items by owner (now/most): {', '.join(f'{owner} {count}/{peak}' for owner, (count, peak) in sorted(live.items()))}"
+                           + (self.describeAutosaves() if self.autosaver is not None else ""))
+            return
+        if event.keysym in ("Prior", "Next"): # Page Up/Page Down
+            self.scrollBoard(-1 if event.keysym == "Prior" else 1)
+            return
+        if event.state & CONTROL_MASK: # Ctrl+Z to undo a move, Ctrl+Y or Ctrl+Shift+Z to redo one, Ctrl+S to save
+            if event.keysym == "s": self.saveGame()
+            elif event.keysym == "z": self.undoMove()
+            elif event.keysym in ("y", "Z"): self.undoMove(redo=True)
+            return
+        if self.game.turn_phase != TurnPhase.READY: return
+        if self.bots[self.game.curr_player.id] is not None: return # bots start their own turns
         if event.keysym == "Return": # ENTER was pressed
             self.startTurn()
     
+    def describeAutosaves(self):
+        """Return a line for the F12 report on how long autosaves took, on this thread and on the writer thread."""
+        stats = self.autosaver.stats()
+        return (f"\nAutosave: {stats['snapshots']} snapshots taken in {stats['mean_snapshot']*1000:.2f} ms on average "
+                f"(handed over in {stats['max_handover']*1000:.2f} ms at worst), {stats['writes']} written in background "
+                f"in {stats['mean_write']*1000:.1f} ms on average, {stats['max_write']*1000:.1f} ms at worst, "
+                f"{stats['coalesced']} coalesced, {stats['errors']} failed")
+
     def getBoardCardIDs(self, x, y):
         """Return the IDs of card on the board at (x, y).
         Return None if no card on board exists at (x, y), or (x, y) is outside board.\n
@@ -522,18 +692,13 @@ Click "End Turn" when you are done playing/moving cards.""")
         """
         if y > HAND_MENU_Y: # not on board
             return None
-        # check only the nearest card stacks
-        groups_to_check = self.board.getClosestCardGroups(x, y)
-        groups_to_check.sort() # check lowest group first
-        for group_id in groups_to_check:
-            if group_id in self.board.card_groups:
-                cgroup = self.board.card_groups[group_id]
-                for i in range(len(cgroup)-1, -1, -1):
-                    if self.posInBounds(cgroup[i].click_region, (x, y)):
-                        return (cgroup[i].parent_id, cgroup[i].card_id)
-            else: # no card group here
-                if self.posInBounds(self.board.empty_rectangle_hitboxes[group_id], (x, y)):
-                    return (group_id, 0)
+        card = self.getCardAt(x, y, Parent.CARDGROUP)
+        if card is not None: return (card.parent_id, card.card_id)
+        # no card here, so check the nearest empty spots
+        for group_id in self.board.getClosestCardGroups(x, y):
+            if group_id in self.board.card_groups: continue
+            if self.posInBounds(self.board.empty_rectangle_hitboxes[group_id], (x, y)):
+                return (group_id, 0)
         return None
         
     def getHandCardID(self, x, y):
@@ -543,12 +708,22 @@ Click "End Turn" when you are done playing/moving cards.""")
             return None
         if y > TURN_MENU_Y: # in turn menu
             return None
-        hand = self.curr_player.hand
-        # loop backwards through cards in hand
-        for i in range(len(hand)-1, -1, -1):
-            if self.posInBounds(hand[i].click_region, (x, y)):
-                return hand[i].card_id
-        return None
+        card = self.getCardAt(x, y, Parent.HAND)
+        if card is None: return None
+        return card.card_id
+
+    def getCardAt(self, x, y, parent_type:Parent):
+        """Return the topmost card drawn at (x, y) that's on the board (Parent.CARDGROUP) or in the current player's hand (Parent.HAND).
+        Return None if there isn't one. This only checks the cards near (x, y), so it takes the same time however many are drawn."""
+        self.render.flush()
+        if parent_type == Parent.HAND:
+            player_id = self.game.curr_player.id
+            return self.hit_grid.hit(x, y, lambda card: (card.parent_type == Parent.HAND) and (card.parent_id == player_id))
+        return self.hit_grid.hit(x, y, lambda card: card.parent_type == Parent.CARDGROUP)
+
+    def wasAreaClicked(self, bounds:tuple, event:tk.Event):
+        """Return true if the given click event is in the given bounds."""
+        return self.posInBounds(bounds, (event.x, event.y))
 
     def posInBounds(self, bounds:tuple, pos:tuple=None):
         """Return true if (x, y) is in the given bounds.
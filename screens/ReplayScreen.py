@@ -0,0 +1,68 @@
+"""
+File: ReplayScreen.py
+Author: Willow Jordan
+Purpose: This script defines the ReplayScreen object (overriding GameScreen), which steps through a move log (see game_objects/movelog.py)
+on the game screen. Right and Left step forward and back one action, Home and End jump to the start and end,
+and Escape goes back to the title screen. Nothing can be clicked.
+"""
+
+import tkinter as tk
+
+from game_objects.game_state import TurnPhase
+from game_objects.movelog import Replayer
+from screens.GameScreen import GameScreen
+
+class ReplayScreen(GameScreen):
+    def __init__(self, master, log:bytes):
+        """
+        :param log: The move log to replay (see MoveLog.getBytes).
+        """
+        self.log_data = log
+        super().__init__(master, log_path=None, autosave_path=None)
+
+    def makeGame(self, numPlayers:int, bots:list, decks:int, save:bytes):
+        """Start the replay at the beginning of the log. Every seat is shown as a human, so that no bot plays by itself."""
+        self.replayer = Replayer(self.log_data, self.board, self.sprites)
+        return self.replayer.game, None
+
+    def resumeTurn(self):
+        self.showPosition()
+
+    def seek(self, position:int):
+        """Show the game as it was after the given number of actions."""
+        position = max(0, min(position, len(self.replayer)))
+        if position == self.replayer.position: return
+        # the hand and discard pile are drawn from scratch, since seeking back may load a keyframe with new cards
+        for card in self.game.curr_player.hand:
+            card.erase(self)
+        if self.discard_card is not None:
+            self.discard_card.erase(self)
+            self.discard_card = None
+        self.game = self.replayer.seek(position) # the board marks the groups that changed dirty
+        self.showPosition()
+
+    def showPosition(self):
+        """Draw everything that may have changed, and say which action was replayed last."""
+        self.render.markDirty("turn menu")
+        self.render.markDirty("hand")
+        if self.game.turn_phase == TurnPhase.PLAY: self.drawPlayButtons()
+        else: self.erasePlayButtons()
+        position = self.replayer.position
+        if position == 0: last = "the start of the log"
+        else: last = self.replayer.getAction(position - 1).name.lower().replace("_", " ")
+        if self.game.isOver(): turn = "Game over"
+        else: turn = f"Player {self.game.curr_player.id+1}'s turn, {self.game.turn_phase.name.lower()} phase"
+        self.printInfo(f"Replay: action {position} of {len(self.replayer)} ({last}). {turn}\n"
+                       "Right/Left: step forward/back, Home/End: jump to the start/end, Escape: back to the title screen")
+
+    def onClick(self, event:tk.Event):
+        """Nothing can be clicked in a replay."""
+        pass
+
+    def onKeyPress(self, event:tk.Event):
+        if event.keysym == "Right": self.seek(self.replayer.position + 1)
+        elif event.keysym == "Left": self.seek(self.replayer.position - 1)
+        elif event.keysym == "Home": self.seek(0)
+        elif event.keysym == "End": self.seek(len(self.replayer))
+        elif event.keysym == "Escape": self.master.display_title()
+        elif event.keysym in ("Prior", "Next", "F12"): super().onKeyPress(event) # scrolling the board and stats still work
@@ -1,13 +1,17 @@
 """
 File: SettingsScreen.py
 Author: Willow Jordan
-Purpose: This script defines the SettingsScreen object (overriding tk.Frame), representing a screen where the user can enter the number of players and start the game.
+Purpose: This script defines the SettingsScreen object (overriding tk.Frame), representing a screen where the user can enter the number of players
+and decks, choose whether each seat is a human or a bot, and start the game.
 """
 
 import tkinter as tk
 
+from game_objects.game_state import GameState
 from ui_constants import BG_COLOR, UI_FONT, PAD, BUTTON_WIDTH, BUTTON_HEIGHT, TEXT_COLOR
 
+SEAT_OPTIONS = {"Human": None, "Search bot": "ismcts", "Greedy bot": "greedy", "Random bot": "random"} # option text => bot name (None for a human)
+
 class SettingsScreen(tk.Frame):
     def __init__(self, master):
         super().__init__(background=BG_COLOR)
@@ -15,11 +19,29 @@ class SettingsScreen(tk.Frame):
 
         self.settings_label = tk.Label(self, text="Settings", background = BG_COLOR, font=UI_FONT, foreground=TEXT_COLOR)
 
-        self.player_options = [2, 3, 4, 5, 6]
+        self.player_options = list(range(2, 13))
         self.p_selection = tk.IntVar()
 
         self.player_label = tk.Label(self, text="Number of Players: ", background = BG_COLOR, foreground=TEXT_COLOR)
         self.player_selection = tk.OptionMenu(self, self.p_selection, *self.player_options)
+
+        # more than 6 players need more than one deck
+        self.deck_options = [1, 2, 3, 4]
+        self.d_selection = tk.IntVar(value=1)
+        self.deck_label = tk.Label(self, text="Number of Decks: ", background = BG_COLOR, foreground=TEXT_COLOR)
+        self.deck_selection = tk.OptionMenu(self, self.d_selection, *self.deck_options)
+        self.errorlabel = None
+
+        # one human/bot choice per seat, only shown for seats in the game
+        self.seat_selections:list[tk.StringVar] = []
+        self.seat_widgets:list[tuple] = []
+        for i in range(0, max(self.player_options)):
+            selection = tk.StringVar(value="Human")
+            label = tk.Label(self, text=f"Player {i+1}: ", background = BG_COLOR, foreground=TEXT_COLOR)
+            menu = tk.OptionMenu(self, selection, *SEAT_OPTIONS)
+            self.seat_selections.append(selection)
+            self.seat_widgets.append((label, menu))
+        self.p_selection.trace_add("write", lambda *args: self.showSeats())
         
         self.startbutton = tk.Button(self, command=self.start, text="Start Game", width=BUTTON_WIDTH, height=BUTTON_HEIGHT)
         self.backbutton = tk.Button(self, command=self.back, text="Back", width=BUTTON_WIDTH, height=BUTTON_HEIGHT)
@@ -27,16 +49,43 @@ class SettingsScreen(tk.Frame):
         self.settings_label.grid(row=0, columnspan=2, pady=PAD)
         self.player_label.grid(row=1, column=0, pady=PAD)
         self.player_selection.grid(row=1, column=1, pady=PAD)
-        self.startbutton.grid(row=2, columnspan=2, pady=PAD)
-        self.backbutton.grid(row=3, columnspan=2, pady=PAD)
+        self.deck_label.grid(row=2, column=0, pady=PAD)
+        self.deck_selection.grid(row=2, column=1, pady=PAD)
+        self.startbutton.grid(row=15, columnspan=2, pady=PAD)
+        self.backbutton.grid(row=16, columnspan=2, pady=PAD)
+
+    def showSeats(self):
+        """Show a human/bot choice for every seat in the selected player count, and hide the rest."""
+        players = self.p_selection.get()
+        for i in range(0, len(self.seat_widgets)):
+            label, menu = self.seat_widgets[i]
+            if i < players:
+                label.grid(row=i+3, column=0)
+                menu.grid(row=i+3, column=1)
+            else:
+                label.grid_remove()
+                menu.grid_remove()
+
+    def showError(self, message:str):
+        if self.errorlabel is None:
+            self.errorlabel = tk.Label(self, font=UI_FONT, background = BG_COLOR, foreground="red")
+            self.errorlabel.grid(row=17, columnspan=2)
+        self.errorlabel.configure(text=message)
 
     def start(self):
         players = self.p_selection.get()
+        decks = self.d_selection.get()
         if players == 0:
-            self.errorlabel = tk.Label(self, text="Please select a player count.", font=UI_FONT, background = BG_COLOR, foreground="red")
-            self.errorlabel.grid(row=4, columnspan=2)
-        else:
-            self.master.display_game(players)
+            self.showError("Please select a player count.")
+            return
+        # make sure everyone can be dealt a hand before leaving this screen
+        try:
+            GameState(players, decks=decks)
+        except ValueError:
+            self.showError(f"There aren't enough cards for {players} players. Please add another deck.")
+            return
+        bots = [SEAT_OPTIONS[self.seat_selections[i].get()] for i in range(0, players)]
+        self.master.display_game(players, bots, decks)
 
     def back(self):
         self.master.display_title()
\ No newline at end of file
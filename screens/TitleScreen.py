@@ -1,6 +1,9 @@
+import os
 import tkinter as tk
 
-from ui_constants import BG_COLOR, UI_FONT, PAD, BUTTON_WIDTH, BUTTON_HEIGHT, TEXT_COLOR
+from game_objects.movelog import Replayer
+from game_objects.autosave import Autosaver
+from ui_constants import BG_COLOR, UI_FONT, PAD, BUTTON_WIDTH, BUTTON_HEIGHT, TEXT_COLOR, SAVE_PATH, LOG_PATH
 
 class TitleScreen(tk.Frame):
     def __init__(self, master):
@@ -10,10 +13,35 @@ class TitleScreen(tk.Frame):
         self.label = tk.Label(self, text="Rummy", font=UI_FONT, background=BG_COLOR, foreground=TEXT_COLOR)
         self.startbutton = tk.Button(self, command=self.start_game, text="Play", width=BUTTON_WIDTH, height=BUTTON_HEIGHT)
         self.exitbutton = tk.Button(self, command=self.master.destroy, text="Quit", width=BUTTON_WIDTH, height=BUTTON_HEIGHT)
+        self.errorlabel = tk.Label(self, background=BG_COLOR, foreground="red")
 
         self.label.pack(pady=PAD)
+        # a saved game can be picked up where it was left (games are autosaved every turn, so that's the last one played)
+        self.save = Autosaver.forPath(SAVE_PATH).load()
+        if self.save is not None:
+            self.continuebutton = tk.Button(self, command=self.continue_game, text="Continue", width=BUTTON_WIDTH, height=BUTTON_HEIGHT)
+            self.continuebutton.pack(pady=PAD)
         self.startbutton.pack(pady=PAD)
+        # so can the last game played, one action at a time
+        if os.path.exists(LOG_PATH):
+            self.replaybutton = tk.Button(self, command=self.replay_game, text="Replay Last Game", width=BUTTON_WIDTH, height=BUTTON_HEIGHT)
+            self.replaybutton.pack(pady=PAD)
         self.exitbutton.pack(pady=PAD)
-    
+        self.errorlabel.pack(pady=PAD)
+
     def start_game(self):
-        self.master.display_settings()
\ No newline at end of file
+        self.master.display_settings()
+
+    def continue_game(self):
+        self.master.display_game(save=self.save)
+
+    def replay_game(self):
+        # make sure the log can be read before leaving this screen
+        try:
+            with open(LOG_PATH, "rb") as file:
+                log = file.read()
+            Replayer(log)
+        except (OSError, ValueError) as error:
+            self.errorlabel.configure(text=f"Couldn't load the last game: {error}")
+            return
+        self.master.display_replay(log)
@@ -0,0 +1,126 @@
+"""
+File: simulate.py
+Author: Willow Jordan
+Purpose: Run many headless games between bots across a process pool, for tuning rules such as starting hand sizes and scoring.
+Every game gets its own seed derived from --seed and the game's index, so any single game can be replayed exactly.
+Results are written as one JSON line per game as soon as it finishes.
+Example: python simulate.py --games 100000 --players 4 --bots random --out results.jsonl
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from game_objects.game_state import GameState
+from game_objects.bots import BOTS, makeBot, playTurn
+from game_objects.ismcts import ISMCTSBot # adds the search bot to BOTS
+from game_objects.zobrist import mix64
+
+def gameSeed(base_seed:int, index:int):
+    """Return the seed for the game with the given index."""
+    return mix64((base_seed << 32) ^ index)
+
+def runGame(settings:dict, index:int):
+    """Play one game to the end (or to the turn cap) and return its result as a dict.
+    :param settings: Dict of players, decks, bots (one name per seat), max_turns, hand_size, search_budget and seed.
+    :param index: Index of the game in the run.
+    """
+    seed = gameSeed(settings["seed"], index)
+    num_players = settings["players"]
+    game = GameState(num_players, rng=random.Random(seed), starting_hand_size=settings["hand_size"], decks=settings["decks"])
+    # every bot gets its own stream so that changing one seat's bot doesn't change the deck
+    bots = []
+    for seat in range(0, num_players):
+        name = settings["bots"][seat]
+        # search bots run in this worker process only, since the pool already uses every core
+        options = {"time_budget": settings["search_budget"]} if name == ISMCTSBot.name else {}
+        bots.append(makeBot(name, random.Random(mix64(seed + seat + 1)), **options))
+    start = time.perf_counter()
+    turns = 0
+    while (not game.isOver()) and (turns < settings["max_turns"]):
+        playTurn(game, bots[game.curr_player.id])
+        turns += 1
+    finished = game.isOver()
+    return {
+        "game": index,
+        "seed": seed,
+        "finished": finished,
+        "winner": game.curr_player.id if finished else None,
+        "turns": turns,
+        "scores": game.scores if finished else game.calculateScores(),
+        # final hands as card codes, so results can be re-scored with other rules without replaying
+        "hands": [[card.code for card in player.hand] for player in game.players],
+        "seconds": time.perf_counter() - start,
+    }
+
+def runGameTask(task:tuple):
+    settings, index = task
+    return runGame(settings, index)
+
+def writeResults(results, out):
+    """Write every result to out as a JSON line as soon as it arrives. Return (games finished, total turns)."""
+    finished = 0
+    turns = 0
+    for result in results:
+        out.write(json.dumps(result) + "\n")
+        finished += result["finished"]
+        turns += result["turns"]
+    return finished, turns
+
+def parseArgs(argv:list = None):
+    parser = argparse.ArgumentParser(description="Run headless Rummy games between bots.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--players", type=int, default=2, help="players per game")
+    parser.add_argument("--decks", type=int, default=1, help="decks shuffled together into the shoe")
+    parser.add_argument("--bots", default="random",
+                        help=f"comma separated bot names, one per seat (repeated to fill every seat). Bots: {', '.join(BOTS)}")
+    parser.add_argument("--hand-size", type=int, default=None, help="starting hand size (default depends on the number of players)")
+    parser.add_argument("--search-budget", type=float, default=0.05, help="seconds an ismcts bot searches for each action")
+    parser.add_argument("--max-turns", type=int, default=1000, help="stop a game unfinished after this many turns")
+    parser.add_argument("--seed", type=int, default=0, help="base seed that every game's seed is derived from")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (1 runs in this process)")
+    parser.add_argument("--out", default="-", help="file to write JSON lines to, or - for stdout")
+    args = parser.parse_args(argv)
+    names = args.bots.split(",")
+    for name in names:
+        if name not in BOTS: parser.error(f"unknown bot {name!r}, expected one of: {', '.join(BOTS)}")
+    args.bots = [names[seat % len(names)] for seat in range(0, args.players)]
+    if args.workers < 1: parser.error("--workers must be at least 1")
+    return args
+
+def main(argv:list = None):
+    args = parseArgs(argv)
+    settings = {"players": args.players, "decks": args.decks, "bots": args.bots, "max_turns": args.max_turns,
+                "hand_size": args.hand_size, "search_budget": args.search_budget, "seed": args.seed}
+    # check the settings once here rather than in every worker
+    try:
+        GameState(args.players, starting_hand_size=args.hand_size, decks=args.decks)
+    except ValueError as error:
+        sys.exit(f"simulate.py: {error}")
+    tasks = ((settings, index) for index in range(0, args.games))
+    # big enough chunks to keep pickling overhead down, small enough to keep every worker busy at the end
+    chunksize = max(1, min(64, args.games // (args.workers * 16)))
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w")
+    start = time.perf_counter()
+    try:
+        if args.workers == 1:
+            finished, turns = writeResults(map(runGameTask, tasks), out)
+        else:
+            with multiprocessing.Pool(args.workers) as pool:
+                finished, turns = writeResults(pool.imap_unordered(runGameTask, tasks, chunksize), out)
+    finally:
+        if out is not sys.stdout: out.close()
+    elapsed = time.perf_counter() - start
+
+    rate = args.games / elapsed if elapsed > 0 else 0.0
+    print(f"{args.games} games ({finished} finished, {args.games - finished} hit the turn cap, {turns / max(1, args.games):.1f} turns on average)",
+          file=sys.stderr)
+    print(f"{elapsed:.2f}s on {args.workers} worker(s): {rate:.1f} games/s, {rate / args.workers:.1f} games/s per core", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
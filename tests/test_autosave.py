@@ -0,0 +1,66 @@
+"""
+File: test_autosave.py
+Author: Willow Jordan
+Purpose: Check that the Autosaver leaves the last snapshot handed over on disk however quickly they come,
+that clearing removes the save, and that a corrupt save or a temporary file left behind by a cut-off write is never loaded.
+"""
+
+import os
+import random
+
+from game_objects.autosave import Autosaver
+from game_objects.bots import GreedyBot, playTurn
+from game_objects.game_state import GameState
+from game_objects.savefile import serializeGame, deserializeGame
+
+def test_last_save_ends_up_on_disk(tmp_path):
+    path = str(tmp_path / "save.rumy")
+    autosaver = Autosaver(path)
+    game = GameState(2, seed=1)
+    bots = [GreedyBot(random.Random(0)), GreedyBot(random.Random(1))]
+    for turn in range(0, 20):
+        if game.isOver(): break
+        playTurn(game, bots[game.curr_player.id])
+        autosaver.save(game, ["greedy", "greedy"])
+    assert autosaver.wait(10)
+    assert autosaver.last_error is None
+    assert not os.path.exists(autosaver.temp_path)
+    with open(path, "rb") as file:
+        data = file.read()
+    assert data == serializeGame(game, ["greedy", "greedy"])
+    loaded, seats = deserializeGame(data)
+    assert loaded.stateHash() == game.stateHash()
+    # a new autosaver (as after restarting) loads it from the file
+    assert Autosaver(path).load() == data
+
+def test_clear_removes_the_save(tmp_path):
+    path = str(tmp_path / "save.rumy")
+    autosaver = Autosaver(path)
+    game = GameState(2, seed=2)
+    autosaver.save(game)
+    autosaver.clear()
+    assert autosaver.load() is None # the last thing handed over, before it's written
+    assert autosaver.wait(10)
+    assert not os.path.exists(path)
+    assert Autosaver(path).load() is None
+
+def test_corrupt_save_isnt_loaded(tmp_path):
+    path = str(tmp_path / "save.rumy")
+    data = serializeGame(GameState(2, seed=3))
+    with open(path, "wb") as file:
+        file.write(data[:len(data) // 2])
+    assert Autosaver(path).load() is None
+    with open(path, "wb") as file:
+        file.write(b"not a save")
+    assert Autosaver(path).load() is None
+
+def test_leftover_temporary_file_is_removed(tmp_path):
+    path = str(tmp_path / "save.rumy")
+    data = serializeGame(GameState(2, seed=4))
+    with open(path, "wb") as file:
+        file.write(data)
+    autosaver = Autosaver(path)
+    with open(autosaver.temp_path, "wb") as file: # a write cut off before it replaced the save
+        file.write(data[:10])
+    assert autosaver.load() == data
+    assert not os.path.exists(autosaver.temp_path)
@@ -0,0 +1,98 @@
+"""
+File: test_board.py
+Author: Willow Jordan
+Purpose: Check that free group IDs are handed out lowest first, and that the board keeps and draws every group
+once it grows past the rows in view (using the counting canvas from bench_render.py in place of tkinter's),
+and that the invalid groups tracked as groups change always match checking every group.
+"""
+
+import random
+
+from benchmarks.bench_render import CountingCanvas, Root, Sprites
+from game_objects.board import BoardState, Board
+from game_objects.card import Card, Suit
+from game_objects.game_state import GameState
+from game_objects.melds import isValidMeld
+
+def lowestFree(board:BoardState):
+    group_id = 0
+    while group_id in board.card_groups: group_id += 1
+    return group_id
+
+def test_free_group_ids_are_reused_lowest_first():
+    game = GameState(2, seed=0, decks=4)
+    board = game.board
+    for i in range(0, 10):
+        assert board.makeGroup(game.deck.dealMany(3)) == i
+    for group_id in (7, 2, 5):
+        board.restoreGroup(group_id, None)
+    # the ID of a group emptied card by card is freed too
+    while 8 in board.card_groups: board.removeFromGroup(8, 0)
+    for group_id in (2, 5, 7, 8, 10, 11):
+        assert board.getNextGID() == group_id
+        assert board.makeGroup(game.deck.dealMany(3)) == group_id
+    # and through any mix of creating and removing groups, at the end of the range too
+    rng = random.Random(1)
+    for step in range(0, 500):
+        if (len(board.card_groups) > 0) and (rng.random() < 0.5):
+            board.restoreGroup(rng.choice(list(board.card_groups.keys())), None)
+        else: board.makeGroup([Card(Suit.HEARTS, 1)])
+        assert board.getNextGID() == lowestFree(board)
+        assert board.getGIDRange() == max(board.card_groups.keys(), default=-1) + 1
+
+def test_board_grows_past_the_view():
+    canvas = CountingCanvas(Root())
+    board = Board(canvas)
+    game = GameState(2, board=board, sprites=Sprites(), seed=2, decks=4)
+    num_groups = Board.NUM_ROWS * Board.NUM_COLS * 2 + 3 # 6 full rows and part of a 7th
+    groups = {}
+    for i in range(0, num_groups):
+        group_id = board.makeGroup(game.deck.dealMany(3))
+        groups[group_id] = [card.uid for card in board.card_groups[group_id]]
+    assert board.getRowCount() == num_groups // Board.NUM_COLS + 2 # every row with a group, plus an empty one
+    # scroll over every row: only the groups in view are drawn, and none are lost
+    for first_row in range(0, board.getRowCount()):
+        board.scrollTo(first_row)
+        assert board.first_row == min(first_row, board.getRowCount() - Board.NUM_ROWS)
+        for group_id, group in board.card_groups.items():
+            assert [card.uid for card in group] == groups[group_id]
+            drawn = [card.image_id is not None for card in group]
+            assert drawn == [board.isVisible(group_id)] * len(group)
+        # the spots in view map back to the groups in them
+        x = Board.START_X + Board.COL_SPACING + 1
+        y = Board.START_Y + Board.ROW_SPACING + 1
+        assert (board.first_row + 1) * Board.NUM_COLS + 1 in board.getClosestCardGroups(x, y)
+    assert {group_id: [card.uid for card in group] for group_id, group in board.card_groups.items()} == groups
+
+def test_invalid_groups_match_a_full_scan():
+    rng = random.Random(3)
+    for seed in range(0, 10):
+        game = GameState(2, seed=seed, decks=2, starting_hand_size=40)
+        board = game.board
+        for turn in range(0, 5):
+            game.startTurn()
+            game.drawFromDeck()
+            for step in range(0, 60):
+                choice = rng.random()
+                if choice < 0.6:
+                    group_ids = list(board.card_groups.keys())
+                    if (len(group_ids) > 0) and (rng.random() < 0.3):
+                        group = board.card_groups[rng.choice(group_ids)]
+                        card = group[rng.randrange(0, len(group))]
+                    else: card = game.curr_player.hand[rng.randrange(0, len(game.curr_player.hand))]
+                    game.moveCard(card, rng.choice(group_ids) if (len(group_ids) > 0) and (rng.random() < 0.6) else board.getNextGID())
+                elif choice < 0.75: game.undo()
+                elif choice < 0.9: game.redo()
+                else: game.loadSaveState()
+                # checking single groups in between leaves the rest dirty
+                if rng.random() < 0.3:
+                    group_id = rng.randrange(0, board.getGIDRange() + 1)
+                    assert board.isGroupValid(group_id) == ((group_id not in board.card_groups) or isValidMeld(board.card_groups[group_id]))
+                if rng.random() < 0.5:
+                    invalid = {group_id for group_id, group in board.card_groups.items() if not isValidMeld(group)}
+                    assert board.validateGroups() == (len(invalid) == 0)
+                    assert board.invalid_groups == invalid
+            # end the turn with a valid board
+            game.loadSaveState()
+            game.endPlayPhase()
+            game.discard(0)
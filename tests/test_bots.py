@@ -0,0 +1,35 @@
+"""
+File: test_bots.py
+Author: Willow Jordan
+Purpose: Check that the TurnPlan playTurn returns repeats the bot's turn exactly on another copy of the game (see applyPlan),
+and that a move log already set on the game still gets every action.
+"""
+
+import random
+
+from game_objects.bots import GreedyBot, RandomBot, playTurn, planTurn, applyPlan
+from game_objects.game_state import GameState
+from game_objects.movelog import MoveLog, Replayer
+
+def test_plan_repeats_the_turn():
+    for seed in range(0, 10):
+        game = GameState(3, seed=seed, decks=2)
+        bots = [GreedyBot(random.Random(seed)), RandomBot(random.Random(seed)), GreedyBot(random.Random(seed + 1))]
+        for turn in range(0, 100):
+            if game.isOver(): break
+            copy = game.clone(random.Random(seed))
+            plan = planTurn(copy, bots[game.curr_player.id])
+            applyPlan(game, plan)
+            assert game.stateHash() == copy.stateHash()
+            assert game.scores == copy.scores
+
+def test_plan_passes_actions_on_to_the_log():
+    game = GameState(2, seed=5)
+    log = MoveLog(game)
+    bots = [GreedyBot(random.Random(0)), GreedyBot(random.Random(1))]
+    for turn in range(0, 30):
+        if game.isOver(): break
+        plan = playTurn(game, bots[game.curr_player.id])
+        assert plan.discard is not None
+        assert game.log is log # put back after the turn
+    assert Replayer(log.getBytes()).replayAll().stateHash() == game.stateHash()
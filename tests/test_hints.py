@@ -0,0 +1,36 @@
+"""
+File: test_hints.py
+Author: Willow Jordan
+Purpose: Check that MeldFinder.findSets finds every distinct set in hands with several decks, each once, without reusing a card.
+"""
+
+import itertools
+import random
+
+from game_objects.card import Card
+from game_objects.encoding import SUITS
+from game_objects.hints import MeldFinder
+
+def suitsOf(cards:list[Card]):
+    return (cards[0].value, tuple(sorted(card.suit._value_ for card in cards)))
+
+def test_sets_match_every_combination():
+    rng = random.Random(0)
+    for trial in range(0, 500):
+        decks = rng.randint(1, 3)
+        deck = [Card(suit, value, deck=number) for number in range(0, decks) for suit in SUITS for value in range(1, 14)]
+        hand = rng.sample(deck, rng.randint(1, 30))
+        # every combination of 3 or more cards of one value, with identical cards counted once
+        expected = set()
+        for value in range(1, 14):
+            cards = [card for card in hand if card.value == value]
+            for size in range(3, len(cards) + 1):
+                for combo in itertools.combinations(cards, size):
+                    expected.add(suitsOf(combo))
+        sets = MeldFinder(hand).findSets()
+        found = [suitsOf(cards) for cards in sets]
+        assert len(found) == len(set(found)) # no set twice
+        assert set(found) == expected
+        for cards in sets:
+            assert len(set(card.uid for card in cards)) == len(cards) # no card twice
+            assert all(any(card is other for other in hand) for card in cards)
@@ -0,0 +1,56 @@
+"""
+File: test_hitgrid.py
+Author: Willow Jordan
+Purpose: Check that the HitGrid finds the same card as scanning every click region, topmost first,
+for random points, points on the edges of regions and points where regions overlap, as regions are added, raised and removed.
+"""
+
+import random
+
+from game_objects.card import DEFAULT_CARD_WIDTH, DEFAULT_CARD_HEIGHT
+from game_objects.hitgrid import HitGrid
+
+def linearHit(regions:list, x, y, accept = None):
+    """Return the value of the last region in the list (the topmost) containing (x, y), or None."""
+    for item_id, bounds, value in reversed(regions):
+        if (bounds[0] <= x <= bounds[2]) and (bounds[1] <= y <= bounds[3]) and ((accept is None) or accept(value)):
+            return value
+    return None
+
+def test_hits_match_a_linear_scan():
+    rng = random.Random(0)
+    grid = HitGrid()
+    regions = [] # (item ID, bounds, value), bottom first
+    for step in range(0, 2000):
+        choice = rng.random()
+        if (choice < 0.2) and (len(regions) > 0):
+            item_id, bounds, value = regions.pop(rng.randrange(0, len(regions)))
+            grid.remove(item_id)
+        elif (choice < 0.3) and (len(regions) > 0): # drawn again, so it goes on top
+            region = regions.pop(rng.randrange(0, len(regions)))
+            regions.append(region)
+            grid.add(*region)
+        else:
+            # cards are often stacked a few pixels apart, like board groups and hands
+            if (len(regions) > 0) and (rng.random() < 0.5):
+                x, y = rng.choice(regions)[1][:2]
+                x += rng.choice((0, 10, DEFAULT_CARD_WIDTH)) # on top of it, stacked on it or touching its right edge
+                y += 10
+            else: x, y = rng.randrange(0, 800), rng.randrange(0, 600)
+            bounds = (x, y, x + DEFAULT_CARD_WIDTH, y + DEFAULT_CARD_HEIGHT)
+            region = (step, bounds, f"card {step}")
+            regions.append(region)
+            grid.add(*region)
+        assert len(grid) == len(regions)
+        points = [(rng.uniform(-10, 850), rng.uniform(-10, 700)) for i in range(0, 5)]
+        if len(regions) > 0:
+            # every corner and edge of a region, and just outside it
+            x0, y0, x1, y1 = rng.choice(regions)[1]
+            points += [(x0, y0), (x1, y1), (x0, y1), (x1, y0), ((x0 + x1) / 2, y0), (x0 - 0.01, y0), (x1 + 0.01, y1)]
+        for x, y in points:
+            assert grid.hit(x, y) == linearHit(regions, x, y)
+    # accept skips regions, showing the ones under them
+    accept = lambda value: int(value.split()[1]) % 2 == 0
+    for i in range(0, 200):
+        x, y = rng.uniform(0, 850), rng.uniform(0, 700)
+        assert grid.hit(x, y, accept) == linearHit(regions, x, y, accept)
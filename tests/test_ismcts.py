@@ -0,0 +1,52 @@
+"""
+File: test_ismcts.py
+Author: Willow Jordan
+Purpose: Check that determinize() deals the hidden cards consistently with what the observer has seen:
+hand sizes, deck size and the observer's hand stay the same, and cards other players took from the discard pile stay in their hands.
+"""
+
+import random
+
+from game_objects.game_state import GameState
+from game_objects.ismcts import determinize
+
+def uids(cards):
+    return [card.uid for card in cards]
+
+def test_determinize_keeps_what_the_observer_saw():
+    rng = random.Random(0)
+    for seed in range(0, 10):
+        game = GameState(3, seed=seed, decks=1 + seed % 2)
+        # player 1 takes the top of the discard pile and discards another card
+        for player_id in range(0, 2):
+            game.startTurn()
+            if player_id == 1: picked = game.drawFromDiscard()
+            else: game.drawFromDeck()
+            game.endPlayPhase()
+            game.discard(0)
+        assert picked.uid in game.players[1].picked_up
+        observer_id = 2
+        everything = sorted(uids(game.deck) + uids(game.discard_pile) + [card.uid for player in game.players for card in player.hand])
+        dealt = set()
+        for i in range(0, 20):
+            state = determinize(game, observer_id, rng)
+            assert len(state.deck) == len(game.deck)
+            assert [len(player.hand) for player in state.players] == [len(player.hand) for player in game.players]
+            assert uids(state.players[observer_id].hand) == uids(game.players[observer_id].hand)
+            assert uids(state.discard_pile) == uids(game.discard_pile)
+            assert picked.uid in uids(state.players[1].hand)
+            assert sorted(uids(state.deck) + uids(state.discard_pile) + [card.uid for player in state.players for card in player.hand]) == everything
+            for player in state.players:
+                for card_id in range(0, len(player.hand)):
+                    assert (player.hand[card_id].parent_id, player.hand[card_id].card_id) == (player.id, card_id)
+            dealt.add(tuple(uids(state.players[0].hand)))
+        assert len(dealt) > 1 # the rest is dealt at random
+
+def test_discarded_pickups_are_forgotten():
+    game = GameState(2, seed=1)
+    game.startTurn()
+    picked = game.drawFromDiscard()
+    game.endPlayPhase()
+    game.discard(picked.card_id)
+    assert len(game.players[0].picked_up) == 0
+    assert game.clone().players[0].picked_up == set()
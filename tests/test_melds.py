@@ -0,0 +1,99 @@
+"""
+File: test_melds.py
+Author: Willow Jordan
+Purpose: Check that the bitmask validator (melds.py) and the NumPy batch validator (batch.py) give the same answers
+as CardGroup.isValidRun/isValidSet, which only accept cards in sequence order.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from game_objects.board import CardGroup
+from game_objects.card import Card
+from game_objects.encoding import SUITS, decode
+from game_objects.melds import MeldType, meldType, meldTypeOfCodes
+
+def cardGroupType(group:CardGroup):
+    """Classify a group the way the CardGroup methods do."""
+    if group.isValidRun(): return MeldType.RUN
+    if group.isValidSet(): return MeldType.SET
+    return MeldType.INVALID
+
+def inSequenceType(cards:list[Card]):
+    """Return what the CardGroup methods accept the cards as once they're rotated into sequence order, or INVALID if no rotation is valid."""
+    by_value = sorted(cards, key=lambda card: card.value)
+    for rotation in range(0, len(by_value)):
+        result = cardGroupType(CardGroup(by_value[rotation:] + by_value[:rotation]))
+        if result != MeldType.INVALID: return result
+    return MeldType.INVALID
+
+def randomCodeGroups(rng:random.Random, count:int, width:int = 8):
+    """Return a mix of runs (in sequence order, sometimes wrapping King to Ace), sets and random groups of 1-width codes."""
+    groups = []
+    for i in range(0, count):
+        kind = rng.randint(0, 2)
+        if kind == 0:
+            suit = rng.randint(0, 3)
+            start = rng.randint(0, 12)
+            groups.append([suit * 13 + (start + j) % 13 for j in range(0, rng.randint(1, width))])
+        elif kind == 1:
+            value = rng.randint(0, 12)
+            groups.append([suit * 13 + value for suit in rng.sample(range(0, 4), rng.randint(1, 4))])
+        else:
+            groups.append(rng.sample(range(0, 52), rng.randint(1, width)))
+    return groups
+
+def test_every_run_in_any_order():
+    rng = random.Random(0)
+    for suit in SUITS:
+        for start in range(1, 14):
+            for length in range(3, 14):
+                group = CardGroup([Card(suit, (start - 1 + i) % 13 + 1) for i in range(0, length)])
+                assert cardGroupType(group) == MeldType.RUN
+                shuffled = list(group)
+                rng.shuffle(shuffled)
+                assert meldType(group) == meldType(shuffled) == MeldType.RUN
+
+def test_every_set_in_any_order():
+    for value in range(1, 14):
+        for size in range(3, 5):
+            for suits in itertools.permutations(SUITS, size):
+                group = CardGroup([Card(suit, value) for suit in suits])
+                assert cardGroupType(group) == meldType(group) == MeldType.SET
+
+def test_repeated_suits_need_more_than_one_deck():
+    for value in range(1, 14):
+        group = CardGroup([Card(SUITS[0], value), Card(SUITS[1], value), Card(SUITS[0], value, deck=1)])
+        assert not group.isValidSet()
+        assert group.isValidSet(decks=2)
+        assert meldType(group) == MeldType.SET # the bitmask validator is only given cards that exist
+        distinct = CardGroup([Card(suit, value) for suit in SUITS])
+        assert distinct.isValidSet() and distinct.isValidSet(decks=2)
+
+def test_random_groups_match_a_valid_ordering():
+    """The bitmask validator accepts exactly the groups that the CardGroup methods accept in some order."""
+    rng = random.Random(1)
+    deck = [Card(suit, value) for suit in SUITS for value in range(1, 14)]
+    for i in range(0, 20000):
+        cards = rng.sample(deck, rng.randint(3, 5))
+        assert meldType(cards) == inSequenceType(cards), [str(card) for card in cards]
+
+def test_codes_match_cards():
+    rng = random.Random(2)
+    for group in randomCodeGroups(rng, 5000):
+        assert meldTypeOfCodes(group) == meldType([decode(code) for code in group])
+
+def test_batch_matches_bitmask_and_card_group():
+    pytest.importorskip("numpy") # only batch.py needs NumPy
+    from game_objects.batch import batchValidate, encodeBatch
+    rng = random.Random(3)
+    groups = randomCodeGroups(rng, 20000)
+    valid, types = batchValidate(*encodeBatch(groups, 8))
+    for i in range(0, len(groups)):
+        assert types[i] == meldTypeOfCodes(groups[i]).value, groups[i]
+        # groups are generated in sequence order, so the CardGroup methods accept every run and set among them
+        card_group_type = cardGroupType(CardGroup([decode(code) for code in groups[i]]))
+        if card_group_type != MeldType.INVALID: assert types[i] == card_group_type.value, groups[i]
+        assert valid[i] == ((types[i] != MeldType.INVALID.value) and (len(groups[i]) >= 3))
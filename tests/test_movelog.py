@@ -0,0 +1,77 @@
+"""
+File: test_movelog.py
+Author: Willow Jordan
+Purpose: Check that a logged bot game replays headless to the same game, that seeking (forwards, backwards and across keyframes)
+gives the same game as replaying one action at a time, and that a log cut off partway through a record loads up to the last whole one.
+"""
+
+import random
+
+from game_objects.bots import GreedyBot, RandomBot, playTurn
+from game_objects.game_state import GameState, Action
+from game_objects.movelog import MoveLog, Replayer, KEYFRAME_HEADER
+
+def makeLog(seed:int = 2, keyframe_interval:int = 40):
+    """Play a seeded bot game to the end, logging it. Return (game, log bytes)."""
+    game = GameState(3, seed=seed)
+    log = MoveLog(game, keyframe_interval=keyframe_interval)
+    bots = [GreedyBot(random.Random(seed)), RandomBot(random.Random(seed + 1)), GreedyBot(random.Random(seed + 2))]
+    for turn in range(0, 200):
+        if game.isOver(): break
+        playTurn(game, bots[game.curr_player.id])
+    log.close()
+    return game, log.getBytes()
+
+def stepHashes(data:bytes):
+    """Return the game's hash after every number of actions, replaying one action at a time."""
+    replayer = Replayer(data)
+    hashes = [replayer.game.stateHash()]
+    while replayer.step() is not None:
+        hashes.append(replayer.game.stateHash())
+    return hashes
+
+def test_replay_matches_the_game():
+    game, data = makeLog()
+    replayer = Replayer(data)
+    assert not replayer.truncated
+    assert len(replayer.keyframes) > 2
+    assert replayer.replayAll().stateHash() == game.stateHash()
+    assert replayer.game.scores == game.scores
+
+def test_seek_matches_stepping():
+    game, data = makeLog()
+    hashes = stepHashes(data)
+    replayer = Replayer(data)
+    assert len(hashes) == len(replayer) + 1
+    # across keyframes (both ways), onto them and just before them
+    positions = []
+    for actions, offset, length in replayer.keyframes:
+        positions += [actions, max(actions - 1, 0), min(actions + 1, len(replayer))]
+    positions += [len(replayer), 0, len(replayer) // 2]
+    rng = random.Random(0)
+    positions += [rng.randrange(0, len(replayer) + 1) for i in range(0, 50)]
+    for position in positions:
+        assert replayer.seek(position).stateHash() == hashes[position]
+        assert replayer.position == position
+
+def test_truncated_log_loads_its_whole_records():
+    game, data = makeLog()
+    hashes = stepHashes(data)
+    replayer = Replayer(data)
+    # partway through a move
+    index = next(i for i in range(len(replayer) // 2, len(replayer)) if replayer.getAction(i) == Action.MOVE)
+    cut = Replayer(data[:replayer.offsets[index] + 2])
+    assert cut.truncated
+    assert len(cut) == index
+    assert cut.replayAll().stateHash() == hashes[index]
+    # partway through a keyframe's save
+    actions, offset, length = replayer.keyframes[-1]
+    cut = Replayer(data[:offset + length // 2])
+    assert cut.truncated
+    assert len(cut) == actions
+    assert len(cut.keyframes) == len(replayer.keyframes) - 1
+    assert cut.replayAll().stateHash() == hashes[actions]
+    # partway through a keyframe's header
+    cut = Replayer(data[:offset - KEYFRAME_HEADER.size + 3])
+    assert cut.truncated
+    assert len(cut) == actions
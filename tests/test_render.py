@@ -0,0 +1,83 @@
+"""
+File: test_render.py
+Author: Willow Jordan
+Purpose: Check that the RenderScheduler draws everything marked dirty once per idle, in the order it was registered,
+with a fake after_idle() that runs the flush when the test says the UI thread is idle.
+"""
+
+from game_objects.render import RenderScheduler, ALL
+
+class FakeWidget():
+    """Keeps the callbacks given to after_idle() until idle() runs them."""
+    def __init__(self):
+        self.jobs = {}
+        self.next_job = 0
+        self.scheduled = 0
+    def after_idle(self, callback):
+        self.next_job += 1
+        self.scheduled += 1
+        self.jobs[self.next_job] = callback
+        return self.next_job
+    def after_cancel(self, job): self.jobs.pop(job, None)
+    def idle(self):
+        jobs = self.jobs
+        self.jobs = {}
+        for callback in jobs.values(): callback()
+
+def makeScheduler():
+    widget = FakeWidget()
+    scheduler = RenderScheduler(widget)
+    drawn = []
+    scheduler.register("board", lambda keys: drawn.append(("board", set(keys))), keyed=True)
+    scheduler.register("hand", lambda: drawn.append("hand"))
+    scheduler.register("everything", lambda: drawn.append("everything"), covers=("selection",))
+    scheduler.register("selection", lambda: drawn.append("selection"))
+    return widget, scheduler, drawn
+
+def test_draws_once_per_idle():
+    widget, scheduler, drawn = makeScheduler()
+    for i in range(0, 5):
+        scheduler.markDirty("hand")
+        scheduler.markDirty("board", i % 3)
+    assert drawn == [] # nothing is drawn until the UI thread is idle
+    assert widget.scheduled == 1
+    widget.idle()
+    assert drawn == [("board", {0, 1, 2}), "hand"]
+    widget.idle()
+    assert drawn == [("board", {0, 1, 2}), "hand"] # nothing new
+    assert scheduler.stats()["frames"] == 1
+    assert scheduler.stats()["marks"] == 10
+
+def test_covered_components_are_skipped():
+    widget, scheduler, drawn = makeScheduler()
+    scheduler.markDirty("selection")
+    scheduler.markDirty("everything")
+    scheduler.markDirty("board")
+    widget.idle()
+    assert drawn == [("board", {ALL}), "everything"]
+
+def test_flush_draws_early_and_cancels_the_idle_draw():
+    widget, scheduler, drawn = makeScheduler()
+    scheduler.markDirty("hand")
+    scheduler.flush() # e.g. before finding what was clicked
+    assert drawn == ["hand"]
+    assert widget.jobs == {}
+    scheduler.markDirty("hand")
+    scheduler.shutdown()
+    widget.idle()
+    scheduler.markDirty("hand")
+    assert drawn == ["hand"]
+    assert widget.jobs == {}
+
+def test_marks_made_while_drawing_are_drawn_next_idle():
+    widget = FakeWidget()
+    scheduler = RenderScheduler(widget)
+    drawn = []
+    scheduler.register("hand", lambda: drawn.append("hand"))
+    scheduler.register("board", lambda keys: (drawn.append("board"), scheduler.markDirty("hand")), keyed=True)
+    scheduler.markDirty("board", 1)
+    widget.idle()
+    assert drawn == ["board"]
+    widget.idle()
+    assert drawn == ["board", "hand"]
+    assert scheduler.stats()["frames"] == 2
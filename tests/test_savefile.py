@@ -0,0 +1,82 @@
+"""
+File: test_savefile.py
+Author: Willow Jordan
+Purpose: Check that a game saved in the middle of a play phase loads back exactly as it was (see savefile.py),
+and that truncated saves, saves of another version and saves with a card missing or saved twice are rejected.
+"""
+
+import random
+import struct
+
+import pytest
+
+from game_objects.bots import GreedyBot, playTurn
+from game_objects.card import Card
+from game_objects.encoding import SUITS
+from game_objects.game_state import GameState, TurnPhase
+from game_objects.savefile import VERSION, serializeGame, deserializeGame
+
+def uids(cards):
+    return [card.uid for card in cards]
+
+def describe(game:GameState):
+    """Return everything a save keeps, in a form that can be compared."""
+    return {
+        "hands": [uids(player.hand) for player in game.players],
+        "board": {group_id: uids(group) for group_id, group in game.board.card_groups.items()},
+        "deck": uids(game.deck),
+        "discard": uids(game.discard_pile),
+        "player": game.curr_player.id,
+        "phase": game.turn_phase,
+        "rng": game.rng.getstate(),
+        "hash": game.stateHash(),
+    }
+
+def makeMidTurnGame(seed:int = 3, decks:int = 1):
+    """Return a game a few turns in, in the play phase with a card just moved onto the board."""
+    game = GameState(3, seed=seed, decks=decks)
+    bots = [GreedyBot(random.Random(seed + i)) for i in range(0, 3)]
+    for turn in range(0, 9):
+        playTurn(game, bots[game.curr_player.id])
+    assert not game.isOver()
+    game.startTurn()
+    game.drawFromDeck()
+    game.moveCard(game.curr_player.hand[0], game.board.getNextGID())
+    assert game.turn_phase == TurnPhase.PLAY
+    return game
+
+def test_round_trip_mid_play_phase():
+    for decks in (1, 2):
+        game = makeMidTurnGame(decks=decks)
+        seats = ["greedy", None, "random"]
+        loaded, loaded_seats = deserializeGame(serializeGame(game, seats))
+        assert describe(loaded) == describe(game)
+        assert loaded_seats == seats
+        # "Reset Board" goes back to the board as it was saved
+        loaded.loadSaveState()
+        assert describe(loaded) == describe(game)
+
+def test_truncated_save_is_rejected():
+    data = serializeGame(makeMidTurnGame())
+    for length in range(0, len(data)):
+        with pytest.raises(ValueError):
+            deserializeGame(data[:length])
+
+def test_unknown_version_is_rejected():
+    data = bytearray(serializeGame(makeMidTurnGame()))
+    struct.pack_into("<H", data, 4, VERSION + 1)
+    with pytest.raises(ValueError, match="aren't supported"):
+        deserializeGame(bytes(data))
+
+def test_duplicate_card_is_rejected():
+    game = makeMidTurnGame()
+    game.discard_pile.append(game.players[1].hand[0])
+    with pytest.raises(ValueError, match="saved twice"):
+        deserializeGame(serializeGame(game))
+
+def test_out_of_range_card_is_rejected():
+    game = makeMidTurnGame()
+    top = game.discard_pile[-1]
+    game.discard_pile[-1] = Card(SUITS[top.code // 13], top.value, deck=3) # a deck this game doesn't have
+    with pytest.raises(ValueError, match="missing from the deck"):
+        deserializeGame(serializeGame(game))
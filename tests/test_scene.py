@@ -0,0 +1,51 @@
+"""
+File: test_scene.py
+Author: Willow Jordan
+Purpose: Check that the Scene reuses canvas items, only sending Tk what changed, and that it only deletes the items it owns
+(using the counting canvas from bench_render.py in place of tkinter's).
+"""
+
+from benchmarks.bench_render import CountingCanvas, Root
+from game_objects.scene import Scene
+
+def test_items_are_reused():
+    canvas = CountingCanvas(Root())
+    scene = Scene(canvas)
+    item_id = scene.draw(None, "rectangle", 0, 0, 10, 10, owner="board", fill="red")
+    assert scene.draw(item_id, "rectangle", 0, 0, 10, 10, owner="board", fill="red") == item_id
+    assert scene.takeCalls() == {"create": 1, "coords": 0, "itemconfigure": 0, "raise": 0, "delete": 0}
+    # moving it or changing an option keeps the item
+    assert scene.draw(item_id, "rectangle", 5, 5, 15, 15, owner="board", on_top=True, fill="red") == item_id
+    assert scene.draw(item_id, "rectangle", 5, 5, 15, 15, owner="board", fill="blue") == item_id
+    scene.setState(item_id, False)
+    assert scene.takeCalls() == {"create": 0, "coords": 1, "itemconfigure": 2, "raise": 1, "delete": 0}
+    assert canvas.alive == {item_id}
+    # another kind of item replaces it, keeping its owner
+    text_id = scene.draw(item_id, "text", 5, 5, owner="other", text="hi")
+    assert text_id != item_id
+    assert canvas.alive == {text_id}
+    assert scene.liveCounts() == {"board": (1, 1)}
+    # without retained drawing, every redraw replaces the item
+    old = Scene(CountingCanvas(Root()), retained=False)
+    first = old.draw(None, "text", 0, 0, text="a")
+    assert old.draw(first, "text", 0, 0, text="a") != first
+    assert old.takeCalls()["create"] == 2
+
+def test_only_owned_items_are_deleted():
+    canvas = CountingCanvas(Root())
+    scene = Scene(canvas)
+    foreign = canvas.create_rectangle(0, 0, 1, 1) # drawn straight on the canvas, not by the scene
+    cards = [scene.draw(None, "image", i, 0, owner="cards") for i in range(0, 3)]
+    menu = [scene.draw(None, "text", i, 0, owner="turn menu") for i in range(0, 2)]
+    assert set(canvas.find_withtag("turn menu")) == set(menu) # the owner is one tag, even with a space in it
+    scene.deleteOwner("cards")
+    assert canvas.alive == {foreign, *menu}
+    assert scene.liveCounts() == {"cards": (0, 3), "turn menu": (2, 2)}
+    # deleting something that isn't the scene's (or is already gone) does nothing
+    scene.delete(foreign)
+    scene.delete(cards[0])
+    scene.deleteOwner("nobody")
+    assert canvas.alive == {foreign, *menu}
+    scene.delete(menu[0])
+    assert canvas.alive == {foreign, menu[1]}
+    assert len(scene) == 1
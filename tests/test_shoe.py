@@ -0,0 +1,69 @@
+"""
+File: test_shoe.py
+Author: Willow Jordan
+Purpose: Check that the shoe deals the same order from the same random number generator, reshuffles included,
+that reshuffling keeps the top of the discard pile, and that the deck is refilled whenever it's empty at the start of a draw.
+"""
+
+import random
+
+import pytest
+
+from game_objects.game_state import GameState
+from game_objects.shoe import Shoe
+
+def makeShoe(seed:int):
+    game = GameState(2, seed=0) # just for a full set of cards
+    cards = list(game.deck) + game.discard_pile + [card for player in game.players for card in player.hand]
+    cards.sort(key=lambda card: card.uid)
+    return Shoe(cards, random.Random(seed))
+
+def dealAll(shoe:Shoe):
+    return [card.uid for card in shoe.dealMany(len(shoe))]
+
+def test_same_seed_deals_the_same_order():
+    shoes = [makeShoe(7), makeShoe(7)]
+    for shoe in shoes: shoe.shuffle()
+    first = [dealAll(shoe) for shoe in shoes]
+    assert first[0] == first[1]
+    assert sorted(first[0]) == list(range(0, 52))
+    # reshuffling the same discard pile gives the same order, and keeps its top card out of the shoe
+    piles = [list(shoe.cards) for shoe in shoes] # every card dealt, in dealing order
+    tops = [shoe.reshuffleFrom(pile) for shoe, pile in zip(shoes, piles)]
+    assert tops[0].uid == tops[1].uid == first[0][-1]
+    second = [dealAll(shoe) for shoe in shoes]
+    assert second[0] == second[1]
+    assert sorted(second[0]) == sorted(first[0][:-1])
+
+def test_reshuffle_needs_an_empty_shoe():
+    shoe = makeShoe(1)
+    with pytest.raises(RuntimeError):
+        shoe.reshuffleFrom([shoe.cards[0]])
+
+def emptyDeck(game:GameState, discards:int):
+    """Deal out the whole deck, leaving the last discards of its cards as the discard pile. Return the discard pile's uids."""
+    cards = game.deck.dealMany(len(game.deck))
+    game.discard_pile = cards[-discards:]
+    return [card.uid for card in game.discard_pile]
+
+def test_empty_deck_is_refilled_at_the_start_of_a_draw():
+    drawn = []
+    for copy in range(0, 2):
+        game = GameState(2, seed=3)
+        pile = emptyDeck(game, 6)
+        game.startTurn()
+        card = game.drawFromDeck()
+        assert [card.uid for card in game.discard_pile] == [pile[-1]] # the top card stays
+        assert card.uid in pile[:-1]
+        assert sorted([card.uid for card in game.deck] + [card.uid]) == sorted(pile[:-1])
+        drawn.append([card.uid] + [card.uid for card in game.deck])
+    assert drawn[0] == drawn[1] # the same seed reshuffles the same way
+
+def test_deck_with_nothing_to_refill_it_cant_be_drawn_from():
+    game = GameState(2, seed=4)
+    emptyDeck(game, 1)
+    game.startTurn()
+    assert not game.canDrawFromDeck()
+    with pytest.raises(ValueError):
+        game.drawFromDeck()
+    game.drawFromDiscard()
@@ -0,0 +1,93 @@
+"""
+File: test_solver.py
+Author: Willow Jordan
+Purpose: Check BoardSolver against a brute-force search on small positions: it must place as many hand cards as the best partition does,
+with a small memo that evicts entries (so results are rebuilt by searching again), and return a valid board when it runs out of time.
+"""
+
+import random
+
+from benchmarks.bench_solver import CORPUS, makePosition
+from game_objects.melds import isValidMeld
+from game_objects.solver import BoardSolver
+from game_objects.zobrist import TranspositionTable
+
+def canPartition(cards:list, mask:int, memo:dict):
+    """Return true if the cards in mask can be split into valid melds (of at least 3 cards)."""
+    if mask == 0: return True
+    if mask in memo: return memo[mask]
+    first = mask & -mask
+    card = cards[first.bit_length() - 1]
+    # the lowest card's meld can only hold cards of its value or suit
+    rest = 0
+    for i in range(0, len(cards)):
+        if (mask >> i & 1) and ((cards[i].value == card.value) or (cards[i].suit == card.suit)): rest |= 1 << i
+    rest &= ~first
+    result = False
+    # every subset of those, joined with the lowest card
+    subset = rest
+    while True:
+        meld = subset | first
+        if (meld.bit_count() >= 3) and isValidMeld([cards[i] for i in range(0, len(cards)) if meld >> i & 1]):
+            if canPartition(cards, mask & ~meld, memo):
+                result = True
+                break
+        if subset == 0: break
+        subset = (subset - 1) & rest
+    memo[mask] = result
+    return result
+
+def bruteForce(board_cards:list, hand:list):
+    """Return the most hand cards that can be placed with every board card, by trying every subset of the hand, or -1 if none works."""
+    cards = board_cards + hand
+    board_mask = (1 << len(board_cards)) - 1
+    memo = {}
+    best = -1
+    for hand_subset in range(0, 1 << len(hand)):
+        placed = hand_subset.bit_count()
+        if placed <= best: continue
+        if canPartition(cards, board_mask | (hand_subset << len(board_cards)), memo): best = placed
+    return best
+
+def checkResult(result, board_cards:list, hand:list):
+    """Check that the result is a valid board holding every board card and only the hand cards it says it placed."""
+    for group in result.groups:
+        assert isValidMeld(group)
+    used = [id(card) for group in result.groups for card in group]
+    assert len(used) == len(set(used)) # no card twice
+    assert sorted(used) == sorted([id(card) for card in board_cards] + [id(card) for card in result.placed])
+    hand_ids = set(id(card) for card in hand)
+    assert all(id(card) in hand_ids for card in result.placed)
+
+def smallPositions(count:int):
+    """Yield (board, board cards, hand) for small seeded positions that brute force can check."""
+    rng = random.Random(0)
+    for i in range(0, count):
+        board, hand = makePosition(rng.getrandbits(32), rng.randint(1, 3), rng.randint(1, 8), rng.random() < 0.5)
+        board_cards = [card for group in board.card_groups.values() for card in group]
+        yield board, board_cards, hand
+
+def test_matches_brute_force():
+    for board, board_cards, hand in smallPositions(200):
+        result = BoardSolver(board.card_groups, hand, time_budget=60).solve()
+        assert result.complete
+        assert len(result.placed) == bruteForce(board_cards, hand)
+        checkResult(result, board_cards, hand)
+
+def test_matches_brute_force_with_evictions():
+    for board, board_cards, hand in smallPositions(100):
+        solver = BoardSolver(board.card_groups, hand, time_budget=60)
+        solver.memo = TranspositionTable(4) # evicts almost everything, so the best arrangement has to be searched for again
+        result = solver.solve()
+        assert result.complete
+        assert len(result.placed) == bruteForce(board_cards, hand)
+        checkResult(result, board_cards, hand)
+
+def test_out_of_time_returns_a_valid_board():
+    # a position where the search has to prove that no arrangement places the last cards, which takes far longer than no time
+    name, seed, board_melds, hand_size, short_runs = [position for position in CORPUS if position[0] == "near miss A"][0]
+    board, hand = makePosition(seed, board_melds, hand_size, short_runs)
+    board_cards = [card for group in board.card_groups.values() for card in group]
+    result = BoardSolver(board.card_groups, hand, time_budget=0).solve()
+    assert not result.complete
+    checkResult(result, board_cards, hand)
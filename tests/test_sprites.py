@@ -0,0 +1,94 @@
+"""
+File: test_sprites.py
+Author: Willow Jordan
+Purpose: Check that the SpriteCache is found from any widget under a root and shared by every game played under it,
+so a second game decodes no sprites, and that zoomed sprites are cached and evicted least recently used first.
+Stub images stand in for tkinter's (see bench_render.py for the headless screen).
+"""
+
+import random
+
+from benchmarks.bench_render import HeadlessScreen, Root, idle, playTurn
+from game_objects.bots import GreedyBot
+from game_objects.scene import Scene
+from game_objects.sprites import SpriteCache
+
+class StubImage():
+    """Stands in for a PhotoImage, counting zooms."""
+    def __init__(self, name:str):
+        self.name = name
+        self.zooms = 0
+    def __str__(self): return self.name
+    def zoom(self, x:int, y:int):
+        self.zooms += 1
+        return StubImage(f"{self.name}@{x}")
+
+class StubSpriteCache(SpriteCache):
+    """Counts decodes instead of making them."""
+    def __init__(self, root):
+        super().__init__(root)
+        self.decodes = 0
+    def loadImage(self, path:str):
+        self.decodes += 1
+        return StubImage(path)
+
+class Widget():
+    def __init__(self, master): self.master = master
+
+def playGame(root:Root, seed:int, turns:int = 30):
+    """Play part of a game through a headless screen under the given root."""
+    screen = HeadlessScreen.__new__(HeadlessScreen)
+    Scene._scenes[screen] = Scene(screen)
+    random.seed(seed) # the screen's game picks its seed with the global random number generator
+    screen.__init__(root, 2)
+    idle(screen)
+    bots = [GreedyBot(random.Random(seed)), GreedyBot(random.Random(seed + 1))]
+    for turn in range(0, turns):
+        if root.over: break
+        playTurn(screen, bots[screen.game.curr_player.id])
+    screen.destroy()
+
+def test_cache_is_found_from_any_widget():
+    root = Root()
+    cache = StubSpriteCache(root)
+    SpriteCache._caches[root] = cache
+    assert SpriteCache.forRoot(root) is cache
+    assert SpriteCache.forRoot(Widget(Widget(root))) is cache
+    other = Root()
+    assert SpriteCache.forRoot(Widget(other)) is not cache
+    assert SpriteCache.forRoot(other) is SpriteCache.forRoot(Widget(other))
+
+def test_second_game_decodes_nothing():
+    root = Root()
+    cache = StubSpriteCache(root)
+    SpriteCache._caches[root] = cache
+    playGame(root, 0)
+    decodes = cache.decodes
+    assert decodes > 0
+    assert decodes == len(cache.images) # each sprite once
+    root.over = False
+    playGame(root, 0)
+    assert cache.decodes == decodes
+    assert cache.hits > 0
+
+def test_zoomed_sprites_are_cached_least_recently_used_first():
+    cache = StubSpriteCache(Root())
+    images = [StubImage(f"sprite{i}") for i in range(0, SpriteCache.MAX_ZOOMED)]
+    assert cache.zoomed(images[0], 1) is images[0] # nothing to zoom
+    first = cache.zoomed(images[0], 2)
+    assert cache.zoomed(images[0], 2) is first
+    assert images[0].zooms == 1
+    assert (cache.zoom_hits, cache.zoom_misses) == (1, 1)
+    assert cache.zoomed(images[0], 3) is not first # another zoom is another variant
+    assert images[0].zooms == 2
+    # fill the cache, using the first variant again halfway, so the 3x one is the least recently used
+    for i in range(1, SpriteCache.MAX_ZOOMED - 1):
+        cache.zoomed(images[i], 2)
+        if i == SpriteCache.MAX_ZOOMED // 2: assert cache.zoomed(images[0], 2) is first
+    assert cache.zoom_evictions == 0
+    cache.zoomed(images[SpriteCache.MAX_ZOOMED - 1], 2)
+    assert cache.zoom_evictions == 1
+    assert len(cache.zoomed_images) == SpriteCache.MAX_ZOOMED
+    assert cache.zoomed(images[0], 2) is first # still cached
+    cache.zoomed(images[0], 3)
+    assert images[0].zooms == 3 # evicted, so zoomed again
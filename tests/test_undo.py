@@ -0,0 +1,72 @@
+"""
+File: test_undo.py
+Author: Willow Jordan
+Purpose: Check that undo, redo and "Reset Board" (see GameState.loadSaveState) put the board and the current player's hand back
+exactly as they were after each move: the same cards in the same groups and order, with their internals, hashes and validity to match.
+"""
+
+import random
+
+from game_objects.card import Parent
+from game_objects.game_state import GameState
+from game_objects.melds import isValidMeld
+
+def describe(game:GameState):
+    """Return the board and current player's hand in a form that can be compared, checking every card's internals on the way."""
+    board = game.board
+    for group_id, group in board.card_groups.items():
+        for i in range(0, len(group)):
+            assert (group[i].parent_type, group[i].parent_id, group[i].card_id) == (Parent.CARDGROUP, group_id, i)
+    player = game.curr_player
+    for i in range(0, len(player.hand)):
+        assert (player.hand[i].parent_type, player.hand[i].parent_id, player.hand[i].card_id) == (Parent.HAND, player.id, i)
+    board.validateGroups()
+    assert board.invalid_groups == {group_id for group_id, group in board.card_groups.items() if not isValidMeld(group)}
+    return ({group_id: [card.uid for card in group] for group_id, group in board.card_groups.items()},
+            [card.uid for card in player.hand], game.stateHash())
+
+def makeMove(game:GameState, rng:random.Random):
+    """Move a random card (mostly from the hand) onto a random group or a new one."""
+    board = game.board
+    group_ids = list(board.card_groups.keys())
+    if (len(group_ids) > 0) and ((rng.random() < 0.3) or (len(game.curr_player.hand) == 0)):
+        group = board.card_groups[rng.choice(group_ids)]
+        card = group[rng.randrange(0, len(group))]
+    else: card = game.curr_player.hand[rng.randrange(0, len(game.curr_player.hand))]
+    group_id = rng.choice(group_ids) if (len(group_ids) > 0) and (rng.random() < 0.5) else board.getNextGID()
+    game.moveCard(card, group_id)
+
+def test_undo_redo_and_reset_restore_exactly():
+    rng = random.Random(0)
+    for seed in range(0, 20):
+        game = GameState(2, seed=seed, decks=2, starting_hand_size=30)
+        for i in range(0, 4):
+            game.board.makeGroup(game.deck.dealMany(3))
+        game.startTurn()
+        game.drawFromDeck()
+        states = [describe(game)] # after every move made so far, that can be undone or redone
+        position = 0
+        for step in range(0, 150):
+            choice = rng.random()
+            if choice < 0.5:
+                makeMove(game, rng)
+                position += 1
+                states[position:] = [describe(game)]
+                continue
+            if choice < 0.7:
+                assert game.undo() == (position > 0)
+                position = max(position - 1, 0)
+            elif choice < 0.9:
+                assert game.redo() == (position < len(states) - 1)
+                position = min(position + 1, len(states) - 1)
+            else:
+                game.loadSaveState()
+                position = 0
+            assert describe(game) == states[position]
+        # every move can still be redone after a reset
+        game.loadSaveState()
+        assert describe(game) == states[0]
+        for position in range(1, len(states)):
+            assert game.redo()
+            assert describe(game) == states[position]
+        assert not game.redo()
@@ -0,0 +1,80 @@
+"""
+File: test_zobrist.py
+Author: Willow Jordan
+Purpose: Check that the state hash kept up to date as cards move (see BoardState.updateGroupHash and Player) always equals
+the hash computed from scratch, through every kind of move, undo, redo and reset, and that it doesn't depend on group IDs or order.
+"""
+
+import random
+
+from game_objects.card import Parent
+from game_objects.bots import GreedyBot, RandomBot, playTurn
+from game_objects.game_state import GameState, TurnPhase
+from game_objects.zobrist import BOARD, DISCARD_TOP, MASK_64, cardKey, handKey, groupHash, turnKey
+
+def hashFromScratch(game:GameState):
+    """Return what GameState.stateHash should be, without using any hash kept by the board or players."""
+    board_hash = 0
+    for group in game.board.card_groups.values():
+        group_key = sum(cardKey(card.code, BOARD) for card in group) & MASK_64
+        board_hash = (board_hash + groupHash(group_key)) & MASK_64
+    rv = board_hash ^ turnKey(game.curr_player.id, game.turn_phase.value)
+    for player in game.players:
+        rv ^= sum(handKey(card.code, player.id) for card in player.hand) & MASK_64
+    if len(game.discard_pile) > 0:
+        rv ^= cardKey(game.discard_pile[-1].code, DISCARD_TOP)
+    return rv
+
+def allCards(game:GameState):
+    return [card for player in game.players for card in player.hand] + [card for group in game.board.card_groups.values() for card in group]
+
+def test_incremental_hash_matches_from_scratch():
+    rng = random.Random(0)
+    for seed in range(0, 10):
+        game = GameState(3, seed=seed, decks=2)
+        bots = [RandomBot(random.Random(seed + i)) for i in range(0, 3)]
+        for turn in range(0, 60):
+            if game.isOver(): break
+            game.startTurn()
+            game.drawFromDeck() if len(game.deck) > 0 else game.drawFromDiscard()
+            # random moves of hand and board cards, with undos, redos and resets in between
+            for move in range(0, 8):
+                choice = rng.random()
+                if choice < 0.15: game.undo()
+                elif choice < 0.25: game.redo()
+                elif choice < 0.3: game.loadSaveState()
+                else:
+                    cards = [card for card in allCards(game) if (card.parent_type != Parent.HAND) or (card.parent_id == game.curr_player.id)]
+                    game.moveCard(rng.choice(cards), rng.choice(list(game.board.card_groups) + [game.board.getNextGID()]))
+                assert game.stateHash() == hashFromScratch(game)
+            game.loadSaveState()
+            assert game.stateHash() == hashFromScratch(game)
+            # finish the turn legally
+            playTurn(game, bots[game.curr_player.id])
+            assert game.stateHash() == hashFromScratch(game)
+            assert game.clone().stateHash() == game.stateHash()
+
+def test_hash_ignores_group_ids_and_order():
+    game = GameState(2, seed=3)
+    bot = GreedyBot(random.Random(0))
+    # play until a turn ends with at least two groups on the board
+    while len(game.board.card_groups) < 2:
+        playTurn(game, bot)
+        assert not game.isOver()
+    expected = game.stateHash()
+    # the same groups under other IDs, in another order, with their cards reversed and the hands reversed
+    card_groups = {10 + i: type(group)(reversed(group)) for i, group in enumerate(reversed(list(game.board.card_groups.values())))}
+    for group_id, group in card_groups.items():
+        for i in range(0, len(group)): group[i].setInternals(Parent.CARDGROUP, group_id, i)
+    game.board.replaceGroups(card_groups)
+    for player in game.players:
+        player.setHand(list(reversed(player.hand)))
+        for i in range(0, len(player.hand)): player.hand[i].setInternals(Parent.HAND, player.id, i)
+    assert game.stateHash() == expected
+    # but moving a card changes it
+    game.startTurn()
+    game.drawFromDeck()
+    assert game.turn_phase == TurnPhase.PLAY
+    before = game.stateHash()
+    game.moveCard(game.curr_player.hand[0], game.board.getNextGID())
+    assert game.stateHash() != before
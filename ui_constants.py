@@ -9,4 +9,6 @@ BUTTON_WIDTH = 40
 BUTTON_HEIGHT = 7
 PAD = 10
 UI_FONT = ('Arial', 18)
-TEXT_COLOR = "white"
\ No newline at end of file
+TEXT_COLOR = "white"
+SAVE_PATH = "./savegame.rummy" # where GameScreen saves the game (Ctrl+S), and the title screen resumes it from
+LOG_PATH = "./lastgame.rlog" # where GameScreen logs every action of the game, for the title screen to replay
\ No newline at end of file